@@ -15,8 +15,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from backend.app.config import settings
 from backend.app.database import Base
-from backend.app.models.user import User, RefreshToken
-from backend.app.models.hangout import HangoutPost, HangoutRequest, HangoutParticipant, Review
+from backend.app.models.user import User, RefreshToken, EmailToken
+from backend.app.models.hangout import HangoutPost, HangoutRequest, HangoutParticipant, Review, ChatMessage
+from backend.app.models.outbox import OutboxEvent
+from backend.app.models.city import City
+from backend.app.models.sync import SyncTombstone
+from backend.app.models.suggestion import UserSuggestions
+from backend.app.models.block import UserBlock
 # this is the Alembic Config object, which provides
 # access to the values within the .env file in use.
 config = context.config
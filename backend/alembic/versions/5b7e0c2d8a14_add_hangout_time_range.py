@@ -0,0 +1,39 @@
+"""add_hangout_time_range
+
+Revision ID: 5b7e0c2d8a14
+Revises: a41d6e2c9f83
+Create Date: 2026-10-18 15:02:36.410287
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e0c2d8a14'
+down_revision: Union[str, Sequence[str], None] = 'a41d6e2c9f83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('hangout_posts', sa.Column('ends_at', sa.DateTime(timezone=True), nullable=True))
+    # Existing hangouts get the default two-hour length
+    op.execute("UPDATE hangout_posts SET ends_at = scheduled_at + interval '2 hours'")
+    op.alter_column('hangout_posts', 'ends_at', nullable=False)
+    op.add_column('hangout_posts', sa.Column(
+        'time_range', postgresql.TSTZRANGE(),
+        sa.Computed("tstzrange(scheduled_at, ends_at, '[)')", persisted=True), nullable=True,
+    ))
+    op.create_index('ix_hangout_posts_time_range', 'hangout_posts', ['time_range'], unique=False, postgresql_using='gist')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hangout_posts_time_range', table_name='hangout_posts', postgresql_using='gist')
+    op.drop_column('hangout_posts', 'time_range')
+    op.drop_column('hangout_posts', 'ends_at')
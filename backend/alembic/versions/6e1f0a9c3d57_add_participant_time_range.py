@@ -0,0 +1,72 @@
+"""add_participant_time_range
+
+Revision ID: 6e1f0a9c3d57
+Revises: 9d4a2c7e1f38
+Create Date: 2026-10-19 14:12:48.530916
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1f0a9c3d57'
+down_revision: Union[str, Sequence[str], None] = '9d4a2c7e1f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same statements as backend.app.models.hangout, copied so the migration does not
+# change if the app code does.
+PARTICIPANT_TIME_RANGE_FUNCTION = """
+CREATE OR REPLACE FUNCTION participant_time_range() RETURNS trigger AS $$
+BEGIN
+    SELECT time_range INTO NEW.time_range FROM hangout_posts WHERE id = NEW.post_id;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+POST_TIME_RANGE_MOVED_FUNCTION = """
+CREATE OR REPLACE FUNCTION post_time_range_moved() RETURNS trigger AS $$
+BEGIN
+    UPDATE hangout_participants SET time_range = NEW.time_range WHERE post_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.add_column('hangout_participants', sa.Column('time_range', postgresql.TSTZRANGE(), nullable=True))
+    # A backfill, not a change clients need to sync
+    op.execute("ALTER TABLE hangout_participants DISABLE TRIGGER hangout_participants_sync_touch")
+    op.execute(
+        "UPDATE hangout_participants hp SET time_range = p.time_range "
+        "FROM hangout_posts p WHERE p.id = hp.post_id"
+    )
+    op.execute("ALTER TABLE hangout_participants ENABLE TRIGGER hangout_participants_sync_touch")
+    op.create_index('ix_hangout_participants_user_id_time_range', 'hangout_participants',
+                    ['user_id', 'time_range'], unique=False, postgresql_using='gist')
+    op.execute(PARTICIPANT_TIME_RANGE_FUNCTION)
+    op.execute(POST_TIME_RANGE_MOVED_FUNCTION)
+    op.execute("CREATE TRIGGER hangout_participants_time_range BEFORE INSERT OR UPDATE OF post_id "
+               "ON hangout_participants FOR EACH ROW EXECUTE FUNCTION participant_time_range()")
+    op.execute("CREATE TRIGGER hangout_posts_time_range_moved AFTER UPDATE OF scheduled_at, ends_at "
+               "ON hangout_posts FOR EACH ROW WHEN (OLD.time_range IS DISTINCT FROM NEW.time_range) "
+               "EXECUTE FUNCTION post_time_range_moved()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER hangout_posts_time_range_moved ON hangout_posts")
+    op.execute("DROP TRIGGER hangout_participants_time_range ON hangout_participants")
+    op.execute("DROP FUNCTION post_time_range_moved()")
+    op.execute("DROP FUNCTION participant_time_range()")
+    op.drop_index('ix_hangout_participants_user_id_time_range', table_name='hangout_participants',
+                  postgresql_using='gist')
+    op.drop_column('hangout_participants', 'time_range')
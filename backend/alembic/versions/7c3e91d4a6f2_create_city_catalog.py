@@ -0,0 +1,113 @@
+"""create_city_catalog
+
+Revision ID: 7c3e91d4a6f2
+Revises: 5b7e0c2d8a14
+Create Date: 2026-10-18 16:40:12.118304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e91d4a6f2'
+down_revision: Union[str, Sequence[str], None] = '5b7e0c2d8a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, normalized key, normalized aliases, population) — the starting catalog
+CITIES = [
+    ("Mumbai", "mumbai", ["bombay", "navi mumbai", "thane"], 20_400_000),
+    ("Delhi", "delhi", ["new delhi", "ncr", "delhi ncr", "dilli"], 16_800_000),
+    ("Bengaluru", "bengaluru", ["bangalore", "blr"], 12_300_000),
+    ("Hyderabad", "hyderabad", ["secunderabad", "cyberabad"], 10_000_000),
+    ("Ahmedabad", "ahmedabad", ["amdavad"], 8_100_000),
+    ("Chennai", "chennai", ["madras"], 7_100_000),
+    ("Pune", "pune", ["poona", "pimpri chinchwad"], 6_600_000),
+    ("Kolkata", "kolkata", ["calcutta"], 4_500_000),
+    ("Surat", "surat", [], 4_500_000),
+    ("Jaipur", "jaipur", ["pink city"], 3_100_000),
+    ("Lucknow", "lucknow", [], 2_800_000),
+    ("Kanpur", "kanpur", ["cawnpore"], 2_800_000),
+    ("Nagpur", "nagpur", [], 2_400_000),
+    ("Indore", "indore", [], 2_200_000),
+    ("Bhopal", "bhopal", [], 1_900_000),
+    ("Visakhapatnam", "visakhapatnam", ["vizag", "vishakhapatnam"], 1_800_000),
+    ("Patna", "patna", [], 1_700_000),
+    ("Vadodara", "vadodara", ["baroda"], 1_700_000),
+    ("Ludhiana", "ludhiana", [], 1_600_000),
+    ("Agra", "agra", [], 1_600_000),
+    ("Nashik", "nashik", ["nasik"], 1_500_000),
+    ("Gurugram", "gurugram", ["gurgaon"], 1_500_000),
+    ("Noida", "noida", ["greater noida"], 1_300_000),
+    ("Varanasi", "varanasi", ["benares", "banaras", "kashi"], 1_200_000),
+    ("Kochi", "kochi", ["cochin", "ernakulam"], 1_200_000),
+    ("Chandigarh", "chandigarh", ["tricity"], 1_200_000),
+    ("Coimbatore", "coimbatore", ["kovai"], 1_100_000),
+    ("Mysuru", "mysuru", ["mysore"], 1_000_000),
+    ("Thiruvananthapuram", "thiruvananthapuram", ["trivandrum"], 1_000_000),
+    ("Guwahati", "guwahati", ["gauhati"], 1_000_000),
+    ("Puducherry", "puducherry", ["pondicherry", "pondy"], 700_000),
+    ("Dehradun", "dehradun", [], 700_000),
+    ("Udaipur", "udaipur", [], 500_000),
+    ("Goa", "goa", ["panaji", "panjim", "margao"], 1_000_000),
+    ("Shimla", "shimla", ["simla"], 200_000),
+    ("Rishikesh", "rishikesh", [], 100_000),
+]
+
+# Same statements as backend.app.services.city_catalog.BACKFILL_CITY_IDS_SQL,
+# copied so the migration does not change if the app code does.
+BACKFILL = """
+    WITH lookup AS (
+        SELECT id, name, key FROM cities
+        UNION ALL
+        SELECT id, name, unnest(aliases) FROM cities
+    )
+    UPDATE {table} AS t SET city_id = lookup.id, city = lookup.name
+    FROM lookup
+    WHERE t.city_id IS NULL
+      AND btrim(regexp_replace(lower(t.city), '[^[:alnum:]]+', ' ', 'g')) = lookup.key
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    cities = op.create_table('cities',
+    sa.Column('id', sa.Integer(), sa.Identity(always=False), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('key', sa.String(length=100), nullable=False),
+    sa.Column('aliases', postgresql.ARRAY(sa.String(length=100)), server_default=sa.text("'{}'"), nullable=False),
+    sa.Column('population', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('key')
+    )
+    op.bulk_insert(cities, [
+        {"name": name, "key": key, "aliases": aliases, "population": population}
+        for name, key, aliases, population in CITIES
+    ])
+
+    op.add_column('users', sa.Column('city_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('users_city_id_fkey', 'users', 'cities', ['city_id'], ['id'])
+    op.add_column('hangout_posts', sa.Column('city_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('hangout_posts_city_id_fkey', 'hangout_posts', 'cities', ['city_id'], ['id'])
+
+    # Backfill before indexing: one pass per table, and the index is built once
+    for table in ('users', 'hangout_posts'):
+        op.execute(BACKFILL.format(table=table))
+
+    op.create_index(op.f('ix_users_city_id'), 'users', ['city_id'], unique=False)
+    op.create_index('ix_hangout_posts_city_id_scheduled_at', 'hangout_posts', ['city_id', 'scheduled_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hangout_posts_city_id_scheduled_at', table_name='hangout_posts')
+    op.drop_index(op.f('ix_users_city_id'), table_name='users')
+    op.drop_constraint('hangout_posts_city_id_fkey', 'hangout_posts', type_='foreignkey')
+    op.drop_column('hangout_posts', 'city_id')
+    op.drop_constraint('users_city_id_fkey', 'users', type_='foreignkey')
+    op.drop_column('users', 'city_id')
+    op.drop_table('cities')
@@ -0,0 +1,38 @@
+"""align_hangout_posts_with_model
+
+Revision ID: 9d4a2c7e1f38
+Revises: f2b8d5a61e94
+Create Date: 2026-10-19 09:41:05.118274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4a2c7e1f38'
+down_revision: Union[str, Sequence[str], None] = 'f2b8d5a61e94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every activity type the model declares; the API's values were never in the type
+ACTIVITY_TYPES = (
+    'movies', 'dining_nightlife', 'adventure_trips', 'sports', 'casual_hangout', 'dating',
+    'Dining_NightLife', 'Entertainment', 'Sports', 'Arcade_Adventure', 'Casual_WentOut', 'Event', 'Dating',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for value in ACTIVITY_TYPES:
+            op.execute(f"ALTER TYPE activity_type_enum ADD VALUE IF NOT EXISTS '{value}'")
+    op.add_column('hangout_posts', sa.Column('dating_preferences', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Postgres can't drop enum values; the added ones stay, unused
+    op.drop_column('hangout_posts', 'dating_preferences')
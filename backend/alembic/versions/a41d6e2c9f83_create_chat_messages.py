@@ -0,0 +1,39 @@
+"""create_chat_messages
+
+Revision ID: a41d6e2c9f83
+Revises: 3f9c1a7e5b20
+Create Date: 2026-10-18 13:27:50.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41d6e2c9f83'
+down_revision: Union[str, Sequence[str], None] = '3f9c1a7e5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chat_messages',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('post_id', sa.UUID(), nullable=False),
+    sa.Column('sender_id', sa.UUID(), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['hangout_posts.id'], ),
+    sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_chat_messages_post_id_created_at_id', 'chat_messages', ['post_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_messages_post_id_created_at_id', table_name='chat_messages')
+    op.drop_table('chat_messages')
@@ -0,0 +1,35 @@
+"""create_user_suggestions
+
+Revision ID: b83f2d6e1c57
+Revises: e5a0b7c4d913
+Create Date: 2026-10-18 21:32:08.771940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83f2d6e1c57'
+down_revision: Union[str, Sequence[str], None] = 'e5a0b7c4d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_suggestions',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('suggestions', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_suggestions')
@@ -0,0 +1,39 @@
+"""create_user_blocks
+
+Revision ID: c4e19a7f3b60
+Revises: b83f2d6e1c57
+Create Date: 2026-10-18 23:05:41.215304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e19a7f3b60'
+down_revision: Union[str, Sequence[str], None] = 'b83f2d6e1c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_blocks',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('target_id', sa.UUID(), nullable=False),
+    sa.Column('kind', sa.Enum('block', 'mute', name='block_kind_enum'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['target_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'target_id')
+    )
+    op.create_index('ix_user_blocks_target_id', 'user_blocks', ['target_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_blocks_target_id', table_name='user_blocks')
+    op.drop_table('user_blocks')
+    sa.Enum(name='block_kind_enum').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,43 @@
+"""create_email_tokens
+
+Revision ID: d8752b4f376a
+Revises: 67f32f0d0e63
+Create Date: 2026-10-18 09:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8752b4f376a'
+down_revision: Union[str, Sequence[str], None] = '67f32f0d0e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('email_tokens',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('purpose', sa.Enum('password_reset', 'email_verification', name='email_token_purpose_enum'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('used_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_email_tokens_token_hash'), 'email_tokens', ['token_hash'], unique=True)
+    op.create_index(op.f('ix_email_tokens_user_id'), 'email_tokens', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_email_tokens_user_id'), table_name='email_tokens')
+    op.drop_index(op.f('ix_email_tokens_token_hash'), table_name='email_tokens')
+    op.drop_table('email_tokens')
+    sa.Enum(name='email_token_purpose_enum').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,111 @@
+"""add_delta_sync
+
+Revision ID: e5a0b7c4d913
+Revises: 7c3e91d4a6f2
+Create Date: 2026-10-18 19:05:41.502117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a0b7c4d913'
+down_revision: Union[str, Sequence[str], None] = '7c3e91d4a6f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CURRENT_XID = sa.text("(pg_current_xact_id()::text)::bigint")
+
+# Same statements as backend.app.models.sync, copied so the migration does not
+# change if the app code does.
+SYNCED_TABLES = [
+    ("hangout_posts", "post", "id", "creator_id"),
+    ("hangout_requests", "request", "post_id", "requester_id"),
+    ("hangout_participants", "participation", "post_id", "user_id"),
+]
+
+TOUCH_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_touch() RETURNS trigger AS $$
+BEGIN
+    IF NEW IS DISTINCT FROM OLD THEN
+        NEW.updated_at := now();
+        NEW.change_xid := (pg_current_xact_id()::text)::bigint;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_tombstone() RETURNS trigger AS $$
+DECLARE
+    old_row jsonb := to_jsonb(OLD);
+BEGIN
+    INSERT INTO sync_tombstones (entity, entity_id, post_id, user_id)
+    VALUES (TG_ARGV[0], OLD.id, (old_row ->> TG_ARGV[1])::uuid, (old_row ->> TG_ARGV[2])::uuid);
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql
+"""
+
+INDEXES = [
+    ('ix_hangout_posts_creator_id_change_xid', 'hangout_posts', ['creator_id', 'change_xid']),
+    ('ix_hangout_requests_requester_id_change_xid', 'hangout_requests', ['requester_id', 'change_xid']),
+    ('ix_hangout_requests_post_id_change_xid', 'hangout_requests', ['post_id', 'change_xid']),
+    ('ix_hangout_participants_user_id_change_xid', 'hangout_participants', ['user_id', 'change_xid']),
+    ('ix_hangout_participants_post_id_change_xid', 'hangout_participants', ['post_id', 'change_xid']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sync_tombstones',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('post_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('change_xid', sa.BigInteger(), server_default=CURRENT_XID, nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sync_tombstones_user_id_change_xid', 'sync_tombstones', ['user_id', 'change_xid'], unique=False)
+    op.create_index('ix_sync_tombstones_post_id_change_xid', 'sync_tombstones', ['post_id', 'change_xid'], unique=False)
+
+    for table, _, _, _ in SYNCED_TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+        # Existing rows get 0 without a table rewrite: they predate every sync token.
+        # New rows take the writing transaction's id from then on.
+        op.add_column(table, sa.Column('change_xid', sa.BigInteger(), server_default=sa.text('0'), nullable=False))
+        op.alter_column(table, 'change_xid', server_default=CURRENT_XID)
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+    op.execute(TOUCH_FUNCTION)
+    op.execute(TOMBSTONE_FUNCTION)
+    for table, entity, post_column, user_column in SYNCED_TABLES:
+        op.execute(f"CREATE TRIGGER {table}_sync_touch BEFORE UPDATE ON {table} "
+                   f"FOR EACH ROW EXECUTE FUNCTION sync_touch()")
+        op.execute(f"CREATE TRIGGER {table}_sync_tombstone AFTER DELETE ON {table} "
+                   f"FOR EACH ROW EXECUTE FUNCTION sync_tombstone('{entity}', '{post_column}', '{user_column}')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _, _, _ in SYNCED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_sync_tombstone ON {table}")
+        op.execute(f"DROP TRIGGER {table}_sync_touch ON {table}")
+    op.execute("DROP FUNCTION sync_tombstone()")
+    op.execute("DROP FUNCTION sync_touch()")
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    for table, _, _, _ in reversed(SYNCED_TABLES):
+        op.drop_column(table, 'change_xid')
+        op.drop_column(table, 'updated_at')
+    op.drop_index('ix_sync_tombstones_post_id_change_xid', table_name='sync_tombstones')
+    op.drop_index('ix_sync_tombstones_user_id_change_xid', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
@@ -0,0 +1,40 @@
+"""add_request_waitlist
+
+Revision ID: f2b8d5a61e94
+Revises: c4e19a7f3b60
+Create Date: 2026-10-19 00:12:27.530816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d5a61e94'
+down_revision: Union[str, Sequence[str], None] = 'c4e19a7f3b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A new enum value can't be used in the transaction that adds it (the index below does)
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE request_status_enum ADD VALUE IF NOT EXISTS 'waitlisted'")
+    op.create_index('ix_hangout_requests_waitlist', 'hangout_requests', ['post_id', 'created_at', 'id'],
+                    unique=False, postgresql_where=sa.text("status = 'waitlisted'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hangout_requests_waitlist', table_name='hangout_requests',
+                  postgresql_where=sa.text("status = 'waitlisted'"))
+    # Postgres can't drop an enum value: waitlisted requests become cancelled, then the type is rebuilt
+    op.execute("UPDATE hangout_requests SET status = 'cancelled' WHERE status = 'waitlisted'")
+    op.execute("ALTER TYPE request_status_enum RENAME TO request_status_enum_old")
+    op.execute("CREATE TYPE request_status_enum AS ENUM ('pending', 'accepted', 'declined', 'cancelled')")
+    op.execute("ALTER TABLE hangout_requests ALTER COLUMN status TYPE request_status_enum "
+               "USING status::text::request_status_enum")
+    op.execute("DROP TYPE request_status_enum_old")
@@ -0,0 +1,352 @@
+"""
+Bulk data loader — streams users, posts, participants and requests into Postgres
+with asyncpg's binary COPY instead of one ORM ``db.add`` per row.
+
+Synthetic data (deterministic for a given --seed):
+
+    python -m backend.app.cli.bulk_load synthetic --users 1000000 --posts 3000000
+
+From files (.ndjson or .csv, one file per table, users first):
+
+    python -m backend.app.cli.bulk_load files --users users.ndjson --posts posts.csv \\
+        --requests requests.ndjson
+
+Rows flow through generator pipelines in fixed-size chunks, so memory does not grow
+with the number of posts or requests. Synthetic foreign keys are derived from row
+indexes; file loads resolve usernames to ids through a single in-memory dict, and
+host/accepted participants are derived server-side with INSERT ... SELECT.
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import itertools
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator
+
+import asyncpg
+
+from backend.app.config import settings
+from backend.app.services.city_catalog import BACKFILL_CITY_IDS_SQL
+from backend.app.utils.security import hash_password
+
+CHUNK_SIZE = 50_000
+DEFAULT_PASSWORD = "connectem-seed-password"
+DEFAULT_DURATION = timedelta(minutes=settings.DEFAULT_HANGOUT_DURATION_MINUTES)
+
+USER_COLUMNS = [
+    "id", "username", "email", "password_hash", "full_name", "city",
+    "interests", "is_active", "is_verified", "created_at", "updated_at",
+]
+POST_COLUMNS = [
+    "id", "creator_id", "title", "description", "activity_type", "city",
+    "venue_name", "scheduled_at", "ends_at", "max_participants", "status", "is_public", "created_at",
+]
+PARTICIPANT_COLUMNS = ["id", "post_id", "user_id", "role", "joined_at"]
+REQUEST_COLUMNS = ["id", "post_id", "requester_id", "message", "status", "responded_at", "created_at"]
+
+# Population-weighted so a handful of metros dominate, as in production.
+CITY_WEIGHTS = {
+    "Mumbai": 20.4, "Delhi": 16.8, "Bengaluru": 12.3, "Hyderabad": 10.0,
+    "Ahmedabad": 8.1, "Chennai": 7.1, "Kolkata": 4.5, "Pune": 6.6,
+    "Jaipur": 3.1, "Surat": 4.5, "Lucknow": 2.8, "Goa": 1.0, "Chandigarh": 1.2,
+}
+ACTIVITY_TYPES = [
+    "Dining_NightLife", "Entertainment", "Sports", "Arcade_Adventure",
+    "Casual_WentOut", "Event", "Dating",
+]
+# Hangouts cluster in the evening; index = hour of day.
+HOUR_WEIGHTS = [0, 0, 0, 0, 0, 0, 1, 2, 3, 3, 4, 5, 6, 5, 4, 4, 5, 7, 10, 12, 12, 9, 5, 2]
+
+_CITIES = list(CITY_WEIGHTS)
+_CITY_CUM = list(itertools.accumulate(CITY_WEIGHTS.values()))
+
+
+# ─── SYNTHETIC GENERATORS ─────────────────────────────────────────────────────
+
+def _stable_uuid(seed: int, kind: str, index: int) -> uuid.UUID:
+    """Deterministic id, so foreign keys can be recomputed instead of stored."""
+    digest = hashlib.blake2b(f"{seed}:{kind}:{index}".encode(), digest_size=16).digest()
+    return uuid.UUID(bytes=digest, version=4)
+
+
+def _rng(seed: int, kind: str, index: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def _user_city(seed: int, index: int) -> str:
+    return _rng(seed, "user", index).choices(_CITIES, cum_weights=_CITY_CUM)[0]
+
+
+def synthetic_users(count: int, seed: int, password_hash: str, now: datetime) -> Iterator[tuple]:
+    for i in range(count):
+        rng = _rng(seed, "user", i)
+        city = rng.choices(_CITIES, cum_weights=_CITY_CUM)[0]
+        created = now - timedelta(days=rng.expovariate(1 / 120))
+        yield (
+            _stable_uuid(seed, "user", i), f"user_{i}", f"user_{i}@example.com",
+            password_hash, f"User {i}", city, rng.sample(ACTIVITY_TYPES, 2),
+            True, rng.random() < 0.8, created, created,
+        )
+
+
+def _synthetic_post(seed: int, index: int, users: int, now: datetime) -> dict:
+    """Every table pass regenerates the same post from its index."""
+    rng = _rng(seed, "post", index)
+    creator_index = rng.randrange(users)
+    day = now.date() + timedelta(days=min(int(rng.expovariate(1 / 7)), 60))
+    hour = rng.choices(range(24), weights=HOUR_WEIGHTS)[0]
+    scheduled = datetime(day.year, day.month, day.day, hour, rng.choice((0, 15, 30, 45)), tzinfo=timezone.utc)
+    return {
+        "id": _stable_uuid(seed, "post", index),
+        "rng": rng,
+        "creator_index": creator_index,
+        "city": _user_city(seed, creator_index),
+        "activity_type": rng.choice(ACTIVITY_TYPES),
+        "scheduled_at": scheduled,
+        "ends_at": scheduled + DEFAULT_DURATION,
+        "created_at": scheduled - timedelta(hours=rng.uniform(2, 240)),
+        "max_participants": rng.randint(2, 12),
+    }
+
+
+def synthetic_posts(count: int, users: int, seed: int, now: datetime) -> Iterator[tuple]:
+    for i in range(count):
+        post = _synthetic_post(seed, i, users, now)
+        status = "open" if post["scheduled_at"] > now else "completed"
+        yield (
+            post["id"], _stable_uuid(seed, "user", post["creator_index"]),
+            f"{post['activity_type'].replace('_', ' ')} in {post['city']} #{i}", None,
+            post["activity_type"], post["city"], None, post["scheduled_at"], post["ends_at"],
+            post["max_participants"], status, True, post["created_at"],
+        )
+
+
+def _synthetic_requests(seed: int, index: int, users: int, now: datetime, per_post: int):
+    """Yields (post, request_id, requester_id, accepted, created_at) for one post."""
+    post = _synthetic_post(seed, index, users, now)
+    rng = post["rng"]
+    seats = post["max_participants"] - 1
+    seen = {post["creator_index"]}
+    for j in range(rng.randint(0, per_post * 2)):
+        requester = rng.randrange(users)
+        if requester in seen:
+            continue
+        seen.add(requester)
+        accepted = seats > 0 and rng.random() < 0.5
+        seats -= accepted
+        created = post["created_at"] + timedelta(minutes=rng.uniform(1, 600))
+        yield post, _stable_uuid(seed, f"request:{index}", j), _stable_uuid(seed, "user", requester), accepted, created
+
+
+def synthetic_requests(count: int, users: int, seed: int, now: datetime, per_post: int) -> Iterator[tuple]:
+    for i in range(count):
+        for _, request_id, requester_id, accepted, created in _synthetic_requests(seed, i, users, now, per_post):
+            yield (
+                request_id, _stable_uuid(seed, "post", i), requester_id, None,
+                "accepted" if accepted else "pending", created if accepted else None, created,
+            )
+
+
+def synthetic_participants(count: int, users: int, seed: int, now: datetime, per_post: int) -> Iterator[tuple]:
+    for i in range(count):
+        post = _synthetic_post(seed, i, users, now)
+        yield (
+            _stable_uuid(seed, f"host:{i}", 0), post["id"],
+            _stable_uuid(seed, "user", post["creator_index"]), "host", post["created_at"],
+        )
+        for _, request_id, requester_id, accepted, created in _synthetic_requests(seed, i, users, now, per_post):
+            if accepted:
+                yield (request_id, post["id"], requester_id, "participant", created)
+
+
+# ─── FILE READERS ─────────────────────────────────────────────────────────────
+
+def read_rows(path: str) -> Iterator[dict]:
+    """Stream dict rows from an .ndjson/.jsonl or .csv file."""
+    with open(path, newline="") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def _ts(value, default: datetime | None = None) -> datetime | None:
+    if not value:
+        return default
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _interests(value) -> list[str] | None:
+    if value in (None, ""):
+        return None
+    return value if isinstance(value, list) else value.split(";")
+
+
+def _bool(value, default: bool) -> bool:
+    if value in (None, ""):
+        return default
+    return value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes")
+
+
+def file_users(path: str, password_hash: str, now: datetime, user_ids: dict[str, uuid.UUID]) -> Iterator[tuple]:
+    """Records each username -> id in ``user_ids`` so the posts/requests files can reference users."""
+    for row in read_rows(path):
+        user_id = uuid.UUID(row["id"]) if row.get("id") else uuid.uuid4()
+        user_ids[row["username"]] = user_id
+        created = _ts(row.get("created_at"), now)
+        yield (
+            user_id, row["username"], row["email"], row.get("password_hash") or password_hash,
+            row.get("full_name") or None, row.get("city") or None, _interests(row.get("interests")),
+            _bool(row.get("is_active"), True), _bool(row.get("is_verified"), False), created, created,
+        )
+
+
+def file_posts(path: str, now: datetime, user_ids: dict[str, uuid.UUID]) -> Iterator[tuple]:
+    for row in read_rows(path):
+        post_id = uuid.UUID(row["id"]) if row.get("id") else uuid.uuid4()
+        created = _ts(row.get("created_at"), now)
+        scheduled = _ts(row["scheduled_at"])
+        yield (
+            post_id, user_ids[row["creator"]], row["title"], row.get("description") or None,
+            row["activity_type"], row["city"], row.get("venue_name") or None,
+            scheduled, _ts(row.get("ends_at"), scheduled + DEFAULT_DURATION), int(row["max_participants"]),
+            row.get("status") or "open", _bool(row.get("is_public"), True), created,
+        )
+
+
+def file_requests(path: str, now: datetime, user_ids: dict[str, uuid.UUID]) -> Iterator[tuple]:
+    for row in read_rows(path):
+        created = _ts(row.get("created_at"), now)
+        yield (
+            uuid.UUID(row["id"]) if row.get("id") else uuid.uuid4(),
+            uuid.UUID(row["post_id"]), user_ids[row["requester"]], row.get("message") or None,
+            row.get("status") or "pending", _ts(row.get("responded_at")), created,
+        )
+
+
+# Participants are derived server-side, so the client never holds a list of posts.
+INSERT_HOSTS = """
+    INSERT INTO hangout_participants (id, post_id, user_id, role, joined_at)
+    SELECT gen_random_uuid(), p.id, p.creator_id, 'host', p.created_at
+    FROM hangout_posts p
+    WHERE NOT EXISTS (
+        SELECT 1 FROM hangout_participants hp WHERE hp.post_id = p.id AND hp.role = 'host'
+    )
+"""
+INSERT_ACCEPTED = """
+    INSERT INTO hangout_participants (id, post_id, user_id, role, joined_at)
+    SELECT gen_random_uuid(), r.post_id, r.requester_id, 'participant', COALESCE(r.responded_at, r.created_at)
+    FROM hangout_requests r
+    WHERE r.status = 'accepted' AND NOT EXISTS (
+        SELECT 1 FROM hangout_participants hp WHERE hp.post_id = r.post_id AND hp.user_id = r.requester_id
+    )
+"""
+
+
+# ─── COPY ─────────────────────────────────────────────────────────────────────
+
+def _chunks(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+async def copy_rows(conn: asyncpg.Connection, table: str, columns: list[str], rows: Iterable[tuple], chunk_size: int) -> int:
+    """Binary-COPY rows into ``table`` one chunk at a time, all in one transaction."""
+    total, started = 0, time.perf_counter()
+    async with conn.transaction():
+        for chunk in _chunks(rows, chunk_size):
+            await conn.copy_records_to_table(table, records=chunk, columns=columns)
+            total += len(chunk)
+            rate = total / (time.perf_counter() - started)
+            print(f"\r{table}: {total:,} rows ({rate:,.0f}/s)", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    return total
+
+
+def asyncpg_dsn(url: str) -> str:
+    """asyncpg does not understand SQLAlchemy's +driver suffix."""
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def load_synthetic(conn: asyncpg.Connection, args: argparse.Namespace, password_hash: str) -> None:
+    now = datetime.now(timezone.utc)
+    await copy_rows(conn, "users", USER_COLUMNS, synthetic_users(args.users, args.seed, password_hash, now), args.chunk_size)
+    await copy_rows(conn, "hangout_posts", POST_COLUMNS, synthetic_posts(args.posts, args.users, args.seed, now), args.chunk_size)
+    await copy_rows(
+        conn, "hangout_requests", REQUEST_COLUMNS,
+        synthetic_requests(args.posts, args.users, args.seed, now, args.requests_per_post), args.chunk_size,
+    )
+    await copy_rows(
+        conn, "hangout_participants", PARTICIPANT_COLUMNS,
+        synthetic_participants(args.posts, args.users, args.seed, now, args.requests_per_post), args.chunk_size,
+    )
+
+
+async def load_files(conn: asyncpg.Connection, args: argparse.Namespace, password_hash: str) -> None:
+    now = datetime.now(timezone.utc)
+    user_ids: dict[str, uuid.UUID] = {}
+    if args.users:
+        await copy_rows(conn, "users", USER_COLUMNS, file_users(args.users, password_hash, now, user_ids), args.chunk_size)
+    else:
+        user_ids = {r["username"]: r["id"] for r in await conn.fetch("SELECT username, id FROM users")}
+
+    if args.posts:
+        await copy_rows(conn, "hangout_posts", POST_COLUMNS, file_posts(args.posts, now, user_ids), args.chunk_size)
+        await conn.execute(INSERT_HOSTS)
+
+    if args.requests:
+        await copy_rows(conn, "hangout_requests", REQUEST_COLUMNS, file_requests(args.requests, now, user_ids), args.chunk_size)
+        await conn.execute(INSERT_ACCEPTED)
+
+
+async def main(args: argparse.Namespace) -> None:
+    # One bcrypt hash shared by every row that has none of its own.
+    password_hash = args.password_hash or hash_password(args.password)
+    conn = await asyncpg.connect(asyncpg_dsn(args.database_url))
+    try:
+        if args.mode == "synthetic":
+            await load_synthetic(conn, args, password_hash)
+        else:
+            await load_files(conn, args, password_hash)
+        # COPY writes free-text cities; catalog ids are attached server-side afterwards
+        for statement in BACKFILL_CITY_IDS_SQL:
+            await conn.execute(statement)
+        await conn.execute("ANALYZE users, hangout_posts, hangout_requests, hangout_participants")
+    finally:
+        await conn.close()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-load ConnectEm data with COPY")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="plain password hashed once for all users")
+    parser.add_argument("--password-hash", help="pre-computed bcrypt hash to reuse instead")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    synthetic = modes.add_parser("synthetic", help="generate realistic synthetic data")
+    synthetic.add_argument("--users", type=int, default=10_000)
+    synthetic.add_argument("--posts", type=int, default=30_000)
+    synthetic.add_argument("--requests-per-post", type=int, default=3)
+    synthetic.add_argument("--seed", type=int, default=1)
+
+    files = modes.add_parser("files", help="load NDJSON/CSV exports")
+    files.add_argument("--users", help="users file; omit to resolve usernames from the database")
+    files.add_argument("--posts", help="posts file, rows reference users by 'creator' username")
+    files.add_argument("--requests", help="requests file, rows reference 'post_id' and 'requester' username")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
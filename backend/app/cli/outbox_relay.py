@@ -0,0 +1,139 @@
+"""
+Outbox relay — forwards committed ``outbox_events`` rows to Redis streams.
+
+    python -m backend.app.cli.outbox_relay --workers 2
+
+Each worker loops over one transaction per batch:
+
+1. claim the oldest rows with ``FOR UPDATE SKIP LOCKED``, so relays never block on
+   each other, and take a transaction-scoped advisory lock per aggregate so that all
+   pending events of one aggregate go through a single relay at a time;
+2. XADD them to ``events:<aggregate_type>`` in id order inside one MULTI/EXEC;
+3. delete the rows once Redis has acknowledged, and commit.
+
+Rows from rolled-back transactions are never visible here, so they are never
+published. Delivery is at-least-once: if the commit in step 3 fails after Redis
+accepted the batch, the rows are published again, so consumers dedupe on ``id``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import time
+
+from redis.asyncio import Redis
+from sqlalchemy import Text, cast, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from backend.app.config import settings
+from backend.app.database import asyncpg_connect_args
+from backend.app.models.outbox import OutboxEvent
+from backend.app.services.outbox_service import stream_for
+
+logger = logging.getLogger(__name__)
+
+
+def claim_batch(limit: int):
+    aggregate_lock = func.pg_try_advisory_xact_lock(
+        func.hashtextextended(cast(OutboxEvent.aggregate_id, Text), 0)
+    )
+    return (
+        select(
+            OutboxEvent.id, OutboxEvent.aggregate_type, OutboxEvent.aggregate_id,
+            OutboxEvent.event_type, OutboxEvent.payload, OutboxEvent.created_at,
+        )
+        .where(aggregate_lock)
+        .order_by(OutboxEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+
+class OutboxRelay:
+
+    def __init__(self, engine: AsyncEngine, redis: Redis, batch_size: int = settings.OUTBOX_BATCH_SIZE,
+                 stream_maxlen: int = settings.OUTBOX_STREAM_MAXLEN):
+        self.engine = engine
+        self.redis = redis
+        self.batch_size = batch_size
+        self.stream_maxlen = stream_maxlen
+        self.published = 0
+
+    async def relay_batch(self) -> int:
+        """Publish and prune one batch; returns how many events went out."""
+        async with self.engine.begin() as conn:
+            rows = (await conn.execute(claim_batch(self.batch_size))).all()
+            if not rows:
+                return 0
+
+            pipe = self.redis.pipeline(transaction=True)
+            for row in rows:
+                pipe.xadd(
+                    stream_for(row.aggregate_type),
+                    {
+                        "id": row.id,
+                        "type": row.event_type,
+                        "aggregate_id": str(row.aggregate_id),
+                        "payload": json.dumps(row.payload),
+                        "created_at": row.created_at.isoformat(),
+                    },
+                    maxlen=self.stream_maxlen,
+                    approximate=True,
+                )
+            await pipe.execute()
+
+            await conn.execute(delete(OutboxEvent).where(OutboxEvent.id.in_([row.id for row in rows])))
+        self.published += len(rows)
+        return len(rows)
+
+    async def run(self, stop: asyncio.Event, poll_interval: float = settings.OUTBOX_POLL_INTERVAL) -> None:
+        """Relay until ``stop`` is set; full batches loop immediately, short ones wait."""
+        while not stop.is_set():
+            try:
+                published = await self.relay_batch()
+            except Exception:
+                logger.exception("Outbox batch failed; rows stay queued for the next attempt")
+                published = 0
+            if published < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+async def main(args: argparse.Namespace) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    engine = create_async_engine(
+        settings.DATABASE_URL, pool_size=args.workers, max_overflow=0, connect_args=asyncpg_connect_args(),
+    )
+    redis = Redis.from_url(settings.REDIS_URL)
+    relays = [OutboxRelay(engine, redis, args.batch_size) for _ in range(args.workers)]
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    started = time.perf_counter()
+    logger.info("Outbox relay started with %d worker(s)", args.workers)
+    try:
+        await asyncio.gather(*(relay.run(stop, args.poll_interval) for relay in relays))
+    finally:
+        total = sum(relay.published for relay in relays)
+        logger.info("Outbox relay stopped: %d events in %.1fs", total, time.perf_counter() - started)
+        await redis.aclose()
+        await engine.dispose()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Relay ConnectEm outbox events to Redis streams")
+    parser.add_argument("--workers", type=int, default=1, help="concurrent relay loops in this process")
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument("--poll-interval", type=float, default=settings.OUTBOX_POLL_INTERVAL)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,272 @@
+"""
+"People you may vibe with" — precomputes suggested users for every active user.
+
+    python -m backend.app.cli.suggestions [--workers N] [--top-k 20]
+
+Run it from cron; daily is plenty. It is too heavy for a Celery task, and Celery's
+pool processes cannot start a pool of their own. Three signals, as sparse matrices:
+
+- interests: user × (city, interest), IDF-weighted with L2-normalized rows, so
+  X·Xᵀ is the cosine similarity of two users' interests within one city. An
+  interest held by more than SUGGESTIONS_MAX_INTEREST_USERS users in a city is
+  dropped: it says little, and it would make every row of the product dense.
+- hangouts: user × post participation P, so P·Pᵀ counts hangouts shared.
+- reviews: positive reviews (rating >= SUGGESTIONS_MIN_RATING) between two
+  users, in either direction.
+
+    score = w_interests·cosine + w_hangouts·log1p(shared) + w_reviews·log1p(reviews)
+
+The matrices are built once in this process, and forked workers share them
+copy-on-write. Each task scores SUGGESTIONS_CHUNK_SIZE users, one sparse product
+per signal, keeps the top K per row and serializes them; this process only
+writes each chunk as it finishes, so results never pile up here. Users who got no suggestions this run lose
+their old row at the end. The run prints its timings and peak memory.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import asyncpg
+import numpy as np
+import scipy.sparse as sp
+
+from backend.app.cli.bulk_load import asyncpg_dsn
+from backend.app.config import settings
+
+UPSERT_SQL = """
+    INSERT INTO user_suggestions (user_id, suggestions, computed_at) VALUES ($1, $2::jsonb, $3)
+    ON CONFLICT (user_id) DO UPDATE SET suggestions = EXCLUDED.suggestions, computed_at = EXCLUDED.computed_at
+"""
+
+# Built before the pool forks; workers only read it
+_shared: dict = {}
+
+
+class Users:
+    """Active users by row index; what the suggestion payload shows about each."""
+
+    def __init__(self):
+        self.index: dict = {}
+        self.ids: list = []
+        self.profiles: list[tuple] = []
+        self.interests: list[frozenset[str]] = []
+        self.cities: list[int | None] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def normalize_interest(value: str) -> str:
+    return " ".join(value.lower().split())
+
+
+async def load_users(conn: asyncpg.Connection) -> Users:
+    users = Users()
+    async with conn.transaction():
+        async for row in conn.cursor(
+            "SELECT id, username, full_name, avatar_url, city_id, interests FROM users WHERE is_active",
+            prefetch=10_000,
+        ):
+            users.index[row["id"]] = len(users.ids)
+            users.ids.append(row["id"])
+            users.profiles.append((str(row["id"]), row["username"], row["full_name"], row["avatar_url"]))
+            users.interests.append(frozenset(normalize_interest(i) for i in row["interests"] or () if i.strip()))
+            users.cities.append(row["city_id"])
+    return users
+
+
+def interest_matrix(users: Users, max_users: int) -> sp.csr_matrix:
+    features: dict[tuple, int] = {}
+    rows, cols = [], []
+    for i, interests in enumerate(users.interests):
+        for interest in interests:
+            rows.append(i)
+            cols.append(features.setdefault((users.cities[i], interest), len(features)))
+    rows, cols = np.array(rows, dtype=np.int32), np.array(cols, dtype=np.int32)
+    df = np.bincount(cols, minlength=len(features))
+    # One holder matches nobody; too many holders match everybody
+    keep = (df[cols] > 1) & (df[cols] <= max_users)
+    rows, cols = rows[keep], cols[keep]
+    idf = np.log1p(len(users) / np.maximum(df, 1)).astype(np.float32)
+    x = sp.csr_matrix((idf[cols], (rows, cols)), shape=(len(users), len(features)), dtype=np.float32)
+    norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sp.diags(1 / norms).dot(x).tocsr()
+
+
+async def participation_matrix(conn: asyncpg.Connection, users: Users) -> sp.csr_matrix:
+    rows, cols, posts = [], [], 0
+    async with conn.transaction():
+        # Posts with a single participant are shared with nobody
+        async for row in conn.cursor(
+            "SELECT array_agg(user_id) AS members FROM hangout_participants GROUP BY post_id HAVING count(*) > 1",
+            prefetch=10_000,
+        ):
+            members = [users.index[m] for m in row["members"] if m in users.index]
+            if len(members) > 1:
+                rows += members
+                cols += [posts] * len(members)
+                posts += 1
+    data = np.ones(len(rows), dtype=np.float32)
+    return sp.csr_matrix((data, (rows, cols)), shape=(len(users), posts), dtype=np.float32)
+
+
+async def review_matrix(conn: asyncpg.Connection, users: Users, min_rating: int) -> sp.csr_matrix:
+    rows, cols, counts = [], [], []
+    for row in await conn.fetch(
+        "SELECT reviewer_id, reviewee_id, count(*) AS n FROM reviews "
+        "WHERE rating >= $1 AND reviewer_id <> reviewee_id GROUP BY 1, 2",
+        min_rating,
+    ):
+        if row["reviewer_id"] in users.index and row["reviewee_id"] in users.index:
+            rows.append(users.index[row["reviewer_id"]])
+            cols.append(users.index[row["reviewee_id"]])
+            counts.append(row["n"])
+    r = sp.csr_matrix((np.array(counts, dtype=np.float32), (rows, cols)), shape=(len(users), len(users)))
+    # Either direction counts: a good review is a good sign for both people
+    return (r + r.T).tocsr()
+
+
+def score_chunk(start: int, stop: int) -> tuple[np.ndarray, ...]:
+    """Top K per user in [start, stop): (user, candidate, score, cosine, shared hangouts, reviews)."""
+    weights, top_k = _shared["weights"], _shared["top_k"]
+    cosine = _shared["interests"][start:stop].dot(_shared["interests_t"]).tocsr()
+    hangouts = _shared["hangouts"][start:stop].dot(_shared["hangouts_t"]).tocsr()
+    reviews = _shared["reviews"][start:stop]
+
+    hangouts_log, reviews_log = hangouts.copy(), reviews.copy()
+    hangouts_log.data = np.log1p(hangouts_log.data)
+    reviews_log.data = np.log1p(reviews_log.data)
+    total = (weights["interests"] * cosine + weights["hangouts"] * hangouts_log
+             + weights["reviews"] * reviews_log).tocsr()
+
+    users, candidates, scores = [], [], []
+    for row in range(stop - start):
+        lo, hi = total.indptr[row], total.indptr[row + 1]
+        cols, vals = total.indices[lo:hi], total.data[lo:hi]
+        keep = (cols != start + row) & (vals > 0)
+        cols, vals = cols[keep], vals[keep]
+        if len(cols) > top_k:
+            best = np.argpartition(-vals, top_k)[:top_k]
+            cols, vals = cols[best], vals[best]
+        order = np.argsort(-vals, kind="stable")
+        users.append(np.full(len(order), start + row, dtype=np.int32))
+        candidates.append(cols[order])
+        scores.append(vals[order])
+
+    users = np.concatenate(users) if users else np.empty(0, dtype=np.int32)
+    candidates = np.concatenate(candidates) if candidates else np.empty(0, dtype=np.int32)
+    local = users - start
+    # Why each pair matched, looked up only for the pairs kept
+    return (
+        users, candidates, np.concatenate(scores) if scores else np.empty(0, dtype=np.float32),
+        np.asarray(cosine[local, candidates]).ravel(),
+        np.asarray(hangouts[local, candidates]).ravel(),
+        np.asarray(reviews[local, candidates]).ravel(),
+    )
+
+
+def suggestion_rows(users: Users, result: tuple[np.ndarray, ...], computed_at: datetime) -> list[tuple]:
+    rows, current, entries = [], None, []
+    for user, candidate, score, cosine, hangouts, reviews in zip(*(part.tolist() for part in result)):
+        if user != current:
+            if entries:
+                rows.append((users.ids[current], json.dumps(entries, separators=(",", ":")), computed_at))
+            current, entries = user, []
+        user_id, username, full_name, avatar_url = users.profiles[candidate]
+        entries.append({
+            "user_id": user_id, "username": username, "full_name": full_name, "avatar_url": avatar_url,
+            "score": round(score, 4),
+            "shared_interests": sorted(users.interests[user] & users.interests[candidate]) if cosine else [],
+            "hangouts_together": int(hangouts),
+            "positive_reviews": int(reviews),
+        })
+    if entries:
+        rows.append((users.ids[current], json.dumps(entries, separators=(",", ":")), computed_at))
+    return rows
+
+
+def chunk_rows(start: int, stop: int, computed_at: datetime) -> list[tuple]:
+    """Worker task: score a chunk and serialize it too, so the parent only writes."""
+    return suggestion_rows(_shared["users"], score_chunk(start, stop), computed_at)
+
+
+def peak_rss_mb(who: int) -> float:
+    return round(resource.getrusage(who).ru_maxrss / 1024, 1)
+
+
+async def main(args: argparse.Namespace) -> dict:
+    timings, started = {}, time.perf_counter()
+    computed_at = datetime.now(timezone.utc)
+    conn = await asyncpg.connect(asyncpg_dsn(args.database_url))
+    try:
+        users = await load_users(conn)
+        interests = interest_matrix(users, settings.SUGGESTIONS_MAX_INTEREST_USERS)
+        hangouts = await participation_matrix(conn, users)
+        reviews = await review_matrix(conn, users, settings.SUGGESTIONS_MIN_RATING)
+        timings["load_s"] = round(time.perf_counter() - started, 2)
+
+        _shared.update(
+            users=users, interests=interests, interests_t=interests.T.tocsr(),
+            hangouts=hangouts, hangouts_t=hangouts.T.tocsr(), reviews=reviews,
+            weights=settings.SUGGESTION_WEIGHTS, top_k=args.top_k,
+        )
+        scoring_started, written = time.perf_counter(), 0
+        loop = asyncio.get_running_loop()
+        # fork: workers inherit _shared instead of receiving a pickled copy each
+        with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("fork")) as pool:
+            chunks = iter(range(0, len(users), args.chunk_size))
+            pending: set = set()
+            while True:
+                # At most two chunks per worker in flight, so finished results don't queue up
+                for start in chunks:
+                    stop = min(start + args.chunk_size, len(users))
+                    pending.add(loop.run_in_executor(pool, chunk_rows, start, stop, computed_at))
+                    if len(pending) >= 2 * args.workers:
+                        break
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    rows = future.result()
+                    await conn.executemany(UPSERT_SQL, rows)
+                    written += len(rows)
+        timings["score_and_write_s"] = round(time.perf_counter() - scoring_started, 2)
+
+        stale = await conn.execute("DELETE FROM user_suggestions WHERE computed_at < $1", computed_at)
+    finally:
+        await conn.close()
+
+    return {
+        "users": len(users),
+        "interest_features": interests.shape[1],
+        "shared_posts": hangouts.shape[1],
+        "review_pairs": reviews.nnz // 2,
+        "users_with_suggestions": written,
+        "stale_rows_deleted": int(stale.split()[-1]),
+        "workers": args.workers,
+        **timings,
+        "total_s": round(time.perf_counter() - started, 2),
+        "peak_rss_mb": peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_worker_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Precompute suggested users for everyone")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--workers", type=int, default=len(os.sched_getaffinity(0)))
+    parser.add_argument("--top-k", type=int, default=settings.SUGGESTIONS_TOP_K)
+    parser.add_argument("--chunk-size", type=int, default=settings.SUGGESTIONS_CHUNK_SIZE)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(main(parse_args())), indent=2))
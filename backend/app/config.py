@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Tuple
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "ConnectEm"
@@ -14,6 +14,163 @@ class Settings(BaseSettings):
     FRONTEND_URL: str
     ALLOWED_ORIGINS: List[str]
 
+    # Connection pools — sized per worker process
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_WARM_CONNECTIONS: int = 5
+    DB_ECHO: bool = True
+    REDIS_MAX_CONNECTIONS: int = 50
+
+    # Statement caches: SQLAlchemy compiled SQL per engine, and asyncpg prepared
+    # statements per connection. Behind PgBouncer in transaction mode set DB_PGBOUNCER:
+    # server connections change between transactions, so caching is off and every
+    # statement gets a unique name (PgBouncer >= 1.21 with max_prepared_statements
+    # tracks named statements itself and can keep it off)
+    DB_QUERY_CACHE_SIZE: int = 1200
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    DB_PGBOUNCER: bool = False
+
+    # Startup fails if Postgres/Redis don't answer within this many seconds
+    STARTUP_TIMEOUT: float = 10.0
+    # How long shutdown waits for in-flight requests before closing pools
+    SHUTDOWN_DRAIN_TIMEOUT: float = 30.0
+
+    # python -m backend.app.serve: worker processes (0 = one per usable CPU), capped
+    # so every worker's full DB pool fits in the connection budget; each worker
+    # restarts after MAX_REQUESTS plus up to JITTER requests (0 = never)
+    SERVE_WORKERS: int = 0
+    SERVE_DB_CONNECTION_BUDGET: int = 90
+    SERVE_MAX_REQUESTS: int = 10_000
+    SERVE_MAX_REQUESTS_JITTER: int = 1_000
+
+    # Outgoing mail — point SMTP_HOST/PORT at a local stand-in server in development
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 1025
+    SMTP_USERNAME: str | None = None
+    SMTP_PASSWORD: str | None = None
+    SMTP_USE_TLS: bool = False
+    MAIL_FROM: str = "ConnectEm <no-reply@connectem.app>"
+    MAIL_BATCH_SIZE: int = 50
+    PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 30
+    EMAIL_VERIFICATION_TOKEN_EXPIRE_HOURS: int = 48
+    # Forgot-password always takes at least this long, so timing can't reveal accounts
+    FORGOT_PASSWORD_MIN_SECONDS: float = 0.25
+
+    # S3-compatible object storage (set S3_ENDPOINT_URL for MinIO / moto)
+    S3_ENDPOINT_URL: str | None = None
+    S3_REGION: str = "ap-south-1"
+    S3_BUCKET: str = "connectem-media"
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    # Public base URL objects are served from (CDN or bucket URL)
+    S3_PUBLIC_URL: str = "https://connectem-media.s3.ap-south-1.amazonaws.com"
+    AVATAR_MAX_BYTES: int = 5 * 1024 * 1024
+    AVATAR_UPLOAD_EXPIRE_SECONDS: int = 600
+    AVATAR_SIZES: List[int] = [64, 256, 512]
+
+    # Celery — broker defaults to REDIS_URL when unset
+    CELERY_BROKER_URL: str | None = None
+    CELERY_TASK_ALWAYS_EAGER: bool = False
+
+    # Idempotency-Key replay window, and how long duplicates wait on the first attempt
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_LOCK_SECONDS: int = 30
+
+    # Token-bucket rate limits per route class: (burst capacity, refill tokens/second)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+        "auth": (10, 0.2),
+        "feed": (60, 5),
+        "writes": (20, 1),
+    }
+
+    # Admission control: how long a request may wait for a pooled connection, and how
+    # many may wait at once, before it is shed with 503 instead of queueing
+    ADMISSION_MAX_WAIT_MS: int = 500
+    ADMISSION_MAX_QUEUE: int = 200
+
+    # Outbox relay: rows claimed per transaction, idle poll interval, and the
+    # approximate length each Redis event stream is trimmed to
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_INTERVAL: float = 0.5
+    OUTBOX_STREAM_MAXLEN: int = 1_000_000
+
+    # Length given to hangouts created without a duration
+    DEFAULT_HANGOUT_DURATION_MINUTES: int = 120
+
+    # Trending: score half-life, weight per kind of interest, when a post's decayed
+    # score is low enough to drop, per-city cap, and how often compaction runs
+    TRENDING_HALF_LIFE_HOURS: float = 6.0
+    TRENDING_WEIGHTS: Dict[str, float] = {"view": 0.2, "request": 1.0, "accept": 3.0}
+    TRENDING_MIN_SCORE: float = 0.05
+    TRENDING_MAX_PER_CITY: int = 5000
+    TRENDING_COMPACT_SECONDS: int = 300
+
+    # Hangout chat: live stream length per post, messages replayed on connect, how often
+    # a connection re-checks membership, and the Redis -> Postgres flush batch
+    CHAT_STREAM_MAXLEN: int = 1000
+    CHAT_REPLAY_COUNT: int = 50
+    CHAT_MEMBERSHIP_TTL_SECONDS: int = 60
+    CHAT_FLUSH_ENABLED: bool = True
+    CHAT_FLUSH_BATCH_SIZE: int = 500
+    CHAT_FLUSH_INTERVAL_MS: int = 1000
+
+    # Per-city activity counts: live deltas in Redis, rewritten from Postgres this often
+    FACET_RECONCILE_SECONDS: int = 300
+
+    # Post detail cache: per-worker LRU (bounds cross-worker staleness) over Redis
+    POST_CACHE_LOCAL_SIZE: int = 2048
+    POST_CACHE_LOCAL_TTL_SECONDS: float = 5.0
+    POST_CACHE_TTL_SECONDS: int = 300
+
+    # Routes that only need the caller's id re-check the user row this often per worker
+    AUTH_ACTIVE_CACHE_SECONDS: float = 30.0
+    AUTH_ACTIVE_CACHE_SIZE: int = 100_000
+
+    # In-process "soonest" feed index per city (off by default): full reload age,
+    # and cities with more upcoming posts than this stay on SQL
+    FEED_INDEX_ENABLED: bool = False
+    FEED_INDEX_MAX_AGE_SECONDS: int = 300
+    FEED_INDEX_MAX_POSTS_PER_CITY: int = 20_000
+
+    # GET /hangout/sync: default and largest page, and how long deletions are kept
+    # (an older sync token gets 410 and the client starts over with a full sync)
+    SYNC_PAGE_SIZE: int = 200
+    SYNC_MAX_PAGE_SIZE: int = 500
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # GET /auth/me/export: rows per server-side cursor batch, per-user lock lifetime
+    # (refreshed every batch), concurrent exports per worker (each holds a DB connection),
+    # and how long one export may keep its snapshot open before it is cut off
+    EXPORT_BATCH_SIZE: int = 500
+    EXPORT_LOCK_SECONDS: float = 60.0
+    EXPORT_MAX_CONCURRENT: int = 2
+    EXPORT_MAX_SECONDS: float = 300.0
+
+    # "People you may vibe with" batch (python -m backend.app.cli.suggestions): kept per
+    # user, weight per signal, lowest rating that counts as positive, interests held by
+    # more users than this in one city are ignored, and users scored per worker task
+    SUGGESTIONS_TOP_K: int = 20
+    SUGGESTION_WEIGHTS: Dict[str, float] = {"interests": 1.0, "hangouts": 0.5, "reviews": 1.0}
+    SUGGESTIONS_MIN_RATING: int = 4
+    SUGGESTIONS_MAX_INTEREST_USERS: int = 5_000
+    SUGGESTIONS_CHUNK_SIZE: int = 500
+
+    # Blocks and mutes: entries a user may hold, and how long each user's block set
+    # stays in Redis and in a worker's local cache (which bounds how stale another
+    # worker's copy is after a change), and how many users' sets a worker keeps
+    BLOCKS_MAX_PER_USER: int = 5_000
+    BLOCKS_CACHE_TTL_SECONDS: int = 3600
+    BLOCKS_LOCAL_TTL_SECONDS: float = 5.0
+    BLOCKS_LOCAL_SIZE: int = 10_000
+    # Extra rows a feed page reads per round trip when some posts will be dropped
+    # (hidden creators, trending posts that no longer match), so one read usually fills it
+    FEED_FETCH_SLACK: int = 10
+
+    # Log a stack trace whenever an ORM lazy load fires inside a request
+    LAZY_LOAD_WARNINGS: bool = False
+
     class Config:
         env_file = ".env"
 
@@ -1,9 +1,38 @@
+from uuid import uuid4
+
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from backend.app.config import settings
+from backend.app.middleware.admission import AdmissionPool
+from backend.app.utils.metrics import instrument_engine
+from backend.app.utils.query_budget import enable_lazy_load_warnings
+
+
+def asyncpg_connect_args() -> dict:
+    """Prepared-statement settings for every engine (see DB_PGBOUNCER)."""
+    if settings.DB_PGBOUNCER:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+
 
 # 1. Create the engine (the connection to the DB)
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    poolclass=AdmissionPool,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args=asyncpg_connect_args(),
+)
+instrument_engine(engine)
+if settings.LAZY_LOAD_WARNINGS:
+    enable_lazy_load_warnings()
 
 # 2. Create a session factory
 # This creates a new "session" (interaction) for every request
@@ -19,5 +48,11 @@ Base = declarative_base()
 
 # 4. Dependency to get the database session
 async def get_db():
+    """
+    Request-scoped session. Creating it is free: the session checks a connection
+    out of the pool on its first statement and returns it on commit or close, so a
+    request answered from cache never waits on (or holds) a pooled connection, nor
+    an admission slot (see AdmissionPool).
+    """
     async with AsyncSessionLocal() as session:
         yield session
\ No newline at end of file
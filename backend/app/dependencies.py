@@ -2,17 +2,24 @@
 Reusable FastAPI dependencies — injected into protected route handlers.
 """
 
+import time
+import uuid
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.app import queries
+from backend.app.config import settings
 from backend.app.database import get_db
 from backend.app.models.user import User
 from backend.app.utils.jwt import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# user id -> monotonic time until which the user is known to exist and be active
+_active_users: dict[uuid.UUID, float] = {}
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -36,7 +43,7 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(queries.user_by_id(user_id))
     user = result.scalars().first()
 
     if user is None or not user.is_active:
@@ -45,6 +52,40 @@ async def get_current_user(
     return user
 
 
+async def get_current_user_id(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> uuid.UUID:
+    """
+    Like get_current_user, for routes that only need the caller's id. The user row
+    is checked at most once per AUTH_ACTIVE_CACHE_SECONDS per worker, so in between
+    the request never touches the session and never checks out a connection.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    payload = decode_access_token(token)
+    try:
+        user_id = uuid.UUID(payload["sub"])
+    except (TypeError, KeyError, ValueError):
+        raise credentials_exception
+
+    now = time.monotonic()
+    if _active_users.get(user_id, 0.0) > now:
+        return user_id
+
+    result = await db.execute(queries.user_is_active(user_id))
+    if not result.scalar():
+        raise credentials_exception
+    if len(_active_users) >= settings.AUTH_ACTIVE_CACHE_SIZE:
+        _active_users.clear()
+    _active_users[user_id] = now + settings.AUTH_ACTIVE_CACHE_SECONDS
+    return user_id
+
+
 async def get_current_active_verified_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -0,0 +1,86 @@
+"""
+App lifespan — opens shared resources before the first request and drains on shutdown.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from backend.app.config import settings
+from backend.app.database import engine
+from backend.app.middleware.drain import drain_state
+from backend.app.redis_client import close_redis, init_redis
+from backend.app.services.block_service import block_service
+from backend.app.services.chat_hub import ChatFlusher, chat_hub
+from backend.app.services.city_catalog import city_catalog
+from backend.app.services.feed_index import feed_index
+from backend.app.services.post_cache import post_cache
+
+logger = logging.getLogger(__name__)
+
+
+class StartupError(RuntimeError):
+    """A required backing service is unreachable; the worker must not start."""
+
+
+async def warm_db_pool(count: int) -> None:
+    """Open ``count`` connections concurrently so early requests skip the connect cost."""
+    async def open_one():
+        conn = await engine.connect()
+        await conn.execute(text("SELECT 1"))
+        return conn
+
+    connections = await asyncio.gather(*(open_one() for _ in range(count)))
+    # Closing returns them to the pool, where they stay open.
+    for conn in connections:
+        await conn.close()
+
+
+async def _check(name: str, target: str, coro) -> None:
+    try:
+        await asyncio.wait_for(coro, settings.STARTUP_TIMEOUT)
+    except Exception as exc:
+        raise StartupError(f"Cannot reach {name} at {target}: {exc!r}") from exc
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm = max(1, min(settings.DB_POOL_WARM_CONNECTIONS, settings.DB_POOL_SIZE))
+    await _check(
+        "Postgres", engine.url.render_as_string(hide_password=True), warm_db_pool(warm)
+    )
+    # City writes and autocomplete resolve against this copy, never the DB
+    await city_catalog.load(engine)
+    redis = init_redis()
+    try:
+        await _check("Redis", settings.REDIS_URL.split("@")[-1], redis.ping())
+    except StartupError:
+        await close_redis()
+        await engine.dispose()
+        raise
+
+    flusher = ChatFlusher(redis)
+    if settings.CHAT_FLUSH_ENABLED:
+        flusher.start()
+
+    drain_state.reset()
+    chat_hub.reset()
+    post_cache.clear()
+    block_service.clear()
+    feed_index.reset()
+    logger.info("ConnectEm API started (%d DB connections warm)", warm)
+    try:
+        yield
+    finally:
+        # Chat sockets count as in-flight; close them first so they don't hold the drain open
+        await chat_hub.stop()
+        if not await drain_state.drain(settings.SHUTDOWN_DRAIN_TIMEOUT):
+            logger.warning("Shutdown drain timed out with %d request(s) in flight", drain_state.in_flight)
+        await flusher.stop()
+        await feed_index.stop()
+        await close_redis()
+        await engine.dispose()
+        logger.info("ConnectEm API stopped")
@@ -1,14 +1,35 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 from backend.app.config import settings
+from backend.app.lifespan import lifespan
+from backend.app.middleware.admission import AdmissionMiddleware
+from backend.app.middleware.drain import DrainMiddleware
+from backend.app.middleware.idempotency import IdempotencyMiddleware
+from backend.app.middleware.metrics import MetricsMiddleware
+from backend.app.middleware.rate_limit import RateLimitMiddleware
 from backend.app.routers.hangout import hangout_router
+from backend.app.utils.metrics import render_latest
 # Initialize the API
 app = FastAPI(
     title="ConnectEm API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Middleware order: the last one added is outermost and sees the request first.
+
+# Replays POST responses for a repeated Idempotency-Key without touching the DB
+app.add_middleware(IdempotencyMiddleware)
+
+# Sheds with 503 when a request waits too long for a pooled connection (see AdmissionPool)
+app.add_middleware(AdmissionMiddleware)
+
+# Per-client token buckets (429) — before admission, so abusive clients never reach the pool
+app.add_middleware(RateLimitMiddleware)
+
 # Setup CORS (Security for who can talk to your API)
+# Outside the limiters so 429/503 and replayed responses still carry CORS headers
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
@@ -17,6 +38,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, in-flight and SQL usage — exposed on /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Outermost: refuses new requests once shutdown has started, lets in-flight ones finish
+app.add_middleware(DrainMiddleware)
+
 # A simple health check to see if the server is running
 @app.get("/api/v1/health")
 async def health_check():
@@ -25,13 +52,19 @@ async def health_check():
         "environment": settings.ENVIRONMENT
     }
 
-# This runs when the server starts
-@app.on_event("startup")
-async def startup_event():
-    print("ConnectEm API started")
+# Prometheus scrape endpoint (kept outside /api/v1 and out of the docs)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_latest(), media_type=CONTENT_TYPE_LATEST)
 
 from backend.app.routers import auth
+from backend.app.routers.block import block_router
+from backend.app.routers.chat import chat_router
+from backend.app.routers.city import city_router
 
 # After creating the app, before startup event:
 app.include_router(auth.router, prefix="/api/v1")
-app.include_router(hangout_router, prefix="/api/v1")
\ No newline at end of file
+app.include_router(hangout_router, prefix="/api/v1")
+app.include_router(chat_router, prefix="/api/v1")
+app.include_router(city_router, prefix="/api/v1")
+app.include_router(block_router, prefix="/api/v1")
\ No newline at end of file
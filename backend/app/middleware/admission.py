@@ -0,0 +1,148 @@
+"""
+Admission control — a timed wait for DB pool capacity, taken at checkout.
+
+AdmissionPool is the engine's pool class. Every checkout first takes one of its
+pool_size + max_overflow slots, so the wait for a connection happens (and is
+measured) here rather than inside the pool, and it only happens when a session
+actually runs a statement. Requests answered from cache, streaming bodies and
+padded responses never hold a slot.
+
+AdmissionMiddleware marks HTTP requests. A request's checkout that waits longer
+than ADMISSION_MAX_WAIT_MS, or arrives when ADMISSION_MAX_QUEUE are already
+waiting, raises ServerBusy and the request is answered 503 instead of piling onto
+a saturated database. Checkouts outside a request (lifespan, background loops,
+Celery, CLIs) wait up to pool_timeout, as the plain pool would.
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, PoolProxiedConnection
+from sqlalchemy.util import await_only
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.config import settings
+
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds",
+    "Time checkouts waited for DB pool capacity when none was free.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_requests_total",
+    "Requests rejected with 503 by admission control.",
+    ["reason"],
+)
+
+# Cheap endpoints that must keep answering while the service is overloaded
+EXEMPT_PATHS = ("/metrics", "/api/v1/health")
+
+# Set for the duration of an HTTP request: its checkouts shed instead of queueing long
+_in_request: ContextVar[bool] = ContextVar("admission_in_request", default=False)
+
+
+class ServerBusy(Exception):
+    """A request's checkout was refused; answered with 503 by AdmissionMiddleware."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with a timed, counted wait in front of every checkout."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.slots = asyncio.Semaphore(self.size() + max(self._max_overflow, 0))
+        self.waiting = 0
+        # Records checked out through a slot; returning one frees the slot
+        self._admitted: set[ConnectionPoolEntry] = set()
+
+    def connect(self) -> PoolProxiedConnection:
+        self._admit()
+        try:
+            connection = super().connect()
+        except BaseException:
+            self.slots.release()
+            raise
+        self._admitted.add(connection._connection_record)
+        return connection
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        # Called on checkin and on detach alike
+        super()._do_return_conn(record)
+        if record in self._admitted:
+            self._admitted.discard(record)
+            self.slots.release()
+
+    def _admit(self) -> None:
+        # Runs inside SQLAlchemy's greenlet, so it can await the slot
+        if not self.slots.locked():
+            await_only(self.slots.acquire())
+            return
+
+        in_request = _in_request.get()
+        if in_request and self.waiting >= settings.ADMISSION_MAX_QUEUE:
+            ADMISSION_SHED.labels("queue_full").inc()
+            raise ServerBusy("queue_full")
+
+        timeout = settings.ADMISSION_MAX_WAIT_MS / 1000 if in_request else self._timeout
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            await_only(asyncio.wait_for(self.slots.acquire(), timeout))
+        except asyncio.TimeoutError:
+            if not in_request:
+                raise exc.TimeoutError(
+                    f"QueuePool limit of size {self.size()} overflow {self._max_overflow} reached, "
+                    f"connection timed out, timeout {timeout:.2f}"
+                ) from None
+            ADMISSION_SHED.labels("wait_timeout").inc()
+            raise ServerBusy("wait_timeout") from None
+        finally:
+            self.waiting -= 1
+            ADMISSION_WAIT.observe(time.perf_counter() - started)
+
+
+class AdmissionMiddleware:
+    """Marks HTTP requests for AdmissionPool and turns its ServerBusy into a 503."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        token = _in_request.set(True)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except ServerBusy:
+            # Mid-stream there is no status left to change; the connection just drops
+            if started:
+                raise
+            await self._shed(send)
+        finally:
+            _in_request.reset(token)
+
+    @staticmethod
+    async def _shed(send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [(b"content-type", b"application/json"), (b"retry-after", b"1")],
+        })
+        await send({"type": "http.response.body", "body": b'{"detail":"Server is busy, retry shortly"}'})
@@ -0,0 +1,71 @@
+"""
+DrainMiddleware — tracks in-flight requests and refuses new ones once shutdown starts.
+"""
+
+import asyncio
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class DrainState:
+    """Process-wide in-flight counter shared by the middleware and the lifespan."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Start admitting requests again (called on every lifespan startup)."""
+        self.in_flight = 0
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def enter(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def exit(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> bool:
+        """Stop admitting requests and wait for in-flight ones. False if the timeout hit."""
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+drain_state = DrainState()
+
+
+class DrainMiddleware:
+    def __init__(self, app: ASGIApp, state: DrainState = drain_state):
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        if self.state.draining:
+            if scope["type"] == "websocket":
+                await send({"type": "websocket.close", "code": 1001})
+                return
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [(b"connection", b"close"), (b"retry-after", b"1")],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        self.state.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.state.exit()
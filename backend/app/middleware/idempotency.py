@@ -0,0 +1,179 @@
+"""
+IdempotencyMiddleware — replays the first response for a repeated ``Idempotency-Key``.
+
+Only routes tagged with ``@idempotent`` take part. The first request with a key
+takes a short Redis lock and runs normally; its status, headers and body are stored
+for IDEMPOTENCY_TTL_SECONDS. Concurrent duplicates wait for that result instead of
+executing again, and later replays are answered here, before any dependency (and
+so any DB session) is created. If Redis is unavailable requests pass straight through.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+from typing import Callable, TypeVar
+
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.config import settings
+from backend.app.middleware.routing import client_id, resolve_route
+from backend.app.redis_client import get_redis
+from backend.app.utils.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+IDEMPOTENT_ATTR = "__idempotent__"
+HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+
+
+def idempotent(endpoint: F) -> F:
+    """Opt a route into Idempotency-Key handling. Apply below the router decorator."""
+    setattr(endpoint, IDEMPOTENT_ATTR, True)
+    return endpoint
+
+
+def _header(scope: Scope, name: bytes) -> bytes | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+def _json_response(status: int, detail: str) -> tuple[int, list, bytes]:
+    return status, [(b"content-type", b"application/json")], json.dumps({"detail": detail}).encode()
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        key = _header(scope, HEADER)
+        route = resolve_route(scope) if key else None
+        if route is None or not getattr(getattr(route, "endpoint", None), IDEMPOTENT_ATTR, False):
+            await self.app(scope, receive, send)
+            return
+        if len(key) > MAX_KEY_LENGTH:
+            await self._send(send, *_json_response(400, "Idempotency-Key is too long"))
+            return
+
+        try:
+            redis = get_redis()
+        except RuntimeError:
+            await self.app(scope, receive, send)
+            return
+
+        body, more = b"", True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+
+        # Keys are scoped to the caller (JWT subject, or IP when anonymous) and the concrete path,
+        # so a refreshed token still finds the response stored under the old one.
+        caller = client_id(scope).encode()
+        scope_hash = hashlib.sha256(caller + b"|" + scope["path"].encode() + b"|" + key).hexdigest()
+        result_key, lock_key = f"idem:{scope_hash}", f"idem:{scope_hash}:lock"
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        acquired = False
+        try:
+            cached = await redis.get(result_key)
+            if cached is None:
+                acquired = await redis.set(lock_key, b"1", nx=True, ex=settings.IDEMPOTENCY_LOCK_SECONDS)
+                if not acquired:
+                    cached = await self._wait_for_result(redis, result_key, lock_key)
+        except RedisError as exc:
+            logger.warning("Idempotency store unavailable, executing without it: %s", exc)
+            await self.app(scope, self._replay_body(body, receive), send)
+            return
+
+        if cached is not None:
+            record_cache("idempotency", True)
+            await self._replay(send, cached, fingerprint)
+            return
+        if not acquired:
+            # Lock vanished without a stored result: the first attempt failed and may be retried.
+            await self._send(send, *_json_response(409, "A request with this Idempotency-Key is still in progress"))
+            return
+
+        record_cache("idempotency", False)
+        await self._execute(scope, body, receive, send, redis, result_key, lock_key, fingerprint)
+
+    async def _execute(self, scope, body, receive, send, redis, result_key, lock_key, fingerprint) -> None:
+        status, headers, chunks = 500, [], []
+
+        async def capture(message: Message) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status, headers = message["status"], message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, self._replay_body(body, receive), capture)
+        finally:
+            try:
+                # 5xx responses aren't stored, so the client's retry really retries.
+                if status < 500:
+                    record = {
+                        "status": status,
+                        "headers": [[k.decode("latin-1"), v.decode("latin-1")] for k, v in headers],
+                        "body": base64.b64encode(b"".join(chunks)).decode(),
+                        "fingerprint": fingerprint,
+                    }
+                    await redis.set(result_key, json.dumps(record), ex=settings.IDEMPOTENCY_TTL_SECONDS)
+                await redis.delete(lock_key)
+            except RedisError as exc:
+                logger.warning("Could not store idempotent response: %s", exc)
+
+    async def _wait_for_result(self, redis, result_key: str, lock_key: str) -> bytes | None:
+        """Poll for the in-flight request's result until it lands or its lock disappears."""
+        delay, waited = 0.01, 0.0
+        while waited < settings.IDEMPOTENCY_LOCK_SECONDS:
+            await asyncio.sleep(delay)
+            waited += delay
+            cached = await redis.get(result_key)
+            if cached is not None:
+                return cached
+            if not await redis.exists(lock_key):
+                return await redis.get(result_key)
+            delay = min(delay * 2, 0.25)
+        return None
+
+    async def _replay(self, send: Send, cached: bytes, fingerprint: str) -> None:
+        record = json.loads(cached)
+        if record["fingerprint"] != fingerprint:
+            await self._send(send, *_json_response(422, "Idempotency-Key was reused with a different request body"))
+            return
+        headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]]
+        headers.append((b"idempotent-replayed", b"true"))
+        await self._send(send, record["status"], headers, base64.b64decode(record["body"]))
+
+    @staticmethod
+    def _replay_body(body: bytes, receive: Receive) -> Receive:
+        """Hand the already-read body to the app, then defer to the real channel."""
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+        return replay
+
+    @staticmethod
+    async def _send(send: Send, status: int, headers: list, body: bytes) -> None:
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
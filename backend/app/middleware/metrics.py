@@ -0,0 +1,68 @@
+"""
+MetricsMiddleware — records latency, in-flight requests and SQL usage per route template.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.middleware.routing import resolve_route
+from backend.app.utils.metrics import (
+    DB_CHECKOUTS_PER_REQUEST,
+    DB_STATEMENTS_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    QueryStats,
+    current_query_stats,
+)
+
+# Requests that match no route share one label instead of leaking raw paths.
+UNMATCHED_ROUTE = "__unmatched__"
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware) so it adds only a few
+    microseconds per request and never buffers the response body.
+    """
+
+    def __init__(self, app: ASGIApp, skip_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            current_query_stats.reset(token)
+            HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(elapsed)
+            DB_STATEMENTS_PER_REQUEST.labels(method, route).observe(stats.statements)
+            DB_CHECKOUTS_PER_REQUEST.labels(method, route).observe(stats.checkouts)
+            DB_TIME_PER_REQUEST.labels(method, route).observe(stats.db_time)
+
+    def _route_template(self, scope: Scope) -> str:
+        """Resolve the route template up front so the in-flight gauge can use it."""
+        route = resolve_route(scope)
+        return route.path if route is not None else UNMATCHED_ROUTE
@@ -0,0 +1,159 @@
+"""
+RateLimitMiddleware — per-client token buckets, evaluated atomically in Redis.
+
+Each route belongs to a class (auth / feed / writes) with its own bucket size and
+refill rate from settings.RATE_LIMITS. Clients are keyed by the JWT subject when a
+valid bearer token is present, otherwise by IP. One EVALSHA per request; if Redis
+errors, a per-process in-memory bucket takes over until REDIS_RETRY_SECONDS pass.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, TypeVar
+
+from prometheus_client import Counter
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.app.config import settings
+from backend.app.middleware.routing import client_id, resolve_route
+from backend.app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+RATE_LIMIT_CLASS_ATTR = "__rate_limit_class__"
+REDIS_RETRY_SECONDS = 5.0
+LOCAL_MAX_BUCKETS = 100_000
+
+RATE_LIMITED = Counter(
+    "rate_limited_requests_total",
+    "Requests rejected by the rate limiter, by route class.",
+    ["route_class"],
+)
+
+# KEYS[1] bucket key; ARGV: capacity, refill tokens/second.
+# Returns {allowed (0/1), tokens left (floored), ms until one token is available}.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + (now - ts) * rate / 1000)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 't', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+
+local wait = 0
+if allowed == 0 then
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+return {allowed, math.floor(tokens), wait}
+"""
+
+
+def rate_limit_class(name: str) -> Callable[[F], F]:
+    """Put a route in a named rate-limit class. Untagged GETs are 'feed', other methods 'writes'."""
+    def decorator(endpoint: F) -> F:
+        setattr(endpoint, RATE_LIMIT_CLASS_ATTR, name)
+        return endpoint
+    return decorator
+
+
+class LocalTokenBuckets:
+    """In-process fallback with the same semantics as the Lua script, LRU-bounded."""
+
+    def __init__(self, max_buckets: int = LOCAL_MAX_BUCKETS):
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.max_buckets = max_buckets
+
+    def take(self, key: str, capacity: float, rate: float) -> tuple[bool, int, int]:
+        now = time.monotonic()
+        tokens, ts = self.buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - ts) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.buckets[key] = (tokens, now)
+        if len(self.buckets) > self.max_buckets:
+            self.buckets.popitem(last=False)
+        wait_ms = 0 if allowed else math.ceil((1 - tokens) * 1000 / rate)
+        return allowed, int(tokens), wait_ms
+
+
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.local = LocalTokenBuckets()
+        self._script = None
+        self._redis_down_until = 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        route = resolve_route(scope)
+        endpoint = getattr(route, "endpoint", None)
+        if endpoint is None:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = getattr(endpoint, RATE_LIMIT_CLASS_ATTR, None) or (
+            "feed" if scope["method"] == "GET" else "writes"
+        )
+        limit = settings.RATE_LIMITS.get(route_class)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        capacity, rate = limit
+
+        key = f"rl:{route_class}:{client_id(scope)}"
+        allowed, remaining, wait_ms = await self._take(key, capacity, rate)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        RATE_LIMITED.labels(route_class).inc()
+        retry_after = str(max(1, math.ceil(wait_ms / 1000))).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"retry-after", retry_after),
+                (b"ratelimit-limit", str(int(capacity)).encode()),
+                (b"ratelimit-remaining", b"0"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b'{"detail":"Too many requests"}'})
+
+    async def _take(self, key: str, capacity: float, rate: float) -> tuple[bool, int, int]:
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                redis = get_redis()
+                if self._script is None or self._script.registered_client is not redis:
+                    self._script = redis.register_script(TOKEN_BUCKET_LUA)
+                allowed, remaining, wait_ms = await self._script(keys=[key], args=[capacity, rate])
+                return bool(allowed), int(remaining), int(wait_ms)
+            except (RedisError, RuntimeError) as exc:
+                logger.warning("Rate limiter falling back to local buckets: %s", exc)
+                self._script = None
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        return self.local.take(key, capacity, rate)
@@ -0,0 +1,45 @@
+"""
+Route and caller resolution shared by the ASGI middlewares — worked out once per request, cached on the scope.
+"""
+
+from starlette.routing import BaseRoute, Match
+from starlette.types import Scope
+
+from backend.app.utils.jwt import decode_access_token
+
+_SCOPE_KEY = "connectem.route"
+_CLIENT_SCOPE_KEY = "connectem.client"
+
+
+def resolve_route(scope: Scope) -> BaseRoute | None:
+    """Return the route that will handle this request, before the router runs."""
+    if _SCOPE_KEY in scope:
+        return scope[_SCOPE_KEY]
+
+    route = None
+    router = getattr(scope.get("app"), "router", None)
+    if router is not None:
+        for candidate in router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    scope[_SCOPE_KEY] = route
+    return route
+
+
+def client_id(scope: Scope) -> str:
+    """The caller: ``u:<sub>`` for a valid bearer token, otherwise ``ip:<address>``."""
+    if _CLIENT_SCOPE_KEY in scope:
+        return scope[_CLIENT_SCOPE_KEY]
+
+    client = scope.get("client")
+    caller = f"ip:{client[0] if client else 'unknown'}"
+    for name, value in scope["headers"]:
+        if name == b"authorization" and value[:7].lower() == b"bearer ":
+            payload = decode_access_token(value[7:].decode("latin-1"))
+            if payload and payload.get("sub"):
+                caller = f"u:{payload['sub']}"
+            break
+    scope[_CLIENT_SCOPE_KEY] = caller
+    return caller
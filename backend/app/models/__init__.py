@@ -1,2 +1,7 @@
-from backend.app.models.user import User, RefreshToken
-from backend.app.models.hangout import HangoutPost, HangoutParticipant, HangoutRequest, Review
\ No newline at end of file
+from backend.app.models.user import User, RefreshToken, EmailToken
+from backend.app.models.hangout import HangoutPost, HangoutParticipant, HangoutRequest, Review, ChatMessage
+from backend.app.models.outbox import OutboxEvent
+from backend.app.models.city import City
+from backend.app.models.sync import SyncTombstone
+from backend.app.models.suggestion import UserSuggestions
+from backend.app.models.block import UserBlock
\ No newline at end of file
@@ -0,0 +1,27 @@
+import uuid
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from backend.app.database import Base
+
+
+class UserBlock(Base):
+    """
+    One user blocking or muting another. A block works both ways: neither sees the
+    other's posts or can request to join them. A mute only hides the target's posts
+    from the muter. Read as a whole per user through block_service's cache.
+    """
+    __tablename__ = "user_blocks"
+    __table_args__ = (
+        # "Who blocked me" for the reverse direction of the block set
+        Index("ix_user_blocks_target_id", "target_id"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    target_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    kind: Mapped[str] = mapped_column(Enum('block', 'mute', name='block_kind_enum'), nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import Identity, Integer, String, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+from backend.app.database import Base
+
+
+class City(Base):
+    """
+    Canonical city. Free-text input ("mumbai ", "Bombay") is resolved to one row by
+    its normalized key or an alias (see backend.app.services.city_catalog).
+    """
+    __tablename__ = "cities"
+
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    # Display name written back onto users and posts
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    # normalize_city(name); aliases are stored normalized too
+    key: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    aliases: Mapped[list[str]] = mapped_column(ARRAY(String(100)), nullable=False, server_default=text("'{}'"))
+    # Ranks autocomplete suggestions; bigger cities first
+    population: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
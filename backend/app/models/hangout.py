@@ -1,13 +1,24 @@
 import uuid
-from sqlalchemy import String, Text, DateTime, ForeignKey, Integer, Boolean, Enum, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DDL, BigInteger, String, Text, DateTime, ForeignKey, Integer, Boolean, Enum, Index, Computed, event, func, text
+from sqlalchemy.dialects.postgresql import TSTZRANGE, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.app.database import Base
 
 # We define these models to match the 4 tables in your prompt
 
+# Id of the writing transaction; a BEFORE UPDATE trigger re-stamps it (see models/sync.py)
+CURRENT_XID = text("(pg_current_xact_id()::text)::bigint")
+
 class HangoutPost(Base):
     __tablename__ = "hangout_posts"
+    # Overlap (&&) probes for schedule conflicts
+    __table_args__ = (
+        Index("ix_hangout_posts_time_range", "time_range", postgresql_using="gist"),
+        # City feed: one catalog id, soonest first
+        Index("ix_hangout_posts_city_id_scheduled_at", "city_id", "scheduled_at"),
+        # Delta sync: a host's posts changed since a watermark
+        Index("ix_hangout_posts_creator_id_change_xid", "creator_id", "change_xid"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     creator_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -15,17 +26,27 @@ class HangoutPost(Base):
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     
-    # Enums constrain the database to specific allowed values
+    # Enums constrain the database to specific allowed values: the API's activity
+    # types, then the older ones seeded and bulk-loaded posts still carry
     activity_type: Mapped[str] = mapped_column(
-        Enum('Dining_NightLife', 'Entertainment', 'Sports', 'Arcade_Adventure', 'Casual_WentOut', 'Event', 'Dating', name='activity_type_enum'), 
+        Enum('movies', 'dining_nightlife', 'adventure_trips', 'sports', 'casual_hangout', 'dating',
+             'Dining_NightLife', 'Entertainment', 'Sports', 'Arcade_Adventure', 'Casual_WentOut', 'Event', 'Dating',
+             name='activity_type_enum'),
         nullable=False
     )
     dating_preferences: Mapped[str | None] = mapped_column(Text, nullable=True)
     city: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    # Set when ``city`` resolved against the city catalog; feeds filter on this
+    city_id: Mapped[int | None] = mapped_column(ForeignKey("cities.id"), nullable=True)
     venue_name: Mapped[str | None] = mapped_column(String(200), nullable=True)
     venue_address: Mapped[str | None] = mapped_column(Text, nullable=True)
     
     scheduled_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
+    ends_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Maintained by Postgres; deferred so post reads never load it
+    time_range = mapped_column(
+        TSTZRANGE, Computed("tstzrange(scheduled_at, ends_at, '[)')", persisted=True), deferred=True
+    )
     max_participants: Mapped[int] = mapped_column(Integer, nullable=False)
     
     status: Mapped[str] = mapped_column(
@@ -36,6 +57,10 @@ class HangoutPost(Base):
     
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
+    # Delta sync bookkeeping, maintained by Postgres on every insert and update
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default=CURRENT_XID, nullable=False)
+
     # Relationships
     creator = relationship("User", back_populates="hangout_posts")
     requests = relationship("HangoutRequest", back_populates="post", cascade="all, delete-orphan")
@@ -44,6 +69,14 @@ class HangoutPost(Base):
 
 class HangoutRequest(Base):
     __tablename__ = "hangout_requests"
+    # Delta sync: requests a user sent, and requests on a host's posts
+    __table_args__ = (
+        Index("ix_hangout_requests_requester_id_change_xid", "requester_id", "change_xid"),
+        Index("ix_hangout_requests_post_id_change_xid", "post_id", "change_xid"),
+        # A post's waitlist, oldest first: the head is promoted when a seat frees up
+        Index("ix_hangout_requests_waitlist", "post_id", "created_at", "id",
+              postgresql_where=text("status = 'waitlisted'")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     post_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("hangout_posts.id"), nullable=False, index=True)
@@ -51,12 +84,16 @@ class HangoutRequest(Base):
     
     message: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(
-        Enum('pending', 'accepted', 'declined', 'cancelled', name='request_status_enum'), 
+        Enum('pending', 'accepted', 'declined', 'cancelled', 'waitlisted', name='request_status_enum'), 
         default='pending'
     )
     responded_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
+    # Delta sync bookkeeping, maintained by Postgres on every insert and update
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default=CURRENT_XID, nullable=False)
+
     # Relationships
     post = relationship("HangoutPost", back_populates="requests")
     requester = relationship("User")
@@ -64,6 +101,13 @@ class HangoutRequest(Base):
 
 class HangoutParticipant(Base):
     __tablename__ = "hangout_participants"
+    # Delta sync: a user's participations, and the roster of a host's posts
+    __table_args__ = (
+        Index("ix_hangout_participants_user_id_change_xid", "user_id", "change_xid"),
+        Index("ix_hangout_participants_post_id_change_xid", "post_id", "change_xid"),
+        # Schedule conflicts: one user's seats whose time overlaps (btree_gist for user_id)
+        Index("ix_hangout_participants_user_id_time_range", "user_id", "time_range", postgresql_using="gist"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     post_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("hangout_posts.id"), nullable=False, index=True)
@@ -71,12 +115,51 @@ class HangoutParticipant(Base):
     
     role: Mapped[str] = mapped_column(Enum('host', 'participant', name='participant_role_enum'), nullable=False)
     joined_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # The post's time_range, copied in by triggers (see PARTICIPANT_TIME_RANGE_DDL);
+    # deferred so roster reads never load it
+    time_range = mapped_column(TSTZRANGE, nullable=True, deferred=True)
+
+    # Delta sync bookkeeping, maintained by Postgres on every insert and update
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default=CURRENT_XID, nullable=False)
 
     # Relationships
     post = relationship("HangoutPost", back_populates="participants")
     user = relationship("User")
 
 
+# A seat takes its post's time_range on insert, and follows the post when it moves
+PARTICIPANT_TIME_RANGE_DDL = [
+    """
+CREATE OR REPLACE FUNCTION participant_time_range() RETURNS trigger AS $$
+BEGIN
+    SELECT time_range INTO NEW.time_range FROM hangout_posts WHERE id = NEW.post_id;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+""",
+    """
+CREATE OR REPLACE FUNCTION post_time_range_moved() RETURNS trigger AS $$
+BEGIN
+    UPDATE hangout_participants SET time_range = NEW.time_range WHERE post_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""",
+    "CREATE TRIGGER hangout_participants_time_range BEFORE INSERT OR UPDATE OF post_id "
+    "ON hangout_participants FOR EACH ROW EXECUTE FUNCTION participant_time_range()",
+    "CREATE TRIGGER hangout_posts_time_range_moved AFTER UPDATE OF scheduled_at, ends_at "
+    "ON hangout_posts FOR EACH ROW WHEN (OLD.time_range IS DISTINCT FROM NEW.time_range) "
+    "EXECUTE FUNCTION post_time_range_moved()",
+]
+
+# create_all (tests, benchmarks) gets these too; migrations install their own copy
+event.listen(Base.metadata, "before_create",
+             DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"))
+for _statement in PARTICIPANT_TIME_RANGE_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
 class Review(Base):
     __tablename__ = "reviews"
 
@@ -92,4 +175,20 @@ class Review(Base):
     # Relationships
     hangout = relationship("HangoutPost")
     reviewer = relationship("User", foreign_keys=[reviewer_id])
-    reviewee = relationship("User", foreign_keys=[reviewee_id])
\ No newline at end of file
+    reviewee = relationship("User", foreign_keys=[reviewee_id])
+
+
+class ChatMessage(Base):
+    __tablename__ = "chat_messages"
+    # History pages walk (created_at, id) backwards within one post
+    __table_args__ = (
+        Index("ix_chat_messages_post_id_created_at_id", "post_id", "created_at", "id"),
+    )
+
+    # Assigned when the message is sent; rows arrive later in batches from Redis
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    post_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("hangout_posts.id"), nullable=False)
+    sender_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
\ No newline at end of file
@@ -0,0 +1,21 @@
+import uuid
+from sqlalchemy import BigInteger, DateTime, Identity, String, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from backend.app.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    A domain event written in the same transaction as the change it describes.
+    Rows only become visible to the relay once that transaction commits.
+    """
+    __tablename__ = "outbox_events"
+
+    # Identity gives the relay a total order to publish in
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    aggregate_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    aggregate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,21 @@
+import uuid
+from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from backend.app.database import Base
+
+
+class UserSuggestions(Base):
+    """
+    Precomputed "people you may vibe with" for one user, rewritten by the batch
+    job (backend.app.cli.suggestions). Read by primary key, already serialized.
+    """
+    __tablename__ = "user_suggestions"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Best first: [{"user_id", "username", "full_name", "avatar_url", "score",
+    #               "shared_interests", "hangouts_together", "positive_reviews"}]
+    suggestions: Mapped[list] = mapped_column(JSONB, nullable=False)
+    computed_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
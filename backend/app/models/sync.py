@@ -0,0 +1,80 @@
+import uuid
+from sqlalchemy import DDL, BigInteger, DateTime, Identity, Index, String, event, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from backend.app.database import Base
+from backend.app.models.hangout import CURRENT_XID
+
+
+class SyncTombstone(Base):
+    """
+    A deleted post, request or participation, kept so delta sync can tell clients
+    to drop it. Written by an AFTER DELETE trigger; purged after
+    SYNC_TOMBSTONE_RETENTION_DAYS, which is also how old a sync token may get.
+    """
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_id_change_xid", "user_id", "change_xid"),
+        Index("ix_sync_tombstones_post_id_change_xid", "post_id", "change_xid"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    # "post", "request" or "participation"
+    entity: Mapped[str] = mapped_column(String(20), nullable=False)
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    # The post it belonged to (a post's own id for posts), and the user it belonged to
+    post_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default=CURRENT_XID, nullable=False)
+    deleted_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# (table, tombstone entity, owning post column, owning user column)
+SYNCED_TABLES = [
+    ("hangout_posts", "post", "id", "creator_id"),
+    ("hangout_requests", "request", "post_id", "requester_id"),
+    ("hangout_participants", "participation", "post_id", "user_id"),
+]
+
+# Updates re-stamp the row with the writing transaction; no-op updates keep the old stamp
+TOUCH_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_touch() RETURNS trigger AS $$
+BEGIN
+    IF NEW IS DISTINCT FROM OLD THEN
+        NEW.updated_at := now();
+        NEW.change_xid := (pg_current_xact_id()::text)::bigint;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# TG_ARGV: entity name, owning post column, owning user column
+TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_tombstone() RETURNS trigger AS $$
+DECLARE
+    old_row jsonb := to_jsonb(OLD);
+BEGIN
+    INSERT INTO sync_tombstones (entity, entity_id, post_id, user_id)
+    VALUES (TG_ARGV[0], OLD.id, (old_row ->> TG_ARGV[1])::uuid, (old_row ->> TG_ARGV[2])::uuid);
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def trigger_statements() -> list[str]:
+    statements = [TOUCH_FUNCTION, TOMBSTONE_FUNCTION]
+    for table, entity, post_column, user_column in SYNCED_TABLES:
+        statements += [
+            f"CREATE TRIGGER {table}_sync_touch BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION sync_touch()",
+            f"CREATE TRIGGER {table}_sync_tombstone AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION sync_tombstone('{entity}', '{post_column}', '{user_column}')",
+        ]
+    return statements
+
+
+# create_all (tests, benchmarks) gets the triggers too; migrations install their own copy
+for _statement in trigger_statements():
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column,ARRAY,String, Boolean, DateTime, ForeignKey, Text, Float, func
+from sqlalchemy import Column,ARRAY,String, Boolean, DateTime, Enum, ForeignKey, Text, Float, func
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.app.database import Base
@@ -21,6 +21,8 @@ class User(Base):
     avatar_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
     
     city: Mapped[str | None] = mapped_column(String(100), nullable=True, index=True)
+    # Set when ``city`` resolved against the city catalog
+    city_id: Mapped[int | None] = mapped_column(ForeignKey("cities.id"), nullable=True, index=True)
     latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
     longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
     
@@ -54,4 +56,24 @@ class RefreshToken(Base):
     device_info: Mapped[str | None] = mapped_column(String(255), nullable=True)
     
     # Link back to the User model
-    user = relationship("User", back_populates="refresh_tokens")
\ No newline at end of file
+    user = relationship("User", back_populates="refresh_tokens")
+
+
+class EmailToken(Base):
+    """One-time token mailed to a user for password reset or email verification."""
+    __tablename__ = "email_tokens"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+
+    # Only the SHA256 of the token is stored; lookups go through this unique index
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True, index=True)
+    purpose: Mapped[str] = mapped_column(
+        Enum('password_reset', 'email_verification', name='email_token_purpose_enum'),
+        nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User")
\ No newline at end of file
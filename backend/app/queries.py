@@ -0,0 +1,105 @@
+"""
+Hot statements, defined once as lambda statements.
+
+A plain ``select()`` is rebuilt on every call, and SQLAlchemy walks the whole
+construct to compute its cache key before it can find the compiled SQL. A
+``lambda_stmt`` is keyed by the lambda's code location and its closure variables
+become bound parameters. After the first call, the Python cost is collecting
+those parameters. Each optional clause is its own ``+=`` step, so each filter
+combination is a separately cached shape.
+
+The compiled SQL is then the same string on every call. The asyncpg dialect keeps
+a per-connection LRU of prepared statements keyed by that string
+(``connect_args`` in backend.app.database). A hot query is therefore parsed and
+planned once per connection, not once per request.
+
+Closure variables must be plain values (ids, strings, lists, datetimes), not SQL
+constructs or containers holding them; unpack dicts before building a statement.
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import any_, func, lambda_stmt, select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from backend.app.models.hangout import HangoutParticipant, HangoutPost
+from backend.app.models.user import RefreshToken, User
+
+
+def participant_count():
+    """Correlated COUNT of a post's participants, for use inside a HangoutPost query."""
+    return (
+        select(func.count())
+        .where(HangoutParticipant.post_id == HangoutPost.id)
+        .correlate(HangoutPost)
+        .scalar_subquery()
+    )
+
+
+# ─── USERS / TOKENS ───────────────────────────────────────────────────────────
+
+def user_by_id(user_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def user_is_active(user_id: UUID) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User.is_active).where(User.id == user_id))
+
+
+def refresh_token_by_hash(token_hash: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(RefreshToken).where(RefreshToken.token_hash == token_hash))
+
+
+# ─── POSTS ────────────────────────────────────────────────────────────────────
+
+def post_detail(post_id: UUID) -> StatementLambdaElement:
+    """A post with its creator and participants joined in."""
+    return lambda_stmt(
+        lambda: select(HangoutPost)
+        .options(joinedload(HangoutPost.creator), joinedload(HangoutPost.participants))
+        .where(HangoutPost.id == post_id)
+    )
+
+
+def _upcoming(now: datetime) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(HangoutPost).where(HangoutPost.status == 'open', HangoutPost.scheduled_at >= now)
+    )
+
+
+def _filtered(stmt: StatementLambdaElement, filters: dict) -> StatementLambdaElement:
+    """Feed filters: any of several activity types, a start-time window, free seats only."""
+    activity_types = filters.get("activity_types")
+    starts_after = filters.get("starts_after")
+    starts_before = filters.get("starts_before")
+    if activity_types:
+        stmt += lambda s: s.where(HangoutPost.activity_type.in_(activity_types))
+    if starts_after:
+        stmt += lambda s: s.where(HangoutPost.scheduled_at >= starts_after)
+    if starts_before:
+        stmt += lambda s: s.where(HangoutPost.scheduled_at < starts_before)
+    if filters.get("has_free_seats"):
+        stmt += lambda s: s.where(participant_count() < HangoutPost.max_participants)
+    return stmt
+
+
+def feed(city_id: int | None, city: str, filters: dict, now: datetime,
+         offset: int, limit: int) -> StatementLambdaElement:
+    """One page of a city's open upcoming posts, soonest first; ``city`` is used when there is no id."""
+    stmt = _upcoming(now)
+    if city_id is not None:
+        stmt += lambda s: s.where(HangoutPost.city_id == city_id)
+    else:
+        stmt += lambda s: s.where(HangoutPost.city == city)
+    stmt = _filtered(stmt, filters)
+    stmt += lambda s: s.order_by(HangoutPost.scheduled_at.asc()).offset(offset).limit(limit)
+    return stmt
+
+
+def posts_by_ids(post_ids: list[UUID], filters: dict, now: datetime) -> StatementLambdaElement:
+    """The listed posts that are still open, upcoming and match ``filters``, in any order."""
+    stmt = _upcoming(now)
+    stmt += lambda s: s.where(HangoutPost.id == any_(post_ids))
+    return _filtered(stmt, filters)
@@ -0,0 +1,38 @@
+"""
+Shared Redis connection pool — created once per process by the app lifespan.
+"""
+
+from redis.asyncio import ConnectionPool, Redis
+
+from backend.app.config import settings
+
+redis_pool: ConnectionPool | None = None
+redis_client: Redis | None = None
+
+
+def init_redis() -> Redis:
+    """Create the process-wide pool and client (no connection is opened yet)."""
+    global redis_pool, redis_client
+    redis_pool = ConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        decode_responses=False,
+    )
+    redis_client = Redis(connection_pool=redis_pool)
+    return redis_client
+
+
+async def close_redis() -> None:
+    global redis_pool, redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+    if redis_pool is not None:
+        await redis_pool.disconnect()
+    redis_pool = redis_client = None
+
+
+def get_redis() -> Redis:
+    """Dependency returning the shared Redis client."""
+    if redis_client is None:
+        raise RuntimeError("Redis pool is not initialised; is the app lifespan running?")
+    return redis_client
@@ -2,16 +2,32 @@
 Auth Router — REST endpoints for registration, login, token management, and profile.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+import uuid
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from redis.asyncio import Redis
+from sqlalchemy import Text, cast, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from backend.app.database import get_db
-from backend.app.dependencies import get_current_user
+from backend.app.config import settings
+from backend.app.database import engine, get_db
+from backend.app.dependencies import get_current_user, get_current_user_id
+from backend.app.middleware.idempotency import idempotent
+from backend.app.middleware.rate_limit import rate_limit_class
+from backend.app.models.suggestion import UserSuggestions
 from backend.app.models.user import User
+from backend.app.redis_client import get_redis
 from backend.app.schemas.auth import (
+    AvatarCompleteRequest,
+    AvatarUploadRequest,
+    AvatarUploadResponse,
+    EmailVerificationRequest,
+    ForgotPasswordRequest,
     LoginRequest,
     MessageResponse,
+    PasswordResetRequest,
     RefreshTokenRequest,
     RegisterRequest,
     TokenResponse,
@@ -19,12 +35,23 @@ from backend.app.schemas.auth import (
     UserResponse,
 )
 from backend.app.services.auth_service import AuthService
+from backend.app.services.city_catalog import city_catalog
+from backend.app.services.export_service import export_service
+from backend.app.services.mail_service import MailService
+from backend.app.services.post_cache import post_cache
+from backend.app.tasks.avatars import process_avatar
+from backend.app.utils.query_budget import query_budget
+from backend.app.utils.storage import presign_upload
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 auth_service = AuthService()
+mail_service = MailService()
 
 
 @router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
+@rate_limit_class("auth")
+@query_budget(4)
+@idempotent
 async def register(data: RegisterRequest, db: AsyncSession = Depends(get_db)):
     """Register a new user account."""
     user = await auth_service.register(db, data)
@@ -36,6 +63,8 @@ async def register(data: RegisterRequest, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/login", response_model=dict)
+@rate_limit_class("auth")
+@query_budget(2)
 async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
     """Login with email and password, returns access + refresh tokens."""
     tokens = await auth_service.login(db, data)
@@ -47,6 +76,8 @@ async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=dict)
+@rate_limit_class("auth")
+@query_budget(1)
 async def refresh_token(data: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
     """Exchange a valid refresh token for a new access token."""
     tokens = await auth_service.refresh(db, data.refresh_token)
@@ -58,6 +89,7 @@ async def refresh_token(data: RefreshTokenRequest, db: AsyncSession = Depends(ge
 
 
 @router.post("/logout", response_model=dict)
+@query_budget(3)
 async def logout(
     data: RefreshTokenRequest,
     current_user: User = Depends(get_current_user),
@@ -73,6 +105,7 @@ async def logout(
 
 
 @router.get("/me", response_model=dict)
+@query_budget(1)
 async def get_current_user_profile(current_user: User = Depends(get_current_user)):
     """Get the authenticated user's profile."""
     return {
@@ -83,6 +116,7 @@ async def get_current_user_profile(current_user: User = Depends(get_current_user
 
 
 @router.patch("/me", response_model=dict)
+@query_budget(3)
 async def update_profile(
     data: UpdateProfileRequest,
     current_user: User = Depends(get_current_user),
@@ -95,7 +129,7 @@ async def update_profile(
     if data.bio is not None:
         current_user.bio = data.bio
     if data.city is not None:
-        current_user.city = data.city
+        current_user.city, current_user.city_id = city_catalog.canonical(data.city)
     if data.latitude is not None:
         current_user.latitude = data.latitude
     if data.longitude is not None:
@@ -105,9 +139,167 @@ async def update_profile(
 
     await db.commit()
     await db.refresh(current_user)
+    # The creator's profile is embedded in their cached post details
+    await post_cache.invalidate_creator(current_user.id)
 
     return {
         "success": True,
         "data": UserResponse.model_validate(current_user),
         "message": "Profile updated successfully",
+    }
+
+
+@router.get("/me/export")
+@query_budget(8)
+async def export_my_data(
+    current_user_id: uuid.UUID = Depends(get_current_user_id),
+    redis: Redis = Depends(get_redis),
+):
+    """Download everything stored about the authenticated user, one JSON record per line."""
+    # The request's session is closed before the body streams; the export opens its own connection
+    token = await export_service.start(redis, current_user_id)
+    return StreamingResponse(
+        export_service.stream(engine, redis, current_user_id, token),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="connectem-export-{current_user_id}.ndjson"'},
+    )
+
+
+@router.get("/me/suggestions", response_model=dict)
+@query_budget(2)
+async def get_suggestions(
+    current_user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """People the authenticated user may vibe with, precomputed by the nightly batch."""
+    # One primary-key read; the stored JSON goes out without being parsed
+    row = (await db.execute(
+        select(cast(UserSuggestions.suggestions, Text), UserSuggestions.computed_at)
+        .where(UserSuggestions.user_id == current_user_id)
+    )).first()
+    suggestions, computed_at = row if row else ("[]", None)
+    computed = f'"{computed_at.isoformat()}"' if computed_at else "null"
+    return Response(
+        content=b'{"success":true,"data":{"suggestions":' + suggestions.encode()
+        + b',"computed_at":' + computed.encode() + b'},"message":"Suggestions retrieved"}',
+        media_type="application/json",
+    )
+
+
+# ─── PASSWORD RESET & EMAIL VERIFICATION ──────────────────────────────────────
+# Emails are queued after the response is sent; SMTP is only ever touched by Celery.
+
+@router.post("/forgot-password", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+@rate_limit_class("auth")
+@query_budget(2)
+async def forgot_password(
+    data: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+):
+    """Email a password reset link. Same response and timing whether or not the account exists."""
+    issued = await auth_service.request_password_reset(db, data.email)
+    if issued:
+        background_tasks.add_task(mail_service.send_password_reset, redis, *issued)
+    message = "If that email is registered, a reset link is on its way"
+    return {
+        "success": True,
+        "data": MessageResponse(message=message),
+        "message": message,
+    }
+
+
+@router.post("/reset-password", response_model=dict)
+@rate_limit_class("auth")
+@query_budget(3)
+async def reset_password(data: PasswordResetRequest, db: AsyncSession = Depends(get_db)):
+    """Set a new password using a reset token. Logs out every existing session."""
+    await auth_service.reset_password(db, data)
+    return {
+        "success": True,
+        "data": MessageResponse(message="Password has been reset"),
+        "message": "Password has been reset",
+    }
+
+
+@router.post("/verify-email/send", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+@rate_limit_class("auth")
+@query_budget(2)
+async def send_verification_email(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+):
+    """Email the authenticated user a verification link."""
+    if current_user.is_verified:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already verified")
+    raw_token = await auth_service.issue_email_token(db, current_user.id, "email_verification")
+    background_tasks.add_task(mail_service.send_email_verification, redis, current_user.email, raw_token)
+    return {
+        "success": True,
+        "data": MessageResponse(message="Verification email sent"),
+        "message": "Verification email sent",
+    }
+
+
+@router.post("/verify-email", response_model=dict)
+@rate_limit_class("auth")
+@query_budget(2)
+async def verify_email(data: EmailVerificationRequest, db: AsyncSession = Depends(get_db)):
+    """Confirm an email address using the token from the verification email."""
+    await auth_service.verify_email(db, data.token)
+    return {
+        "success": True,
+        "data": MessageResponse(message="Email verified"),
+        "message": "Email verified",
+    }
+
+
+# ─── AVATAR UPLOAD ────────────────────────────────────────────────────────────
+# Clients upload straight to object storage; image bytes never pass through the API.
+
+def _avatar_upload_prefix(user: User) -> str:
+    return f"uploads/avatars/{user.id}/"
+
+
+@router.post("/me/avatar/upload-url", response_model=dict)
+@query_budget(1)
+async def create_avatar_upload(
+    data: AvatarUploadRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Issue a presigned POST for uploading a new avatar directly to storage."""
+    key = f"{_avatar_upload_prefix(current_user)}{uuid.uuid4().hex}"
+    presigned = presign_upload(
+        key, data.content_type, settings.AVATAR_MAX_BYTES, settings.AVATAR_UPLOAD_EXPIRE_SECONDS
+    )
+    return {
+        "success": True,
+        "data": AvatarUploadResponse(
+            key=key,
+            url=presigned["url"],
+            fields=presigned["fields"],
+            expires_in=settings.AVATAR_UPLOAD_EXPIRE_SECONDS,
+        ),
+        "message": "Upload URL created",
+    }
+
+
+@router.post("/me/avatar/complete", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+@query_budget(1)
+async def complete_avatar_upload(
+    data: AvatarCompleteRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Queue thumbnail generation for a finished upload; avatar_url updates when it's done."""
+    if not data.key.startswith(_avatar_upload_prefix(current_user)):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your upload")
+    # Publishing to the broker is blocking I/O
+    await run_in_threadpool(process_avatar.delay, str(current_user.id), data.key)
+    return {
+        "success": True,
+        "data": MessageResponse(message="Avatar is being processed"),
+        "message": "Avatar is being processed",
     }
\ No newline at end of file
@@ -0,0 +1,49 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.database import get_db
+from backend.app.dependencies import get_current_user_id
+from backend.app.schemas.block import BlockResponse, BlockUserRequest
+from backend.app.services.block_service import block_service
+from backend.app.utils.query_budget import query_budget
+
+block_router = APIRouter(prefix="/blocks", tags=["Blocks"])
+
+
+@block_router.get("", response_model=dict)
+@query_budget(1)
+async def get_blocks(
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user_id)
+):
+    """Users the authenticated user blocks or mutes, newest first."""
+    blocks = [BlockResponse.model_validate(row) for row in await block_service.entries(db, current_user_id)]
+    return {"success": True, "data": blocks, "message": "Blocks retrieved"}
+
+
+@block_router.put("/{user_id}", response_model=dict)
+@query_budget(3)
+async def block_user(
+    user_id: UUID,
+    data: BlockUserRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user_id)
+):
+    """Block or mute a user. Repeating it is harmless; a different kind replaces the old one."""
+    await block_service.block(db, current_user_id, user_id, data.kind)
+    message = "User blocked" if data.kind == 'block' else "User muted"
+    return {"success": True, "data": None, "message": message}
+
+
+@block_router.delete("/{user_id}", response_model=dict)
+@query_budget(1)
+async def unblock_user(
+    user_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user_id)
+):
+    """Lift a block or mute."""
+    await block_service.unblock(db, current_user_id, user_id)
+    return {"success": True, "data": None, "message": "User unblocked"}
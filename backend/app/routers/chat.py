@@ -0,0 +1,120 @@
+import asyncio
+import time
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.config import settings
+from backend.app.database import AsyncSessionLocal, get_db
+from backend.app.dependencies import get_current_user_id
+from backend.app.redis_client import get_redis
+from backend.app.schemas.hangout import ChatHistoryResponse, ChatMessageRequest, ChatMessageResponse
+from backend.app.services.chat_hub import CLOSE_NOT_ALLOWED, chat_hub, chat_service
+from backend.app.utils.jwt import decode_access_token
+from backend.app.utils.query_budget import query_budget
+
+chat_router = APIRouter(prefix="/hangout", tags=["Chat"])
+
+
+async def _check_membership(post_id: UUID, user_id: str) -> bool:
+    # Short-lived session: the socket must not hold a pooled connection while open
+    async with AsyncSessionLocal() as db:
+        return await chat_service.is_participant(db, post_id, user_id)
+
+
+@chat_router.get("/posts/{post_id}/chat", response_model=dict)
+@query_budget(3)
+async def get_chat_history(
+    post_id: UUID,
+    before: str | None = None,
+    limit: int = Query(50, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user_id)
+):
+    if not await chat_service.is_participant(db, post_id, current_user_id):
+        raise HTTPException(status_code=403, detail="Only participants can read this chat")
+    messages, next_cursor = await chat_service.get_history(db, post_id, before, limit)
+    page = ChatHistoryResponse(
+        messages=[ChatMessageResponse.model_validate(m) for m in messages],
+        next_cursor=next_cursor,
+    )
+    return {"success": True, "data": page, "message": "Chat history retrieved"}
+
+
+@chat_router.websocket("/posts/{post_id}/chat/ws")
+async def chat_socket(websocket: WebSocket, post_id: UUID, token: str = Query(...)):
+    """
+    Live chat for one hangout. Browsers cannot set headers on a WebSocket, so the
+    access token comes as ?token=. On connect the socket receives recent messages,
+    then everything new; clients send ``{"body": "..."}``.
+
+    The socket closes with 1008 when the token expires, when a membership re-check
+    (every CHAT_MEMBERSHIP_TTL_SECONDS) fails, or at once when the user leaves.
+    """
+    payload = decode_access_token(token)
+    user_id = payload.get("sub") if payload else None
+    if not user_id or not await _check_membership(post_id, user_id):
+        await websocket.close(code=CLOSE_NOT_ALLOWED)
+        return
+    token_until = time.monotonic() + (payload["exp"] - time.time())
+    member_until = time.monotonic() + settings.CHAT_MEMBERSHIP_TTL_SECONDS
+
+    async def still_allowed() -> bool:
+        # Membership is cached for the connection and re-checked only after the TTL
+        nonlocal member_until
+        now = time.monotonic()
+        if now >= token_until:
+            return False
+        if now >= member_until:
+            if not await _check_membership(post_id, user_id):
+                return False
+            member_until = time.monotonic() + settings.CHAT_MEMBERSHIP_TTL_SECONDS
+        return True
+
+    redis = get_redis()
+    room = str(post_id)
+    await websocket.accept()
+    try:
+        queue, backlog = await chat_hub.join(redis, room, user_id)
+    except RuntimeError:
+        await websocket.close(code=1001)
+        return
+
+    async def forward() -> None:
+        for message in backlog:
+            await websocket.send_text(message)
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), min(member_until, token_until) - time.monotonic())
+            except asyncio.TimeoutError:
+                if await still_allowed():
+                    continue
+                item = CLOSE_NOT_ALLOWED
+            if isinstance(item, int):
+                await websocket.close(code=item)
+                return
+            await websocket.send_text(item)
+
+    writer = asyncio.create_task(forward())
+    try:
+        while True:
+            try:
+                data = ChatMessageRequest.model_validate(await websocket.receive_json())
+            except (ValidationError, ValueError):
+                await websocket.send_json({"error": "Expected {\"body\": \"...\"} with 1-2000 characters"})
+                continue
+
+            if not await still_allowed():
+                await websocket.close(code=CLOSE_NOT_ALLOWED)
+                return
+
+            await chat_service.publish(redis, post_id, user_id, data.body)
+    except (WebSocketDisconnect, RuntimeError):
+        # RuntimeError: the writer closed the socket (shutdown, slow client, kicked)
+        pass
+    finally:
+        chat_hub.leave(room, queue)
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Query
+
+from backend.app.schemas.city import CityResponse
+from backend.app.services.city_catalog import city_catalog
+from backend.app.utils.query_budget import query_budget
+
+city_router = APIRouter(prefix="/cities", tags=["Cities"])
+
+
+@city_router.get("/autocomplete", response_model=dict)
+@query_budget(0)
+async def autocomplete_cities(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+):
+    """City suggestions for a typed prefix, served from the in-memory catalog (no DB, no auth)."""
+    cities = [CityResponse.model_validate(c) for c in city_catalog.complete(q, limit)]
+    return {"success": True, "data": cities, "message": "Cities retrieved"}
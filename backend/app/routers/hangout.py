@@ -1,39 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
-from typing import Optional
+from datetime import datetime
+from typing import List, Literal, Optional
 
+from backend.app.config import settings
 from backend.app.database import get_db
-from backend.app.dependencies import get_current_user
+from backend.app.dependencies import get_current_user, get_current_user_id
+from backend.app.middleware.idempotency import idempotent
 from backend.app.models.user import User
 from backend.app.models.hangout import HangoutPost, HangoutRequest
+from backend.app.redis_client import get_redis
 from backend.app.schemas.hangout import (
     CreatePostRequest, UpdatePostRequest, SendRequestRequest,
     RespondRequestRequest, PostResponse, PostDetailResponse,
-    RequestResponse
+    RequestResponse, ScheduleItemResponse, SyncPostResponse, SyncRequestResponse,
+    SyncParticipantResponse, TombstoneResponse, SyncResponse
 )
+from backend.app.services.block_service import block_service
+from backend.app.services.city_catalog import city_catalog
+from backend.app.services.facet_service import FacetService
+from backend.app.services.feed_index import feed_index
 from backend.app.services.hangout_service import HangoutService
+from backend.app.services.post_cache import CachedPost, post_cache
+from backend.app.services.sync_service import SyncService
+from backend.app.services.trending_service import TrendingService
+from backend.app.utils.query_budget import query_budget
 
 hangout_router = APIRouter(prefix="/hangout", tags=["HangOut"])
 hangout_service = HangoutService()
+trending_service = TrendingService()
+facet_service = FacetService()
+sync_service = SyncService()
+
+def bump_trending(background_tasks: BackgroundTasks, redis: Redis, post: HangoutPost | CachedPost, kind: str) -> None:
+    """Count interest in an open post after the response is sent."""
+    if post.status == 'open':
+        background_tasks.add_task(trending_service.bump, redis, post.city, post.id, post.ends_at, kind)
 
 @hangout_router.get("/posts", response_model=dict)
+@query_budget(3)
 async def get_feed(
     city: str,
-    activity_type: Optional[str] = None,
+    activity_type: Optional[List[str]] = Query(None),
+    starts_after: Optional[datetime] = None,
+    starts_before: Optional[datetime] = None,
+    has_free_seats: bool = False,
+    sort: Literal["soonest", "trending"] = "soonest",
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    redis: Redis = Depends(get_redis),
+    current_user_id: UUID = Depends(get_current_user_id)
 ):
-    filters = {"activity_type": activity_type} if activity_type else {}
-    posts = await hangout_service.get_feed(db, city, filters, page, limit)
+    # activity_type may repeat: ?activity_type=hiking&activity_type=coffee matches either
+    filters = {
+        "activity_types": activity_type,
+        "starts_after": starts_after,
+        "starts_before": starts_before,
+        "has_free_seats": has_free_seats,
+    }
+    # Blocked and muted creators are skipped before paging, on every path
+    blocks = await block_service.get(db, current_user_id)
+    hidden = blocks.hides if blocks else None
+    entry = city_catalog.resolve(city)
+    if sort == "soonest" and settings.FEED_INDEX_ENABLED and entry is not None:
+        bodies = await feed_index.query(db, redis, entry.id, filters, page, limit, hidden)
+        if bodies is not None:
+            # Already-serialized PostResponse JSON, spliced into the envelope
+            return Response(
+                content=b'{"success":true,"data":[' + b",".join(bodies)
+                + b'],"message":"Feed retrieved successfully"}',
+                media_type="application/json",
+            )
+    if sort == "trending":
+        # Posts are bumped under their canonical city name
+        city_name, _ = city_catalog.canonical(city)
+        posts = await hangout_service.get_trending_feed(db, redis, city_name, filters, page, limit, hidden)
+    else:
+        posts = await hangout_service.get_feed(db, city, filters, page, limit, hidden)
     # Convert ORM models to Pydantic schemas for the response
     post_responses = [PostResponse.model_validate(p) for p in posts]
     return {"success": True, "data": post_responses, "message": "Feed retrieved successfully"}
 
+@hangout_router.get("/facets", response_model=dict)
+@query_budget(1)
+async def get_facets(
+    city: str,
+    redis: Redis = Depends(get_redis),
+    current_user_id: UUID = Depends(get_current_user_id)
+):
+    """Open-post counts per activity type for a city's feed filters, read from Redis."""
+    city_name, _ = city_catalog.canonical(city)
+    counts = await facet_service.counts(redis, city_name)
+    data = {"city": city_name, "counts": counts, "total": sum(counts.values())}
+    return {"success": True, "data": data, "message": "Facets retrieved"}
+
 @hangout_router.post("/posts", response_model=dict, status_code=201)
+@query_budget(5)
+@idempotent
 async def create_post(
     data: CreatePostRequest,
     db: AsyncSession = Depends(get_db),
@@ -43,38 +110,42 @@ async def create_post(
     return {"success": True, "data": PostResponse.model_validate(post), "message": "Post created successfully"}
 
 @hangout_router.get("/posts/{post_id}", response_model=dict)
+@query_budget(3)
 async def get_post_detail(
     post_id: UUID,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    redis: Redis = Depends(get_redis),
+    current_user_id: UUID = Depends(get_current_user_id)
 ):
-    post = await hangout_service.get_post_by_id(db, post_id)
-    if not post:
+    async def load() -> bytes | None:
+        post = await hangout_service.get_post_by_id(db, post_id)
+        return PostDetailResponse.model_validate(post).model_dump_json().encode() if post else None
+
+    cached = await post_cache.get(post_id, load)
+    # Blocked either way, the post doesn't exist for them; a mute only hides it from the feed
+    if cached is None or (await block_service.get(db, current_user_id)).blocks(cached.creator_id):
         raise HTTPException(status_code=404, detail="Post not found")
-    return {"success": True, "data": PostDetailResponse.model_validate(post), "message": "Post retrieved"}
+    bump_trending(background_tasks, redis, cached, "view")
+    # The detail is already JSON; wrap it in the usual envelope without re-encoding
+    return Response(
+        content=b'{"success":true,"data":' + cached.body + b',"message":"Post retrieved"}',
+        media_type="application/json",
+    )
 
 @hangout_router.patch("/posts/{post_id}", response_model=dict)
+@query_budget(13)
 async def update_post(
     post_id: UUID,
     data: UpdatePostRequest,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    post = await hangout_service.get_post_by_id(db, post_id)
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
-    if post.creator_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to edit this post")
-    
-    update_data = data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(post, key, value)
-        
-    await db.commit()
-    await db.refresh(post)
+    post = await hangout_service.update_post(db, current_user, post_id, data)
     return {"success": True, "data": PostResponse.model_validate(post), "message": "Post updated"}
 
 @hangout_router.delete("/posts/{post_id}", response_model=dict)
+@query_budget(5)
 async def cancel_post(
     post_id: UUID,
     db: AsyncSession = Depends(get_db),
@@ -84,25 +155,55 @@ async def cancel_post(
     return {"success": True, "data": None, "message": "Post cancelled successfully"}
 
 @hangout_router.post("/posts/{post_id}/request", response_model=dict, status_code=201)
+@query_budget(10)
+@idempotent
 async def send_request(
     post_id: UUID,
     data: SendRequestRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(get_current_user)
 ):
     req = await hangout_service.send_request(db, current_user, post_id, data.message)
-    return {"success": True, "data": RequestResponse.model_validate(req), "message": "Request sent"}
+    bump_trending(background_tasks, redis, req.post, "request")
+    message = "Added to the waitlist" if req.status == 'waitlisted' else "Request sent"
+    return {"success": True, "data": RequestResponse.model_validate(req), "message": message}
+
+@hangout_router.post("/posts/{post_id}/leave", response_model=dict)
+@query_budget(12)
+async def leave_post(
+    post_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Give up your seat; the oldest waitlisted requester is moved into it."""
+    await hangout_service.leave(db, current_user, post_id)
+    return {"success": True, "data": None, "message": "You left the hangout"}
+
+@hangout_router.get("/posts/{post_id}/waitlist", response_model=dict)
+@query_budget(3)
+async def get_waitlist(
+    post_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Waitlisted requests on your post, in the order they will be let in."""
+    requests = await hangout_service.get_waitlist(db, current_user, post_id)
+    req_responses = [RequestResponse.model_validate(r) for r in requests]
+    return {"success": True, "data": req_responses, "message": "Waitlist retrieved"}
 
 @hangout_router.get("/posts/{post_id}/requests", response_model=dict)
+@query_budget(3)
 async def get_post_requests(
     post_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: UUID = Depends(get_current_user_id)
 ):
     post = await hangout_service.get_post_by_id(db, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    if post.creator_id != current_user.id:
+    if post.creator_id != current_user_id:
         raise HTTPException(status_code=403, detail="Not authorized")
         
     result = await db.execute(select(HangoutRequest).where(HangoutRequest.post_id == post_id))
@@ -111,31 +212,32 @@ async def get_post_requests(
     return {"success": True, "data": req_responses, "message": "Requests retrieved"}
 
 @hangout_router.patch("/requests/{request_id}", response_model=dict)
+@query_budget(11)
 async def respond_to_request(
     request_id: UUID,
     data: RespondRequestRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user: User = Depends(get_current_user)
 ):
     req = await hangout_service.respond_to_request(db, current_user, request_id, data.action)
+    if data.action == 'accept':
+        bump_trending(background_tasks, redis, req.post, "accept")
     return {"success": True, "data": RequestResponse.model_validate(req), "message": f"Request {data.action}ed"}
 
 @hangout_router.delete("/requests/{request_id}", response_model=dict)
+@query_budget(13)
 async def cancel_request(
     request_id: UUID,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(HangoutRequest).where(HangoutRequest.id == request_id))
-    req = result.scalars().first()
-    if not req or req.requester_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized or not found")
-        
-    req.status = 'cancelled'
-    await db.commit()
+    await hangout_service.cancel_request(db, current_user, request_id)
     return {"success": True, "data": None, "message": "Request cancelled"}
 
 @hangout_router.get("/my-posts", response_model=dict)
+@query_budget(2)
 async def get_my_posts(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -144,7 +246,44 @@ async def get_my_posts(
     post_responses = [PostResponse.model_validate(p) for p in posts]
     return {"success": True, "data": post_responses, "message": "My posts retrieved"}
 
+@hangout_router.get("/my-schedule", response_model=dict)
+@query_budget(2)
+async def get_my_schedule(
+    limit: int = Query(50, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    schedule = await hangout_service.get_schedule(db, current_user, limit)
+    items = [
+        ScheduleItemResponse(**PostResponse.model_validate(post).model_dump(), role=role)
+        for post, role in schedule
+    ]
+    return {"success": True, "data": items, "message": "Schedule retrieved"}
+
+@hangout_router.get("/sync", response_model=dict)
+@query_budget(6)
+async def sync_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous page or sync; omit for a full sync"),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user_id)
+):
+    page = await sync_service.changes(db, current_user_id, since, limit)
+    data = SyncResponse(
+        posts=[SyncPostResponse.model_validate(p) for p in page.posts],
+        requests=[SyncRequestResponse.model_validate(r) for r in page.requests],
+        participations=[SyncParticipantResponse.model_validate(p) for p in page.participations],
+        deleted=[
+            TombstoneResponse(entity=t.entity, id=t.entity_id, post_id=t.post_id, deleted_at=t.deleted_at)
+            for t in page.deleted
+        ],
+        next_token=page.next_token,
+        has_more=page.has_more,
+    )
+    return {"success": True, "data": data, "message": "Changes retrieved"}
+
 @hangout_router.get("/my-requests", response_model=dict)
+@query_budget(2)
 async def get_my_requests(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
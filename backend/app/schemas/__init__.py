@@ -1,4 +1,8 @@
 from backend.app.schemas.auth import (
+    AvatarCompleteRequest,
+    AvatarUploadRequest,
+    AvatarUploadResponse,
+    EmailVerificationRequest,
     ForgotPasswordRequest,
     LoginRequest,
     MessageResponse,
@@ -16,13 +20,19 @@ __all__ = [
     "RefreshTokenRequest",
     "ForgotPasswordRequest",
     "PasswordResetRequest",
+    "EmailVerificationRequest",
     "UserResponse",
     "TokenResponse",
     "MessageResponse",
     "UpdateProfileRequest",
+    "AvatarUploadRequest",
+    "AvatarUploadResponse",
+    "AvatarCompleteRequest",
 ]
 from backend.app.schemas.hangout import (
     CreatePostRequest, UpdatePostRequest, SendRequestRequest, RespondRequestRequest,
     CreateReviewRequest, PostResponse, RequestResponse, ParticipantResponse,
-    ReviewResponse, PostDetailResponse
-)
\ No newline at end of file
+    ReviewResponse, PostDetailResponse, ScheduleItemResponse, ChatMessageRequest,
+    ChatMessageResponse, ChatHistoryResponse
+)
+from backend.app.schemas.city import CityResponse
@@ -4,6 +4,7 @@ VibeLink Auth Schemas — Pydantic v2 request/response models for the auth syste
 
 import re
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
@@ -48,6 +49,11 @@ class PasswordResetRequest(BaseModel):
     new_password: str = Field(..., min_length=8)
 
 
+class EmailVerificationRequest(BaseModel):
+    """Schema for confirming an email address using a token from email."""
+    token: str
+
+
 # ─── RESPONSE SCHEMAS ─────────────────────────────────────────────────────────
 
 class UserResponse(BaseModel):
@@ -61,6 +67,7 @@ class UserResponse(BaseModel):
     bio: str | None
     avatar_url: str | None
     city: str | None
+    city_id: int | None = None
     interests: list[str] | None
     is_verified: bool
     created_at: datetime
@@ -89,4 +96,24 @@ class UpdateProfileRequest(BaseModel):
     city: str | None = Field(default=None, max_length=100)
     latitude: float | None = Field(default=None, ge=-90, le=90)
     longitude: float | None = Field(default=None, ge=-180, le=180)
-    interests: list[str] | None = Field(default=None, max_length=10)
\ No newline at end of file
+    interests: list[str] | None = Field(default=None, max_length=10)
+
+
+# ─── AVATAR UPLOAD SCHEMAS ────────────────────────────────────────────────────
+
+class AvatarUploadRequest(BaseModel):
+    """Schema for requesting a presigned avatar upload."""
+    content_type: Literal["image/jpeg", "image/png", "image/webp"]
+
+
+class AvatarUploadResponse(BaseModel):
+    """Presigned POST target: send `fields` plus the file as multipart form data to `url`."""
+    key: str
+    url: str
+    fields: dict[str, str]
+    expires_in: int
+
+
+class AvatarCompleteRequest(BaseModel):
+    """Schema for signalling that the direct upload finished."""
+    key: str
\ No newline at end of file
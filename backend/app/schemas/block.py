@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class BlockUserRequest(BaseModel):
+    """Block (both ways, no requests either way) or only mute (hide their posts from me)."""
+    kind: Literal['block', 'mute'] = 'block'
+
+
+class BlockResponse(BaseModel):
+    """A blocked or muted user, with enough of their profile to list them."""
+    model_config = ConfigDict(from_attributes=True)
+
+    user_id: UUID
+    username: str
+    full_name: str | None
+    avatar_url: str | None
+    kind: str
+    created_at: datetime
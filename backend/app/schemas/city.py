@@ -0,0 +1,9 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class CityResponse(BaseModel):
+    """A catalog city, as suggested by autocomplete."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
@@ -18,6 +18,8 @@ class CreatePostRequest(BaseModel):
     venue_name: Optional[str] = Field(None, max_length=200)
     venue_address: Optional[str] = None
     scheduled_at: datetime
+    # Defaults to DEFAULT_HANGOUT_DURATION_MINUTES
+    duration_minutes: Optional[int] = Field(None, ge=15, le=24 * 60)
     max_participants: int = Field(..., ge=2, le=50)
     is_public: bool = True
     # New field for dating
@@ -32,6 +34,7 @@ class UpdatePostRequest(BaseModel):
     venue_name: Optional[str] = Field(None, max_length=200)
     venue_address: Optional[str] = None
     scheduled_at: Optional[datetime] = None
+    duration_minutes: Optional[int] = Field(None, ge=15, le=24 * 60)
     max_participants: Optional[int] = Field(None, ge=2, le=50)
     is_public: Optional[bool] = None
     dating_preferences: Optional[str] = None
@@ -44,6 +47,10 @@ class RespondRequestRequest(BaseModel):
     """Schema for the host to accept or decline a request."""
     action: Literal['accept', 'decline']
 
+class ChatMessageRequest(BaseModel):
+    """Schema for a chat message sent over the hangout WebSocket."""
+    body: str = Field(..., min_length=1, max_length=2000)
+
 class CreateReviewRequest(BaseModel):
     """Schema for reviewing another user after a hangout."""
     rating: int = Field(..., ge=1, le=5)
@@ -60,9 +67,11 @@ class PostResponse(BaseModel):
     description: Optional[str]
     activity_type: str
     city: str
+    city_id: Optional[int] = None
     venue_name: Optional[str]
     venue_address: Optional[str]
     scheduled_at: datetime
+    ends_at: datetime
     max_participants: int
     status: str
     is_public: bool
@@ -107,7 +116,54 @@ class ReviewResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class ScheduleItemResponse(PostResponse):
+    """An upcoming hangout on the user's schedule, with their role in it."""
+    role: str
+
+class SyncPostResponse(PostResponse):
+    """A post as returned by delta sync, with when it last changed."""
+    updated_at: datetime
+
+class SyncRequestResponse(RequestResponse):
+    """A join request as returned by delta sync."""
+    updated_at: datetime
+
+class SyncParticipantResponse(ParticipantResponse):
+    """A participation as returned by delta sync."""
+    updated_at: datetime
+
+class TombstoneResponse(BaseModel):
+    """A post, request or participation deleted since the last sync."""
+    entity: Literal['post', 'request', 'participation']
+    id: UUID
+    post_id: UUID
+    deleted_at: datetime
+
+class SyncResponse(BaseModel):
+    """One page of changes; keep calling with next_token until has_more is false."""
+    posts: List[SyncPostResponse]
+    requests: List[SyncRequestResponse]
+    participations: List[SyncParticipantResponse]
+    deleted: List[TombstoneResponse]
+    next_token: str
+    has_more: bool
+
 class PostDetailResponse(PostResponse):
     """Detailed post response that includes the creator and participant list."""
     creator: UserResponse
-    participants: List[ParticipantResponse]
\ No newline at end of file
+    participants: List[ParticipantResponse]
+
+class ChatMessageResponse(BaseModel):
+    """Response schema for a stored hangout chat message."""
+    id: UUID
+    post_id: UUID
+    sender_id: UUID
+    body: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ChatHistoryResponse(BaseModel):
+    """One page of chat history, newest first; pass next_cursor as ?before= for older messages."""
+    messages: List[ChatMessageResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,333 @@
+"""
+Production launcher — a pre-forking supervisor around uvicorn workers.
+
+    python -m backend.app.serve --host 0.0.0.0 --port 8000 [--workers N]
+
+The supervisor imports the app and binds the socket once, freezes the GC, then
+forks the workers. Every imported module is shared copy-on-write instead of
+being loaded N times. Nothing in the supervisor opens a DB or Redis connection;
+each worker's lifespan builds its own pools after the fork. Workers run uvloop
+and httptools when installed (both ship with uvicorn[standard]).
+
+Worker count: SERVE_WORKERS, or one per usable CPU (affinity and cgroup quota).
+bcrypt runs on each worker's event loop, so more workers than CPUs only queue
+hashes behind one another. The count is then capped so that every worker's full
+DB pool (DB_POOL_SIZE + DB_MAX_OVERFLOW) fits in SERVE_DB_CONNECTION_BUDGET.
+
+Signals to the supervisor:
+
+- TERM / INT: graceful stop. Workers stop accepting, drain in-flight requests
+  (SHUTDOWN_DRAIN_TIMEOUT), and are killed if still running after that.
+- HUP: graceful reload. The new code is checked for import errors, then the
+  supervisor re-executes itself on the same socket. It forks fresh workers and
+  stops the old ones once the new ones are serving, so no connection is refused.
+
+A worker exits after SERVE_MAX_REQUESTS plus a random jitter of up to
+SERVE_MAX_REQUESTS_JITTER requests, and is replaced. This bounds slow memory
+growth without all workers restarting at once.
+
+Prometheus metrics cover every worker. Before importing the app the supervisor
+sets PROMETHEUS_MULTIPROC_DIR (if unset, a per-port directory under the system
+temp dir) and empties it, except on a reload, whose workers keep counting into
+the same files. Each worker writes its samples there, /metrics on any worker
+reports them all, and a reaped worker's live gauges are dropped.
+"""
+
+import argparse
+import gc
+import logging
+import math
+import os
+import random
+import select
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.util import find_spec
+
+import uvicorn
+
+from backend.app.config import settings
+
+logger = logging.getLogger("backend.app.serve")
+
+BOOT_FAILURE = 3
+INHERIT_FD_ENV = "SERVE_INHERIT_FD"
+METRICS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+OLD_WORKERS_ENV = "SERVE_OLD_WORKERS"
+HANDLED_SIGNALS = {signal.SIGTERM, signal.SIGINT, signal.SIGHUP}
+
+
+def usable_cpus() -> int:
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def worker_count(requested: int = 0) -> int:
+    workers = requested or settings.SERVE_WORKERS or usable_cpus()
+    cap = max(1, settings.SERVE_DB_CONNECTION_BUDGET // (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW))
+    if workers > cap:
+        logger.warning("Capping %d workers at %d to fit %d DB connections",
+                       workers, cap, settings.SERVE_DB_CONNECTION_BUDGET)
+        workers = cap
+    return workers
+
+
+class WorkerServer(uvicorn.Server):
+    """A uvicorn server that tells the supervisor once it is accepting requests."""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        if self.started:
+            os.write(self.ready_fd, b"1")
+
+
+class Supervisor:
+
+    def __init__(self, sock: socket.socket, args: argparse.Namespace):
+        self.app = None
+        self.sock = sock
+        self.args = args
+        self.workers: set[int] = set()
+        # Workers of the generation before a reload: still our children, never replaced
+        self.retiring = {int(pid) for pid in os.environ.pop(OLD_WORKERS_ENV, "").split(",") if pid}
+        self.stopping = False
+        self.reloading = False
+        self.exit_code = 0
+        self.ready_r, self.ready_w = os.pipe()
+        # Installed before the app is imported, so a signal during the import is not fatal
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_reload)
+        # A reload execs with these blocked; any that arrived meanwhile are delivered now
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, HANDLED_SIGNALS)
+
+    # ─── WORKERS ──────────────────────────────────────────────────────────────
+
+    def spawn(self) -> int:
+        max_requests = 0
+        if settings.SERVE_MAX_REQUESTS:
+            max_requests = settings.SERVE_MAX_REQUESTS + random.randint(0, settings.SERVE_MAX_REQUESTS_JITTER)
+        pid = os.fork()
+        if pid:
+            self.workers.add(pid)
+            return pid
+
+        code, server = BOOT_FAILURE, None
+        try:
+            # uvicorn handles TERM/INT while serving and re-raises them on exit; ignored
+            # here so the worker still reaches os._exit with its own status
+            for sig in HANDLED_SIGNALS:
+                signal.signal(sig, signal.SIG_IGN)
+            os.close(self.ready_r)
+            config = uvicorn.Config(
+                self.app,
+                loop="uvloop" if find_spec("uvloop") else "asyncio",
+                http="httptools" if find_spec("httptools") else "h11",
+                lifespan="on",
+                limit_max_requests=max_requests or None,
+                timeout_graceful_shutdown=int(settings.SHUTDOWN_DRAIN_TIMEOUT),
+                proxy_headers=True,
+                forwarded_allow_ips=self.args.forwarded_allow_ips,
+                access_log=self.args.access_log,
+                log_level=self.args.log_level,
+            )
+            server = WorkerServer(config, self.ready_w)
+            server.run(sockets=[self.sock])
+            code = 0 if server.started else BOOT_FAILURE
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            # Only a worker that never served is a boot failure; after that it is replaced
+            code = 1 if server is not None and server.started else BOOT_FAILURE
+        finally:
+            os._exit(code)
+
+    def wait_ready(self, count: int, timeout: float) -> int:
+        """Wait until ``count`` workers report they are serving; returns how many did."""
+        ready, deadline = 0, time.monotonic() + timeout
+        while ready < count and (remaining := deadline - time.monotonic()) > 0:
+            readable, _, _ = select.select([self.ready_r], [], [], min(remaining, 0.5))
+            if readable:
+                ready += len(os.read(self.ready_r, count - ready))
+            self.reap()
+            if self.stopping:
+                break
+        return ready
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.retiring.discard(pid)
+            mark_process_dead(pid)
+            if pid not in self.workers:
+                continue
+            self.workers.discard(pid)
+            code = os.waitstatus_to_exitcode(status)
+            if self.stopping:
+                continue
+            if code == BOOT_FAILURE:
+                logger.error("Worker %d failed to boot; stopping", pid)
+                self.stopping = True
+                self.exit_code = BOOT_FAILURE
+                continue
+            if code:
+                logger.warning("Worker %d exited with %d; replacing it", pid, code)
+            else:
+                logger.info("Worker %d recycled", pid)
+            self.spawn()
+
+    # ─── SUPERVISOR ───────────────────────────────────────────────────────────
+
+    def run(self, app, workers: int) -> int:
+        self.app = app
+        # Objects imported so far never change: keep the collector off their pages
+        gc.freeze()
+        if not self.stopping:
+            for _ in range(workers):
+                self.spawn()
+            ready = self.wait_ready(workers, settings.STARTUP_TIMEOUT + 5)
+            if not self.stopping:
+                logger.info("Serving on %s with %d/%d workers ready", self.sock.getsockname(), ready, workers)
+        self.stop_old_workers()
+
+        while not self.stopping:
+            if self.reloading:
+                self.reloading = False
+                self.reload()
+            time.sleep(0.2)
+            self.reap()
+        return self.stop()
+
+    def stop_old_workers(self) -> None:
+        """After a reload, stop the previous generation's workers once the new one serves."""
+        if self.retiring:
+            logger.info("Stopping %d workers from before the reload", len(self.retiring))
+        for pid in list(self.retiring):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.retiring.discard(pid)
+
+    def reload(self) -> None:
+        check = subprocess.run([sys.executable, "-c", "import backend.app.main"], capture_output=True)
+        if check.returncode:
+            logger.error("Reload aborted; the new code does not import:\n%s", check.stderr.decode())
+            return
+        # The mask survives exec: a stop requested from here on waits for the new handlers
+        signal.pthread_sigmask(signal.SIG_BLOCK, HANDLED_SIGNALS)
+        if self.stopping:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, HANDLED_SIGNALS)
+            return
+        logger.info("Reloading: re-executing the supervisor on the same socket")
+        os.set_inheritable(self.sock.fileno(), True)
+        env = dict(os.environ)
+        env[INHERIT_FD_ENV] = str(self.sock.fileno())
+        env[OLD_WORKERS_ENV] = ",".join(str(pid) for pid in self.workers | self.retiring)
+        os.execve(sys.executable, [sys.executable, "-m", "backend.app.serve", *sys.argv[1:]], env)
+
+    def stop(self) -> int:
+        children = self.workers | self.retiring
+        logger.info("Stopping %d workers", len(children))
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        # uvicorn waits for open connections, then the lifespan drains; each gets the timeout
+        deadline = time.monotonic() + 2 * settings.SHUTDOWN_DRAIN_TIMEOUT + 5
+        while (self.workers or self.retiring) and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in self.workers | self.retiring:
+            logger.warning("Worker %d did not drain in time; killing it", pid)
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        return self.exit_code
+
+    def _on_stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _on_reload(self, signum, frame) -> None:
+        self.reloading = True
+
+
+def prepare_metrics_dir(port: int, reloading: bool) -> str:
+    """Point prometheus_client at the directory workers share; must run before it is imported."""
+    path = os.environ.setdefault(METRICS_DIR_ENV, os.path.join(tempfile.gettempdir(), f"connectem-metrics-{port}"))
+    os.makedirs(path, exist_ok=True)
+    if not reloading:
+        # Samples left by a previous run would be summed into this one
+        for name in os.listdir(path):
+            if name.endswith(".db"):
+                os.remove(os.path.join(path, name))
+    return path
+
+
+def mark_process_dead(pid: int) -> None:
+    # Imported late: prometheus_client picks its value store when first imported
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(pid)
+
+
+def bind(host: str, port: int, backlog: int) -> socket.socket:
+    inherited = os.environ.pop(INHERIT_FD_ENV, None)
+    if inherited is not None:
+        return socket.socket(fileno=int(inherited))
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the API with pre-forked uvicorn workers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=0, help="default: SERVE_WORKERS, else one per CPU")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--forwarded-allow-ips", default="127.0.0.1")
+    parser.add_argument("--access-log", action="store_true")
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args()
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    prepare_metrics_dir(args.port, reloading=INHERIT_FD_ENV in os.environ)
+    sock = bind(args.host, args.port, args.backlog)
+    workers = worker_count(args.workers)
+    supervisor = Supervisor(sock, args)
+
+    # Preload: import everything before forking so workers share it
+    from backend.app.main import app
+
+    return supervisor.run(app, workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,30 @@
 """
-AuthService — all business logic for registration, login, token refresh, and logout.
+AuthService — all business logic for registration, login, token refresh, logout,
+password reset, and email verification.
 """
 
-from datetime import datetime, timezone
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.app.models.user import RefreshToken, User
+from backend.app import queries
+from backend.app.models.user import EmailToken, RefreshToken, User
 from backend.app.schemas.auth import (
     LoginRequest,
+    PasswordResetRequest,
     RegisterRequest,
     TokenResponse,
 )
 from backend.app.utils.jwt import (
     create_access_token,
+    create_email_token,
     create_refresh_token,
+    hash_email_token,
     hash_refresh_token,
 )
 from backend.app.utils.security import hash_password, verify_password
@@ -97,9 +105,7 @@ class AuthService:
         """Issue a new access token from a valid refresh token."""
 
         token_hash = hash_refresh_token(refresh_token)
-        result = await db.execute(
-            select(RefreshToken).where(RefreshToken.token_hash == token_hash)
-        )
+        result = await db.execute(queries.refresh_token_by_hash(token_hash))
         record = result.scalars().first()
 
         if not record:
@@ -126,11 +132,97 @@ class AuthService:
         """Revoke a refresh token, invalidating that session."""
 
         token_hash = hash_refresh_token(refresh_token)
-        result = await db.execute(
-            select(RefreshToken).where(RefreshToken.token_hash == token_hash)
-        )
+        result = await db.execute(queries.refresh_token_by_hash(token_hash))
         record = result.scalars().first()
 
         if record:
             record.is_revoked = True
-            await db.commit()
\ No newline at end of file
+            await db.commit()
+
+    # ─── EMAIL TOKENS ─────────────────────────────────────────────────────────
+
+    async def issue_email_token(self, db: AsyncSession, user_id: uuid.UUID, purpose: str) -> str:
+        """Store the hash of a new one-time token (a single INSERT) and return the raw token."""
+        if purpose == "password_reset":
+            lifetime = timedelta(minutes=settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES)
+        else:
+            lifetime = timedelta(hours=settings.EMAIL_VERIFICATION_TOKEN_EXPIRE_HOURS)
+        raw_token, expires_at = create_email_token(lifetime)
+
+        db.add(EmailToken(
+            user_id=user_id,
+            token_hash=hash_email_token(raw_token),
+            purpose=purpose,
+            expires_at=expires_at,
+        ))
+        await db.commit()
+        return raw_token
+
+    async def _consume_email_token(self, db: AsyncSession, raw_token: str, purpose: str) -> uuid.UUID | None:
+        """Atomically mark a valid token used; returns its user id, or None if invalid/expired/used."""
+        result = await db.execute(
+            update(EmailToken)
+            .where(
+                EmailToken.token_hash == hash_email_token(raw_token),
+                EmailToken.purpose == purpose,
+                EmailToken.used_at.is_(None),
+                EmailToken.expires_at > func.now(),
+            )
+            .values(used_at=func.now())
+            .returning(EmailToken.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none()
+
+    async def request_password_reset(self, db: AsyncSession, email: str) -> tuple[str, str] | None:
+        """
+        Issue a reset token if the account exists. Returns (email, raw_token) or None.
+        Always takes at least FORGOT_PASSWORD_MIN_SECONDS so response time can't reveal accounts.
+        """
+        started = time.perf_counter()
+
+        result = await db.execute(select(User.id, User.email, User.is_active).where(User.email == email))
+        row = result.first()
+        issued = None
+        if row and row.is_active:
+            issued = (row.email, await self.issue_email_token(db, row.id, "password_reset"))
+        else:
+            # End the read so the padding below doesn't hold a pooled connection idle in transaction
+            await db.rollback()
+
+        remaining = settings.FORGOT_PASSWORD_MIN_SECONDS - (time.perf_counter() - started)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return issued
+
+    async def reset_password(self, db: AsyncSession, data: PasswordResetRequest) -> None:
+        """Set a new password from a reset token and revoke every existing session."""
+
+        # Hash before validating the token so valid and invalid tokens cost the same.
+        new_hash = hash_password(data.new_password)
+
+        user_id = await self._consume_email_token(db, data.token, "password_reset")
+        if user_id is None:
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Invalid or expired reset token")
+
+        await db.execute(update(User).where(User.id == user_id).values(password_hash=new_hash))
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.is_revoked.is_(False))
+            .values(is_revoked=True)
+        )
+        await db.commit()
+
+    async def verify_email(self, db: AsyncSession, raw_token: str) -> None:
+        """Mark the token owner's email as verified."""
+
+        user_id = await self._consume_email_token(db, raw_token, "email_verification")
+        if user_id is None:
+            await db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Invalid or expired verification token")
+
+        await db.execute(update(User).where(User.id == user_id).values(is_verified=True))
+        await db.commit()
\ No newline at end of file
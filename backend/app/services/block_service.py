@@ -0,0 +1,241 @@
+"""
+Blocks and mutes — which creators a user must not see, as a compact set per user.
+
+Filtering in SQL (``creator_id NOT IN (subquery)``) would put another subquery on
+the feed, the hottest query. Instead the feed, post detail and join requests
+fetch as before and check creators against the user's BlockSet afterwards:
+
+- blocked: users I block plus users who block me, since a block works both ways
+  (hidden from each other, no requests either way)
+- muted: users I mute, whose posts are only left out of my feed
+
+Each is a sorted array of 16-byte UUIDs searched by bisection: exact, 16 bytes an
+entry, and the same bytes are stored in Redis. A Bloom filter would be smaller
+still, but it would need this exact check behind it for false positives, and
+BLOCKS_MAX_PER_USER entries are 80 KB at most.
+
+Two tiers, as for post details: a per-worker LRU (BLOCKS_LOCAL_SIZE users, held
+for BLOCKS_LOCAL_TTL_SECONDS) in front of ``blocks:<id>`` in Redis, then one
+Postgres query. Empty sets are cached too; most users have one. A change bumps
+both users' ``blocks:ver:<id>`` and drops their sets. A fill only stores if the
+version it read first is unchanged, so a load racing a change never leaves the
+old set in Redis. Other workers' local copies age out within the local TTL.
+"""
+
+import bisect
+import logging
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable
+from uuid import UUID
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+from sqlalchemy import delete, func, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.config import settings
+from backend.app.models.block import UserBlock
+from backend.app.models.user import User
+from backend.app.redis_client import get_redis
+from backend.app.utils.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAME = "blocks"
+ID_SIZE = 16
+# Stored set: blocked count, then the blocked ids, then the muted ids
+HEADER = struct.Struct(">I")
+
+# KEYS: set key, version key. ARGV: version read before loading, set, TTL in seconds
+FILL_LUA = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+def blocks_key(user_id: UUID | str) -> str:
+    return f"blocks:{user_id}"
+
+
+def version_key(user_id: UUID | str) -> str:
+    return f"blocks:ver:{user_id}"
+
+
+class SortedIds:
+    """UUIDs as one sorted string of 16-byte entries; membership by bisection."""
+    __slots__ = ("data", "_entries")
+
+    def __init__(self, data: bytes = b""):
+        self.data = data
+        self._entries: list[bytes] | None = None
+
+    @classmethod
+    def of(cls, ids: Iterable[UUID]) -> "SortedIds":
+        return cls(b"".join(sorted({user_id.bytes for user_id in ids})))
+
+    def __len__(self) -> int:
+        return len(self.data) // ID_SIZE
+
+    def __contains__(self, user_id: UUID) -> bool:
+        if not self.data:
+            return False
+        if self._entries is None:
+            # Split on first use, so bisect runs in C; a feed page may check hundreds of creators
+            self._entries = [self.data[i:i + ID_SIZE] for i in range(0, len(self.data), ID_SIZE)]
+        key = user_id.bytes
+        i = bisect.bisect_left(self._entries, key)
+        return i < len(self._entries) and self._entries[i] == key
+
+
+@dataclass(frozen=True, slots=True)
+class BlockSet:
+    blocked: SortedIds
+    muted: SortedIds
+
+    def __bool__(self) -> bool:
+        return bool(self.blocked.data or self.muted.data)
+
+    def blocks(self, user_id: UUID) -> bool:
+        """Blocked either way: no seeing each other's posts, no requests."""
+        return user_id in self.blocked
+
+    def hides(self, user_id: UUID) -> bool:
+        """Left out of the feed: blocked either way, or muted by me."""
+        return user_id in self.blocked or user_id in self.muted
+
+    def to_bytes(self) -> bytes:
+        return HEADER.pack(len(self.blocked)) + self.blocked.data + self.muted.data
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "BlockSet":
+        (blocked,) = HEADER.unpack_from(raw)
+        split = HEADER.size + blocked * ID_SIZE
+        return cls(SortedIds(raw[HEADER.size:split]), SortedIds(raw[split:]))
+
+
+class BlockService:
+
+    def __init__(self, maxsize: int = settings.BLOCKS_LOCAL_SIZE):
+        self.maxsize = maxsize
+        self._local: OrderedDict[UUID, tuple[float, BlockSet]] = OrderedDict()
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    async def get(self, db: AsyncSession, user_id: UUID) -> BlockSet:
+        """The user's block set: local copy, then Redis, then one query."""
+        entry = self._local.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._local.move_to_end(user_id)
+            record_cache(f"{CACHE_NAME}_local", True)
+            return entry[1]
+        record_cache(f"{CACHE_NAME}_local", False)
+
+        raw = version = None
+        redis_ok = True
+        try:
+            raw, version = await get_redis().mget(blocks_key(user_id), version_key(user_id))
+        except (RedisError, RuntimeError) as exc:
+            logger.warning("Block set read for %s failed: %s", user_id, exc)
+            redis_ok = False
+        record_cache(f"{CACHE_NAME}_redis", raw is not None)
+
+        if raw is not None:
+            blocks = BlockSet.from_bytes(raw)
+        else:
+            blocks = await self._load(db, user_id)
+            if redis_ok:
+                try:
+                    await get_redis().eval(
+                        FILL_LUA, 2, blocks_key(user_id), version_key(user_id),
+                        version or b"", blocks.to_bytes(), settings.BLOCKS_CACHE_TTL_SECONDS,
+                    )
+                except (RedisError, RuntimeError) as exc:
+                    logger.warning("Block set write for %s failed: %s", user_id, exc)
+        self._store(user_id, blocks)
+        return blocks
+
+    async def _load(self, db: AsyncSession, user_id: UUID) -> BlockSet:
+        mine = select(UserBlock.target_id, UserBlock.kind).where(UserBlock.user_id == user_id)
+        # Being muted changes nothing for the muted user; being blocked does
+        theirs = select(UserBlock.user_id, UserBlock.kind).where(
+            UserBlock.target_id == user_id, UserBlock.kind == 'block'
+        )
+        rows = (await db.execute(union_all(mine, theirs))).all()
+        return BlockSet(
+            SortedIds.of(other for other, kind in rows if kind == 'block'),
+            SortedIds.of(other for other, kind in rows if kind == 'mute'),
+        )
+
+    def _store(self, user_id: UUID, blocks: BlockSet) -> None:
+        self._local[user_id] = (time.monotonic() + settings.BLOCKS_LOCAL_TTL_SECONDS, blocks)
+        self._local.move_to_end(user_id)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    async def invalidate(self, *user_ids: UUID) -> None:
+        """Drop users' sets from both tiers after a committed change. Never raises."""
+        for user_id in user_ids:
+            self._local.pop(user_id, None)
+        try:
+            pipe = get_redis().pipeline(transaction=True)
+            for user_id in user_ids:
+                pipe.incr(version_key(user_id))
+                pipe.expire(version_key(user_id), settings.BLOCKS_CACHE_TTL_SECONDS)
+                pipe.delete(blocks_key(user_id))
+            await pipe.execute()
+        except (RedisError, RuntimeError) as exc:
+            logger.warning("Block set invalidation for %s failed: %s", user_ids, exc)
+
+    async def block(self, db: AsyncSession, user_id: UUID, target_id: UUID, kind: str) -> None:
+        """Block or mute ``target_id``; blocking someone already muted (or the reverse) switches the kind."""
+        if target_id == user_id:
+            raise HTTPException(status_code=400, detail="Cannot block yourself")
+        exists, held = (await db.execute(select(
+            select(User.id).where(User.id == target_id).exists(),
+            select(func.count()).select_from(UserBlock)
+            .where(UserBlock.user_id == user_id, UserBlock.target_id != target_id).scalar_subquery(),
+        ))).one()
+        if not exists:
+            raise HTTPException(status_code=404, detail="User not found")
+        if held >= settings.BLOCKS_MAX_PER_USER:
+            raise HTTPException(status_code=400, detail="Block list is full")
+
+        statement = insert(UserBlock).values(user_id=user_id, target_id=target_id, kind=kind)
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=[UserBlock.user_id, UserBlock.target_id], set_={"kind": statement.excluded.kind},
+        ))
+        await db.commit()
+        await self.invalidate(user_id, target_id)
+
+    async def unblock(self, db: AsyncSession, user_id: UUID, target_id: UUID) -> None:
+        result = await db.execute(
+            delete(UserBlock).where(UserBlock.user_id == user_id, UserBlock.target_id == target_id)
+        )
+        if not result.rowcount:
+            raise HTTPException(status_code=404, detail="User is not blocked or muted")
+        await db.commit()
+        await self.invalidate(user_id, target_id)
+
+    async def entries(self, db: AsyncSession, user_id: UUID) -> list:
+        """Users this user blocks or mutes, newest first, with their public profile."""
+        result = await db.execute(
+            select(
+                UserBlock.target_id.label("user_id"), User.username, User.full_name, User.avatar_url,
+                UserBlock.kind, UserBlock.created_at,
+            )
+            .join(User, User.id == UserBlock.target_id)
+            .where(UserBlock.user_id == user_id)
+            .order_by(UserBlock.created_at.desc())
+        )
+        return list(result.all())
+
+
+block_service = BlockService()
@@ -0,0 +1,175 @@
+"""
+Per-worker chat runtime: ChatHub fans live messages out to local WebSockets, and
+ChatFlusher moves the pending stream into Postgres.
+
+The hub reads every room that has a local subscriber with a single XREAD, so a
+worker holds one Redis connection for fan-out no matter how many sockets it serves.
+Each socket gets a bounded queue; a client too slow to keep up is disconnected
+rather than letting its backlog grow. A kick entry in a room's stream (see
+ChatService.kick) closes that user's sockets on every worker.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from backend.app.config import settings
+from backend.app.database import engine
+from backend.app.services.chat_service import ChatService, room_stream
+
+logger = logging.getLogger(__name__)
+
+# New rooms are picked up when the current blocking read returns
+FANOUT_BLOCK_MS = 250
+FANOUT_BATCH = 100
+SEND_QUEUE_SIZE = 256
+
+# WebSocket close codes queued in place of a message
+CLOSE_GOING_AWAY = 1001
+CLOSE_NOT_ALLOWED = 1008  # policy violation: bad token, or not (or no longer) a participant
+CLOSE_TRY_AGAIN_LATER = 1013
+
+chat_service = ChatService()
+
+
+class ChatHub:
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Accept subscribers again (called on every lifespan startup)."""
+        # Room -> each local socket's queue and the user it belongs to
+        self.rooms: dict[str, dict[asyncio.Queue, str]] = {}
+        self.cursors: dict[str, bytes] = {}
+        self.stopping = False
+        self._task: asyncio.Task | None = None
+
+    async def join(self, redis: Redis, post_id: str, user_id: str) -> tuple[asyncio.Queue, list[str]]:
+        """
+        Subscribe to a room. Returns the socket's queue and the recent messages the
+        hub has already read past, so replay plus the queue has no gaps or repeats.
+        """
+        if self.stopping:
+            raise RuntimeError("Chat hub is shutting down")
+        stream = room_stream(post_id)
+        if post_id not in self.cursors:
+            latest = await redis.xrevrange(stream, count=1)
+            # Another socket may have opened the room while we awaited
+            self.cursors.setdefault(post_id, latest[0][0] if latest else b"0-0")
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.rooms.setdefault(post_id, {})[queue] = user_id
+        cursor = self.cursors[post_id]
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._fanout(redis))
+
+        backlog = await redis.xrevrange(stream, max=cursor, count=settings.CHAT_REPLAY_COUNT)
+        return queue, [fields[b"m"].decode() for _, fields in reversed(backlog) if b"m" in fields]
+
+    def leave(self, post_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self.rooms.get(post_id)
+        if subscribers is None:
+            return
+        subscribers.pop(queue, None)
+        if not subscribers:
+            del self.rooms[post_id]
+            self.cursors.pop(post_id, None)
+
+    async def stop(self) -> None:
+        """Close every local socket (code 1001) so the shutdown drain is not held open."""
+        self.stopping = True
+        for subscribers in self.rooms.values():
+            for queue in subscribers:
+                self._close(queue, CLOSE_GOING_AWAY)
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _fanout(self, redis: Redis) -> None:
+        while self.rooms:
+            streams = {room_stream(post_id): cursor for post_id, cursor in self.cursors.items()}
+            try:
+                response = await redis.xread(streams, count=FANOUT_BATCH, block=FANOUT_BLOCK_MS)
+            except RedisError as exc:
+                logger.warning("Chat fan-out read failed: %s", exc)
+                await asyncio.sleep(1)
+                continue
+
+            for stream, entries in response or []:
+                post_id = stream.decode().split(":", 1)[1]
+                subscribers = self.rooms.get(post_id)
+                if not subscribers:
+                    continue
+                self.cursors[post_id] = entries[-1][0]
+                for _, fields in entries:
+                    if b"kick" in fields:
+                        self._kick(subscribers, fields[b"kick"].decode())
+                        continue
+                    message = fields[b"m"].decode()
+                    for queue in list(subscribers):
+                        self._offer(queue, message)
+
+    def _offer(self, queue: asyncio.Queue, message: str) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self._close(queue, CLOSE_TRY_AGAIN_LATER)
+
+    def _kick(self, subscribers: dict[asyncio.Queue, str], user_id: str) -> None:
+        for queue, member in list(subscribers.items()):
+            if member == user_id:
+                self._close(queue, CLOSE_NOT_ALLOWED)
+
+    @staticmethod
+    def _close(queue: asyncio.Queue, code: int) -> None:
+        # Drop whatever is queued so the close code is the next thing the socket sees
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(code)
+
+
+class ChatFlusher:
+    """Background loop batching ``chat:pending`` into Postgres; one per worker."""
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self.stopping = False
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self.stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Let the batch in hand finish (so it is acknowledged), then stop."""
+        if self._task is None:
+            return
+        self.stopping = True
+        try:
+            await asyncio.wait_for(self._task, settings.CHAT_FLUSH_INTERVAL_MS / 1000 + 5)
+        except asyncio.TimeoutError:
+            logger.warning("Chat flusher did not stop in time; unflushed entries will be reclaimed")
+        self._task = None
+
+    async def _run(self) -> None:
+        group_ready = False
+        while not self.stopping:
+            try:
+                if not group_ready:
+                    await chat_service.ensure_flush_group(self.redis)
+                    group_ready = True
+                await chat_service.flush_pending(self.redis, engine, self.consumer)
+            except Exception:
+                # Unacknowledged entries are reclaimed on a later pass
+                logger.exception("Chat flush failed")
+                await asyncio.sleep(1)
+
+
+chat_hub = ChatHub()
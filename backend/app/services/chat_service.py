@@ -0,0 +1,146 @@
+"""
+ChatService — per-hangout chat backed by Redis Streams, persisted to Postgres in batches.
+
+Every message is XADDed twice in one MULTI: to ``chat:<post_id>`` (trimmed, read by
+each worker's ChatHub for live fan-out) and to ``chat:pending``, which the flusher
+drains through a consumer group into ``chat_messages`` with one multi-row INSERT per
+batch. Kicks go to the room stream only, so they are never stored or replayed. History reads Postgres only, so the last flush interval of messages reaches
+clients through the WebSocket replay rather than the history endpoint.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+from uuid import UUID
+
+from fastapi import HTTPException
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from backend.app.config import settings
+from backend.app.models.hangout import ChatMessage, HangoutParticipant
+from backend.app.models.user import User
+
+PENDING_STREAM = "chat:pending"
+FLUSH_GROUP = "chat-flusher"
+# Entries another flusher read but never acknowledged are taken over after this long
+FLUSH_CLAIM_IDLE_MS = 60_000
+
+
+def room_stream(post_id: UUID | str) -> str:
+    return f"chat:{post_id}"
+
+
+def encode_cursor(message: ChatMessage) -> str:
+    raw = f"{message.created_at.isoformat()}|{message.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, message_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(message_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class ChatService:
+
+    async def is_participant(self, db: AsyncSession, post_id: UUID, user_id: UUID | str) -> bool:
+        result = await db.execute(
+            select(HangoutParticipant.id)
+            .join(User, User.id == HangoutParticipant.user_id)
+            .where(
+                HangoutParticipant.post_id == post_id,
+                HangoutParticipant.user_id == user_id,
+                User.is_active.is_(True),
+            )
+            .limit(1)
+        )
+        return result.first() is not None
+
+    async def publish(self, redis: Redis, post_id: UUID, sender_id: UUID | str, body: str) -> str:
+        """Append a message to the live and pending streams; returns its JSON form."""
+        data = json.dumps({
+            "id": str(uuid.uuid4()),
+            "post_id": str(post_id),
+            "sender_id": str(sender_id),
+            "body": body,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        })
+        pipe = redis.pipeline(transaction=True)
+        pipe.xadd(room_stream(post_id), {"m": data}, maxlen=settings.CHAT_STREAM_MAXLEN, approximate=True)
+        pipe.xadd(PENDING_STREAM, {"m": data})
+        await pipe.execute()
+        return data
+
+    async def kick(self, redis: Redis, post_id: UUID, user_id: UUID | str) -> None:
+        """Close the user's live sockets on this room, on every worker; history is untouched."""
+        await redis.xadd(room_stream(post_id), {"kick": str(user_id)},
+                         maxlen=settings.CHAT_STREAM_MAXLEN, approximate=True)
+
+    async def get_history(self, db: AsyncSession, post_id: UUID, before: str | None, limit: int) -> tuple[list[ChatMessage], str | None]:
+        """Newest-first keyset page; the cursor is the (created_at, id) of the last row returned."""
+        query = select(ChatMessage).where(ChatMessage.post_id == post_id)
+        if before:
+            query = query.where(tuple_(ChatMessage.created_at, ChatMessage.id) < decode_cursor(before))
+        query = query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit + 1)
+
+        result = await db.execute(query)
+        messages = list(result.scalars().all())
+        next_cursor = encode_cursor(messages[limit - 1]) if len(messages) > limit else None
+        return messages[:limit], next_cursor
+
+    async def ensure_flush_group(self, redis: Redis) -> None:
+        try:
+            await redis.xgroup_create(PENDING_STREAM, FLUSH_GROUP, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def flush_pending(self, redis: Redis, engine: AsyncEngine, consumer: str,
+                            batch_size: int = settings.CHAT_FLUSH_BATCH_SIZE,
+                            block_ms: int = settings.CHAT_FLUSH_INTERVAL_MS) -> int:
+        """
+        Move one batch from the pending stream into Postgres; returns rows written.
+        Stale entries (a flusher died or the INSERT failed) are reclaimed first. Inserts
+        ignore ids already stored, so an entry flushed twice is harmless.
+        """
+        _, entries, *_ = await redis.xautoclaim(
+            PENDING_STREAM, FLUSH_GROUP, consumer,
+            min_idle_time=FLUSH_CLAIM_IDLE_MS, start_id="0-0", count=batch_size,
+        )
+        if not entries:
+            response = await redis.xreadgroup(
+                FLUSH_GROUP, consumer, {PENDING_STREAM: ">"}, count=batch_size, block=block_ms,
+            )
+            entries = response[0][1] if response else []
+        if not entries:
+            return 0
+
+        rows = []
+        for _, fields in entries:
+            if not fields:
+                continue  # trimmed or deleted while pending
+            message = json.loads(fields[b"m"])
+            rows.append({
+                "id": UUID(message["id"]),
+                "post_id": UUID(message["post_id"]),
+                "sender_id": UUID(message["sender_id"]),
+                "body": message["body"],
+                "created_at": datetime.fromisoformat(message["created_at"]),
+            })
+        if rows:
+            async with engine.begin() as conn:
+                await conn.execute(insert(ChatMessage).values(rows).on_conflict_do_nothing(index_elements=["id"]))
+
+        entry_ids = [entry_id for entry_id, _ in entries]
+        pipe = redis.pipeline(transaction=False)
+        pipe.xack(PENDING_STREAM, FLUSH_GROUP, *entry_ids)
+        pipe.xdel(PENDING_STREAM, *entry_ids)
+        await pipe.execute()
+        return len(rows)
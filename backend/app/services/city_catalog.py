@@ -0,0 +1,113 @@
+"""
+CityCatalog — the ``cities`` table held in memory so city writes and autocomplete
+never touch the database.
+
+Every city is reachable by its normalized name and by each normalized alias
+("bombay" -> Mumbai). ``resolve`` is one dict lookup. ``complete`` binary-searches
+a sorted array of those keys: all keys sharing a prefix sit in one contiguous
+slice, which gives a trie's prefix walk without a node per character.
+
+The catalog is loaded once per worker at startup; adding cities needs a restart
+(or ``load`` again). Rows written before a city existed keep ``city_id`` NULL
+until the backfill statements below are re-run.
+"""
+
+import bisect
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.app.models.city import City
+
+logger = logging.getLogger(__name__)
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# Attach catalog ids to rows whose free-text city matches a key or alias. The
+# SQL normalization mirrors normalize_city except for accent stripping.
+BACKFILL_CITY_IDS_SQL = tuple(
+    f"""
+    WITH lookup AS (
+        SELECT id, name, key FROM cities
+        UNION ALL
+        SELECT id, name, unnest(aliases) FROM cities
+    )
+    UPDATE {table} AS t SET city_id = lookup.id, city = lookup.name
+    FROM lookup
+    WHERE t.city_id IS NULL
+      AND btrim(regexp_replace(lower(t.city), '[^[:alnum:]]+', ' ', 'g')) = lookup.key
+    """
+    for table in ("users", "hangout_posts")
+)
+
+
+def normalize_city(raw: str) -> str:
+    """Case-, accent-, punctuation- and whitespace-insensitive form: " São  Paulo." -> "sao paulo"."""
+    decomposed = unicodedata.normalize("NFKD", raw)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _SEPARATORS.sub(" ", stripped.casefold()).strip()
+
+
+@dataclass(frozen=True, slots=True)
+class CityEntry:
+    id: int
+    name: str
+    population: int
+
+
+class CityCatalog:
+
+    def __init__(self):
+        self.replace([])
+
+    def replace(self, cities: Iterable) -> None:
+        """
+        Swap in a new catalog from rows with id, name, aliases and population.
+        A key claimed by two cities resolves to the first.
+        """
+        by_key: dict[str, CityEntry] = {}
+        for city in cities:
+            entry = CityEntry(city.id, city.name, city.population)
+            for key in [normalize_city(city.name), *city.aliases]:
+                owner = by_key.setdefault(key, entry)
+                if owner.id != entry.id:
+                    logger.warning("City key %r is claimed by both %s and %s", key, owner.name, entry.name)
+        keys = sorted(by_key)
+        # Rebound in one go, so a concurrent reader sees the old catalog or the new one
+        self._by_key, self._keys, self._entries = by_key, keys, [by_key[key] for key in keys]
+
+    async def load(self, engine: AsyncEngine) -> int:
+        async with engine.connect() as conn:
+            rows = (await conn.execute(select(City.id, City.name, City.aliases, City.population))).all()
+        self.replace(rows)
+        logger.info("City catalog loaded: %d cities, %d keys", len(rows), len(self._keys))
+        return len(rows)
+
+    def resolve(self, raw: str) -> CityEntry | None:
+        return self._by_key.get(normalize_city(raw))
+
+    def canonical(self, raw: str) -> tuple[str, int | None]:
+        """(name, id) to store for user input; unknown cities keep their text with no id."""
+        entry = self.resolve(raw)
+        if entry is None:
+            return " ".join(raw.split()), None
+        return entry.name, entry.id
+
+    def complete(self, prefix: str, limit: int = 10) -> list[CityEntry]:
+        """Cities with a name or alias starting with ``prefix``, most populous first."""
+        key = normalize_city(prefix)
+        if not key:
+            return []
+        start = bisect.bisect_left(self._keys, key)
+        # Every key with this prefix sorts before prefix + the highest code point
+        end = bisect.bisect_left(self._keys, key + "\U0010ffff", start)
+        matches = {entry.id: entry for entry in self._entries[start:end]}
+        return sorted(matches.values(), key=lambda e: (-e.population, e.name))[:limit]
+
+
+city_catalog = CityCatalog()
@@ -0,0 +1,59 @@
+"""
+FacetService — live counts of open posts per (city, activity_type), kept in Redis.
+
+Each city is one hash, ``facets:<city>``, mapping activity_type to the number of
+open posts, so a city's filter counts are one HGETALL instead of a GROUP BY over
+its feed. The hangout service moves a post between buckets after every commit
+that changes its status, city or activity type. Nothing decrements a post when
+its start time passes, and a failed Redis write is only logged; the reconcile
+task (backend.app.tasks.facets) corrects every hash from Postgres to repair both.
+"""
+
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from backend.app.models.hangout import HangoutPost
+from backend.app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CITIES_KEY = "facets:cities"
+
+Facet = tuple[str, str]
+
+
+def facet_key(city: str) -> str:
+    return f"facets:{city}"
+
+
+class FacetService:
+
+    @staticmethod
+    def facet(post: HangoutPost) -> Facet | None:
+        """The bucket ``post`` counts towards, or None if it is not open."""
+        if post.status != 'open':
+            return None
+        return post.city, post.activity_type
+
+    async def move(self, before: Facet | None, after: Facet | None) -> None:
+        """Apply one post's change of bucket. Never raises."""
+        if before == after:
+            return
+        try:
+            pipe = get_redis().pipeline(transaction=True)
+            if before is not None:
+                pipe.hincrby(facet_key(before[0]), before[1], -1)
+            if after is not None:
+                pipe.hincrby(facet_key(after[0]), after[1], 1)
+                pipe.sadd(CITIES_KEY, after[0])
+            await pipe.execute()
+        except (RedisError, RuntimeError) as exc:
+            # RuntimeError: no Redis pool in this process (scripts, some tests)
+            logger.warning("Facet update %s -> %s failed: %s", before, after, exc)
+
+    async def counts(self, redis: Redis, city: str) -> dict[str, int]:
+        """Open-post count per activity type for ``city``; types with none are omitted."""
+        raw = await redis.hgetall(facet_key(city))
+        return {field.decode(): int(value) for field, value in raw.items() if int(value) > 0}
@@ -0,0 +1,352 @@
+"""
+FeedIndex — optional per-worker, per-city index of upcoming open posts, so the
+"soonest" feed with any mix of activity types, start window and free-seat filter
+is answered without SQL (FEED_INDEX_ENABLED).
+
+A city is loaded with one query the first time its feed is asked for. Each city
+keeps its posts as ``__slots__`` records plus, rebuilt only after a change:
+start times in an ``array('d')`` sorted ascending, and one bitmap per activity type
+and one for "has a free seat", as Python ints where bit i is the i-th post in start
+order (set in a bytearray, then converted once). A query bisects the window, ANDs
+the bitmaps with it and walks the set bits in order; each record already holds
+its serialized PostResponse.
+
+Changes arrive as post events on the outbox stream (``events:hangout_post``): a
+single follower task per worker reads it and re-reads the touched posts in one
+query per batch. A city is also reloaded after FEED_INDEX_MAX_AGE_SECONDS in case
+an event was missed (relay down, stream trimmed), and cities larger than
+FEED_INDEX_MAX_POSTS_PER_CITY are never indexed, which bounds memory.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Callable
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.config import settings
+from backend.app.queries import participant_count
+from backend.app.database import AsyncSessionLocal
+from backend.app.models.hangout import HangoutPost
+from backend.app.schemas.hangout import PostResponse
+from backend.app.services.city_catalog import city_catalog
+from backend.app.services.outbox_service import POST_AGGREGATE, stream_for
+from backend.app.utils.metrics import FEED_INDEX_BYTES, FEED_INDEX_POSTS
+
+logger = logging.getLogger(__name__)
+
+EVENTS_STREAM = stream_for(POST_AGGREGATE)
+FOLLOW_BLOCK_MS = 1000
+FOLLOW_BATCH = 500
+
+
+class IndexedPost:
+    __slots__ = ("id", "creator_id", "starts", "activity_type", "free", "body")
+
+    def __init__(self, id: UUID, creator_id: UUID, starts: float, activity_type: str, free: bool, body: bytes):
+        self.id = id
+        self.creator_id = creator_id
+        self.starts = starts
+        self.activity_type = activity_type
+        self.free = free
+        self.body = body
+
+
+class TooLarge(Exception):
+    """The city has more upcoming posts than FEED_INDEX_MAX_POSTS_PER_CITY."""
+
+
+class CityIndex:
+    __slots__ = ("posts", "loaded_at", "_dirty", "_order", "_starts", "_by_activity", "_free")
+
+    def __init__(self, posts: list[IndexedPost], loaded_at: float):
+        self.posts: dict[UUID, IndexedPost] = {post.id: post for post in posts}
+        # When the load query started: changes read before this are already included
+        self.loaded_at = loaded_at
+        self._dirty = True
+
+    def put(self, post: IndexedPost) -> None:
+        self.posts[post.id] = post
+        self._dirty = True
+
+    def discard(self, post_id: UUID) -> None:
+        if self.posts.pop(post_id, None) is not None:
+            self._dirty = True
+
+    def _compile(self) -> None:
+        order = sorted(self.posts.values(), key=lambda p: (p.starts, p.id))
+        # Set bits in place and convert once: OR-ing into an int copies it every time
+        size = (len(order) + 7) // 8
+        by_activity: dict[str, bytearray] = {}
+        free = bytearray(size)
+        for i, post in enumerate(order):
+            byte, bit = i >> 3, 1 << (i & 7)
+            bits = by_activity.get(post.activity_type)
+            if bits is None:
+                bits = by_activity[post.activity_type] = bytearray(size)
+            bits[byte] |= bit
+            if post.free:
+                free[byte] |= bit
+        self._order = order
+        self._starts = array("d", (post.starts for post in order))
+        self._by_activity = {activity: int.from_bytes(bits, "little") for activity, bits in by_activity.items()}
+        self._free = int.from_bytes(free, "little")
+        self._dirty = False
+
+    def query(self, activity_types: list[str] | None, starts_after: float, starts_before: float | None,
+              free_only: bool, offset: int, limit: int,
+              hidden: Callable[[UUID], bool] | None = None) -> list[bytes]:
+        if self._dirty:
+            self._compile()
+        lo = bisect.bisect_left(self._starts, starts_after)
+        hi = len(self._starts) if starts_before is None else bisect.bisect_left(self._starts, starts_before)
+        if lo >= hi:
+            return []
+        mask = ((1 << hi) - 1) ^ ((1 << lo) - 1)
+        if activity_types:
+            selected = 0
+            for activity_type in activity_types:
+                selected |= self._by_activity.get(activity_type, 0)
+            mask &= selected
+        if free_only:
+            mask &= self._free
+
+        bodies = []
+        while mask and len(bodies) < limit:
+            low = mask & -mask
+            post = self._order[low.bit_length() - 1]
+            if hidden is not None and hidden(post.creator_id):
+                pass  # skipped before paging, so pages stay full and don't overlap
+            elif offset:
+                offset -= 1
+            else:
+                bodies.append(post.body)
+            mask ^= low
+        return bodies
+
+    def nbytes(self) -> int:
+        """Approximate memory held by this city: records, bodies and compiled arrays."""
+        if self._dirty:
+            self._compile()
+        size = sys.getsizeof(self.posts) + sys.getsizeof(self._order) + sys.getsizeof(self._starts)
+        for post in self.posts.values():
+            size += sys.getsizeof(post) + sys.getsizeof(post.body) + sys.getsizeof(post.id)
+        size += sum(sys.getsizeof(bits) for bits in self._by_activity.values()) + sys.getsizeof(self._free)
+        return size
+
+
+def _indexed(post: HangoutPost, participants: int) -> IndexedPost:
+    return IndexedPost(
+        post.id, post.creator_id, post.scheduled_at.timestamp(), post.activity_type,
+        participants < post.max_participants,
+        PostResponse.model_validate(post).model_dump_json().encode(),
+    )
+
+
+def _with_counts():
+    return select(HangoutPost, participant_count().label("participants"))
+
+
+class FeedIndex:
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every city (called on every lifespan startup)."""
+        self.cities: dict[int, CityIndex] = {}
+        self._loading: dict[int, asyncio.Future] = {}
+        self._touched: dict[int, set[UUID]] = {}
+        self._too_large: dict[int, float] = {}
+        self._cursor: bytes | None = None
+        self._task: asyncio.Task | None = None
+
+    async def query(self, db: AsyncSession, redis: Redis, city_id: int, filters: dict,
+                    page: int, limit: int, hidden: Callable[[UUID], bool] | None = None) -> list[bytes] | None:
+        """
+        One feed page as serialized posts, or None if this city is not indexed.
+        Posts whose creator ``hidden`` matches are left out.
+        """
+        index = await self._city(db, redis, city_id)
+        if index is None:
+            return None
+        now = time.time()
+        starts_after = max(now, filters["starts_after"].timestamp()) if filters.get("starts_after") else now
+        starts_before = filters["starts_before"].timestamp() if filters.get("starts_before") else None
+        return index.query(
+            filters.get("activity_types"), starts_after, starts_before,
+            bool(filters.get("has_free_seats")), (page - 1) * limit, limit, hidden,
+        )
+
+    async def _city(self, db: AsyncSession, redis: Redis, city_id: int) -> CityIndex | None:
+        index = self.cities.get(city_id)
+        if index is not None and time.monotonic() - index.loaded_at < settings.FEED_INDEX_MAX_AGE_SECONDS:
+            return index
+        if self._too_large.get(city_id, 0.0) > time.monotonic():
+            return None
+
+        pending = self._loading.get(city_id)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+            return await self._city(db, redis, city_id)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[city_id] = future
+        self._touched[city_id] = set()
+        try:
+            # Follow from before the load, so nothing committed during it is missed
+            await self._start_following(redis)
+            try:
+                index = await self._load(db, city_id)
+            except TooLarge:
+                self.cities.pop(city_id, None)
+                self._too_large[city_id] = time.monotonic() + settings.FEED_INDEX_MAX_AGE_SECONDS
+                index = None
+            else:
+                self.cities[city_id] = index
+                FEED_INDEX_POSTS.labels(city_id).set(len(index.posts))
+                FEED_INDEX_BYTES.labels(city_id).set(index.nbytes())
+                # Posts changed while loading may have been refreshed before the city was installed
+                touched = self._touched.pop(city_id)
+                if touched:
+                    await self._refresh(db, touched)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            future.set_result(index)
+            return index
+        finally:
+            del self._loading[city_id]
+            self._touched.pop(city_id, None)
+
+    async def _load(self, db: AsyncSession, city_id: int) -> CityIndex:
+        cap = settings.FEED_INDEX_MAX_POSTS_PER_CITY
+        started = time.monotonic()
+        result = await db.execute(
+            _with_counts()
+            .where(
+                HangoutPost.city_id == city_id,
+                HangoutPost.status == 'open',
+                HangoutPost.scheduled_at >= datetime.now(timezone.utc),
+            )
+            .limit(cap + 1)
+        )
+        rows = result.all()
+        if len(rows) > cap:
+            raise TooLarge(city_id)
+        return CityIndex([_indexed(post, participants) for post, participants in rows], started)
+
+    # ─── FOLLOWING POST EVENTS ────────────────────────────────────────────────
+
+    async def _start_following(self, redis: Redis) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        latest = await redis.xrevrange(EVENTS_STREAM, count=1)
+        self._cursor = latest[0][0] if latest else b"0-0"
+        self._task = asyncio.create_task(self._follow(redis))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _follow(self, redis: Redis) -> None:
+        while self.cities or self._loading:
+            try:
+                response = await redis.xread(
+                    {EVENTS_STREAM: self._cursor}, count=FOLLOW_BATCH, block=FOLLOW_BLOCK_MS,
+                )
+            except RedisError as exc:
+                logger.warning("Feed index event read failed: %s", exc)
+                await asyncio.sleep(1)
+                continue
+            if not response:
+                continue
+            entries = response[0][1]
+            self._cursor = entries[-1][0]
+            post_ids = {UUID(fields[b"aggregate_id"].decode()) for _, fields in entries if self._touches(fields)}
+            for touched in self._touched.values():
+                touched |= post_ids
+            if post_ids:
+                try:
+                    # Short-lived session: the follower must not hold a pooled connection while it waits
+                    async with AsyncSessionLocal() as db:
+                        await self._refresh(db, post_ids)
+                except Exception:
+                    # Drop everything rather than serve a city that may have missed a change
+                    logger.exception("Feed index refresh failed; clearing the index")
+                    self.cities.clear()
+
+    def _touches(self, fields: dict) -> bool:
+        """Whether an event can change an indexed (or loading) city."""
+        if self._loading:
+            return True
+        post_id = UUID(fields[b"aggregate_id"].decode())
+        if any(post_id in index.posts for index in self.cities.values()):
+            return True
+        city = json.loads(fields[b"payload"]).get("city")
+        entry = city_catalog.resolve(city) if city else None
+        return entry is not None and entry.id in self.cities
+
+    async def _refresh(self, db: AsyncSession, post_ids: set[UUID]) -> None:
+        """Re-read posts and apply them to every city loaded before this read began."""
+        started = time.monotonic()
+        rows = (await db.execute(_with_counts().where(HangoutPost.id.in_(post_ids)))).all()
+        now = time.time()
+        # A city loaded after ``started`` already holds this state or newer
+        current = {city_id: index for city_id, index in self.cities.items() if index.loaded_at <= started}
+        for index in current.values():
+            for post_id in post_ids:
+                index.discard(post_id)
+        for post, participants in rows:
+            index = current.get(post.city_id)
+            if index is not None and post.status == 'open' and post.scheduled_at.timestamp() >= now:
+                index.put(_indexed(post, participants))
+
+    # ─── CONSISTENCY CHECK ────────────────────────────────────────────────────
+
+    async def check(self, db: AsyncSession, city_id: int) -> dict:
+        """
+        Compare a loaded city with Postgres: posts only one side has, and posts
+        whose indexed free-seat flag or activity type disagrees. Empty lists mean consistent.
+        """
+        index = self.cities.get(city_id)
+        if index is None:
+            return {"loaded": False}
+        fresh = await self._load(db, city_id)
+        now = time.time()
+        indexed = {pid: post for pid, post in index.posts.items() if post.starts >= now}
+        return {
+            "loaded": True,
+            "posts": len(fresh.posts),
+            "missing": sorted(str(pid) for pid in fresh.posts.keys() - indexed.keys()),
+            "extra": sorted(str(pid) for pid in indexed.keys() - fresh.posts.keys()),
+            "mismatched": sorted(
+                str(pid) for pid in fresh.posts.keys() & indexed.keys()
+                if (fresh.posts[pid].free, fresh.posts[pid].activity_type)
+                != (indexed[pid].free, indexed[pid].activity_type)
+            ),
+        }
+
+
+feed_index = FeedIndex()
@@ -1,21 +1,47 @@
+import logging
+from typing import Awaitable, Callable
 from uuid import UUID
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException
-from sqlalchemy import select, func
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from backend.app import queries
+from backend.app.config import settings
+from backend.app.redis_client import get_redis
 from backend.app.models.user import User
 from backend.app.models.hangout import HangoutPost, HangoutRequest, HangoutParticipant
-from backend.app.schemas.hangout import CreatePostRequest
+from backend.app.schemas.hangout import CreatePostRequest, UpdatePostRequest
+from backend.app.services.block_service import block_service
+from backend.app.services.chat_service import ChatService
+from backend.app.services.city_catalog import city_catalog
+from backend.app.services.facet_service import FacetService
+from backend.app.services.outbox_service import OutboxService
+from backend.app.services.post_cache import post_cache
+from backend.app.services.trending_service import TrendingService
+
+logger = logging.getLogger(__name__)
+
+outbox = OutboxService()
+facets = FacetService()
+chat = ChatService()
+trending = TrendingService()
 
 class HangoutService:
 
     async def create_post(self, db: AsyncSession, user: User, data: CreatePostRequest) -> HangoutPost:
         # Create the post
+        duration = timedelta(minutes=data.duration_minutes or settings.DEFAULT_HANGOUT_DURATION_MINUTES)
+        fields = data.model_dump(exclude={"duration_minutes"})
+        fields["city"], fields["city_id"] = city_catalog.canonical(data.city)
         new_post = HangoutPost(
             creator_id=user.id,
-            **data.model_dump()
+            ends_at=data.scheduled_at + duration,
+            **fields
         )
         db.add(new_post)
         await db.flush() # Flush to get the new_post.id
@@ -27,44 +53,155 @@ class HangoutService:
             role='host'
         )
         db.add(host_participant)
+        outbox.post_event(db, new_post, "post.created")
         
         await db.commit()
         await db.refresh(new_post)
+        await facets.move(None, facets.facet(new_post))
         return new_post
 
-    async def get_feed(self, db: AsyncSession, city: str, filters: dict, page: int = 1, limit: int = 20) -> list[HangoutPost]:
-        query = select(HangoutPost).where(
-            HangoutPost.city == city,
-            HangoutPost.status == 'open',
-            HangoutPost.scheduled_at >= datetime.now(timezone.utc)
-        )
+    async def get_feed(self, db: AsyncSession, city: str, filters: dict, page: int = 1, limit: int = 20,
+                       hidden: Callable[[UUID], bool] | None = None) -> list[HangoutPost]:
+        # "Bombay", "mumbai " and "Mumbai" are one feed; unknown cities match on text
+        entry = city_catalog.resolve(city)
+        city_id, city_text, now = entry.id if entry else None, " ".join(city.split()), datetime.now(timezone.utc)
 
-        if "activity_type" in filters and filters["activity_type"]:
-            query = query.where(HangoutPost.activity_type == filters["activity_type"])
+        async def fetch(offset: int, count: int) -> list[HangoutPost]:
+            result = await db.execute(queries.feed(city_id, city_text, filters, now, offset, count))
+            return list(result.scalars().all())
 
-        query = query.order_by(HangoutPost.scheduled_at.asc())
-        query = query.offset((page - 1) * limit).limit(limit)
+        if hidden is None:
+            return await fetch((page - 1) * limit, limit)
+        return await self._page(fetch, page, limit, hidden)
 
-        result = await db.execute(query)
-        return list(result.scalars().all())
+    async def get_trending_feed(self, db: AsyncSession, redis: Redis, city: str, filters: dict, page: int = 1,
+                                limit: int = 20, hidden: Callable[[UUID], bool] | None = None) -> list[HangoutPost]:
+        """One page of the city's trending posts, hottest first; ``city`` is the canonical name."""
+        now = datetime.now(timezone.utc)
+
+        async def fetch(offset: int, count: int) -> list[HangoutPost | None]:
+            # Hydrate ranked ids in one query; posts no longer open or matching come back None
+            post_ids = await trending.top(redis, city, offset, count)
+            if not post_ids:
+                return []
+            result = await db.execute(queries.posts_by_ids(post_ids, filters, now))
+            posts = {post.id: post for post in result.scalars().all()}
+            return [posts.get(post_id) for post_id in post_ids]
+
+        return await self._page(fetch, page, limit, hidden)
+
+    @staticmethod
+    async def _page(fetch: Callable[[int, int], Awaitable[list[HangoutPost | None]]], page: int, limit: int,
+                    hidden: Callable[[UUID], bool] | None) -> list[HangoutPost]:
+        """
+        One page of what ``fetch(offset, count)`` returns, minus None and posts whose
+        creator is ``hidden``. They are dropped before the offset is counted, as in the
+        feed index, so pages come back full and never overlap. Reads from the top in
+        rounds of limit + FEED_FETCH_SLACK until the page is full or rows run out.
+        """
+        skip, batch = (page - 1) * limit, limit + settings.FEED_FETCH_SLACK
+        posts, offset = [], 0
+        while True:
+            rows = await fetch(offset, batch)
+            offset += len(rows)
+            for post in rows:
+                if post is None or (hidden is not None and hidden(post.creator_id)):
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                posts.append(post)
+                if len(posts) == limit:
+                    return posts
+            if len(rows) < batch:
+                return posts
 
     async def get_post_by_id(self, db: AsyncSession, post_id: UUID) -> HangoutPost | None:
-        query = select(HangoutPost).options(
-            joinedload(HangoutPost.creator),
-            joinedload(HangoutPost.participants)
-        ).where(HangoutPost.id == post_id)
-        
-        result = await db.execute(query)
+        result = await db.execute(queries.post_detail(post_id))
         return result.scalars().first()
 
+    async def _lock_post(self, db: AsyncSession, post_id: UUID, shared: bool = False) -> HangoutPost | None:
+        """
+        Lock the post row and re-read it. Seat changes (accepting, leaving, promoting
+        from the waitlist, withdrawing a request) lock it exclusively, so they run one
+        at a time per post and each counts the seats the last one left. A new request
+        locks it shared, so no seat can free up between its count and its insert
+        without seeing the insert.
+        """
+        result = await db.execute(
+            select(HangoutPost).where(HangoutPost.id == post_id)
+            .with_for_update(read=shared, key_share=not shared)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+
+    async def _count_seats(self, db: AsyncSession, post_id: UUID) -> int:
+        result = await db.execute(
+            select(func.count()).select_from(HangoutParticipant).where(HangoutParticipant.post_id == post_id)
+        )
+        return result.scalar()
+
+    async def _fill_seats(self, db: AsyncSession, post: HangoutPost, taken: int) -> list[HangoutRequest]:
+        """
+        Promote the oldest waitlisted requesters into the free seats, then close or
+        reopen the post to match. The caller holds the post lock and commits.
+        """
+        promoted, passed_over = [], []
+        while taken < post.max_participants:
+            # SKIP LOCKED: a waitlisted request being cancelled right now is not worth waiting for
+            result = await db.execute(
+                select(HangoutRequest)
+                .where(
+                    HangoutRequest.post_id == post.id,
+                    HangoutRequest.status == 'waitlisted',
+                    HangoutRequest.id.not_in(passed_over),
+                )
+                .order_by(HangoutRequest.created_at, HangoutRequest.id)
+                .limit(post.max_participants - taken)
+                .with_for_update(skip_locked=True)
+            )
+            candidates = list(result.scalars().all())
+            if not candidates:
+                break
+            free = post.max_participants - taken
+            blocks = await block_service.get(db, post.creator_id)
+            busy = await self.find_conflicts(db, [req.requester_id for req in candidates], post)
+            now = datetime.now(timezone.utc)
+            for req in candidates:
+                if blocks.blocks(req.requester_id):
+                    req.status, req.responded_at = 'declined', now
+                    outbox.request_event(db, req, "request.declined")
+                elif req.requester_id in busy:
+                    # Keeps their place: the other hangout may still go away
+                    passed_over.append(req.id)
+                else:
+                    req.status, req.responded_at = 'accepted', now
+                    db.add(HangoutParticipant(post_id=post.id, user_id=req.requester_id, role='participant'))
+                    outbox.request_event(db, req, "request.promoted")
+                    promoted.append(req)
+                    taken += 1
+            if len(candidates) < free:
+                break  # nobody else is waiting
+
+        if post.status in ('open', 'closed'):
+            status = 'closed' if taken >= post.max_participants else 'open'
+            if status != post.status:
+                post.status = status
+                outbox.post_event(db, post, "post.closed" if status == 'closed' else "post.reopened")
+        return promoted
+
     async def send_request(self, db: AsyncSession, user: User, post_id: UUID, message: str | None) -> HangoutRequest:
+        """A join request, or a place on the waitlist if the post is full."""
         post = await self.get_post_by_id(db, post_id)
-        if not post or post.status != 'open':
+        if not post or post.status not in ('open', 'closed'):
             raise HTTPException(status_code=400, detail="Post is not available")
         
         if post.creator_id == user.id:
             raise HTTPException(status_code=400, detail="Cannot request your own post")
 
+        if (await block_service.get(db, user.id)).blocks(post.creator_id):
+            raise HTTPException(status_code=403, detail="You cannot request to join this post")
+
         # Check if already requested
         existing_req = await db.execute(
             select(HangoutRequest).where(HangoutRequest.post_id == post_id, HangoutRequest.requester_id == user.id)
@@ -72,16 +209,25 @@ class HangoutService:
         if existing_req.scalars().first():
             raise HTTPException(status_code=409, detail="Already requested")
 
-        # Check if full
-        count_result = await db.execute(select(func.count()).select_from(HangoutParticipant).where(HangoutParticipant.post_id == post_id))
-        current_count = count_result.scalar()
-        if current_count >= post.max_participants:
-            raise HTTPException(status_code=400, detail="Post is full")
+        await self._lock_post(db, post_id, shared=True)
+        if post.status not in ('open', 'closed'):
+            raise HTTPException(status_code=400, detail="Post is not available")
+        # A full post takes requests onto its waitlist, in arrival order
+        full = await self._count_seats(db, post_id) >= post.max_participants
+
+        if await self.find_conflict(db, user.id, post):
+            raise HTTPException(status_code=409, detail="You already have a hangout at this time")
 
-        new_request = HangoutRequest(post_id=post_id, requester_id=user.id, message=message, status='pending')
+        new_request = HangoutRequest(
+            post_id=post_id, requester_id=user.id, message=message, status='waitlisted' if full else 'pending'
+        )
         db.add(new_request)
+        await db.flush() # Flush to get the new_request.id for the event
+        outbox.request_event(db, new_request, "request.waitlisted" if full else "request.sent")
         await db.commit()
         await db.refresh(new_request)
+        # Hand the already-loaded post back on the request without another query
+        set_committed_value(new_request, "post", post)
         return new_request
 
     async def respond_to_request(self, db: AsyncSession, owner: User, request_id: UUID, action: str) -> HangoutRequest:
@@ -94,36 +240,146 @@ class HangoutService:
         post = req.post
         if post.creator_id != owner.id:
             raise HTTPException(status_code=403, detail="Not authorized")
-            
-        if req.status != 'pending':
+
+        # Post first, then the request: the order every seat change takes its locks in
+        await self._lock_post(db, post.id)
+        status = (await db.execute(
+            select(HangoutRequest.status).where(HangoutRequest.id == request_id).with_for_update()
+        )).scalar()
+        # The host may also take someone off the waitlist directly, if a seat is free
+        if status not in ('pending', 'waitlisted'):
             raise HTTPException(status_code=400, detail="Request already processed")
+        before = facets.facet(post)
 
         if action == 'accept':
             # Check capacity again before accepting
-            count_result = await db.execute(select(func.count()).select_from(HangoutParticipant).where(HangoutParticipant.post_id == post.id))
-            current_count = count_result.scalar()
-            
+            current_count = await self._count_seats(db, post.id)
+
             if current_count >= post.max_participants:
                 raise HTTPException(status_code=400, detail="Post is full")
 
+            if await self.find_conflict(db, req.requester_id, post):
+                raise HTTPException(status_code=409, detail="Requester already has a hangout at this time")
+
             req.status = 'accepted'
             req.responded_at = datetime.now(timezone.utc)
             
             new_participant = HangoutParticipant(post_id=post.id, user_id=req.requester_id, role='participant')
             db.add(new_participant)
             
+            outbox.request_event(db, req, "request.accepted")
+            
             # If accepting this person fills the post, close it
             if current_count + 1 >= post.max_participants:
                 post.status = 'closed'
+                outbox.post_event(db, post, "post.closed")
                 
         elif action == 'decline':
             req.status = 'declined'
             req.responded_at = datetime.now(timezone.utc)
+            outbox.request_event(db, req, "request.declined")
 
         await db.commit()
         await db.refresh(req)
+        # refresh() expires the joined post; put the loaded one back
+        set_committed_value(req, "post", post)
+        await post_cache.invalidate(post.id)
+        await facets.move(before, facets.facet(post))
         return req
 
+    async def update_post(self, db: AsyncSession, user: User, post_id: UUID, data: UpdatePostRequest) -> HangoutPost:
+        post = await self.get_post_by_id(db, post_id)
+        if not post:
+            raise HTTPException(status_code=404, detail="Post not found")
+        if post.creator_id != user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to edit this post")
+
+        update_data = data.model_dump(exclude_unset=True)
+        moved = "scheduled_at" in update_data or "duration_minutes" in update_data
+        if "max_participants" in update_data or moved:
+            # A new capacity frees or takes seats, and a new time is checked against
+            # the roster; either way nobody may join meanwhile
+            await self._lock_post(db, post_id)
+        before = facets.facet(post)
+        duration_minutes = update_data.pop("duration_minutes", None)
+        if update_data.get("city") is not None:
+            update_data["city"], update_data["city_id"] = city_catalog.canonical(update_data["city"])
+        # Moving the start keeps the current length unless a new one is given
+        duration = timedelta(minutes=duration_minutes) if duration_minutes else post.ends_at - post.scheduled_at
+        for key, value in update_data.items():
+            setattr(post, key, value)
+        if duration_minutes or "scheduled_at" in update_data:
+            post.ends_at = post.scheduled_at + duration
+            update_data["ends_at"] = post.ends_at
+        if moved:
+            # The host's own clashes aren't checked (as when posting); the guests' are
+            seated = (await db.execute(
+                select(HangoutParticipant.user_id)
+                .where(HangoutParticipant.post_id == post.id, HangoutParticipant.role == 'participant')
+            )).scalars().all()
+            if seated and await self.find_conflicts(db, list(seated), post):
+                raise HTTPException(status_code=409, detail="A participant already has a hangout at the new time")
+        if update_data:
+            outbox.post_event(db, post, "post.updated", changed=sorted(update_data))
+        if "max_participants" in update_data:
+            await self._fill_seats(db, post, await self._count_seats(db, post.id))
+
+        await db.commit()
+        await db.refresh(post)
+        await post_cache.invalidate(post.id)
+        await facets.move(before, facets.facet(post))
+        return post
+
+    async def find_conflict(self, db: AsyncSession, user_id: UUID, post: HangoutPost) -> UUID | None:
+        """
+        The id of a live hangout the user is in (as host or participant) whose time
+        overlaps ``post``: one probe of the (user_id, time_range) GiST index on
+        their seats, then the status of the few posts it finds.
+        """
+        result = await db.execute(
+            select(HangoutParticipant.post_id)
+            .join(HangoutPost, HangoutParticipant.post_id == HangoutPost.id)
+            .where(
+                HangoutParticipant.user_id == user_id,
+                HangoutParticipant.time_range.op('&&')(func.tstzrange(post.scheduled_at, post.ends_at, '[)')),
+                HangoutParticipant.post_id != post.id,
+                HangoutPost.status.in_(('open', 'closed')),
+            )
+            .limit(1)
+        )
+        return result.scalar()
+
+    async def find_conflicts(self, db: AsyncSession, user_ids: list[UUID], post: HangoutPost) -> set[UUID]:
+        """``find_conflict`` for several users at once: those of them who are busy during ``post``."""
+        result = await db.execute(
+            select(HangoutParticipant.user_id)
+            .join(HangoutPost, HangoutParticipant.post_id == HangoutPost.id)
+            .where(
+                HangoutParticipant.user_id.in_(user_ids),
+                HangoutParticipant.time_range.op('&&')(func.tstzrange(post.scheduled_at, post.ends_at, '[)')),
+                HangoutParticipant.post_id != post.id,
+                HangoutPost.status.in_(('open', 'closed')),
+            )
+            .distinct()
+        )
+        return set(result.scalars().all())
+
+    async def get_schedule(self, db: AsyncSession, user: User, limit: int = 50) -> list[tuple[HangoutPost, str]]:
+        """Upcoming hangouts the user hosts or joined, soonest first, with their role."""
+        query = (
+            select(HangoutPost, HangoutParticipant.role)
+            .join(HangoutParticipant, HangoutParticipant.post_id == HangoutPost.id)
+            .where(
+                HangoutParticipant.user_id == user.id,
+                HangoutPost.status.in_(('open', 'closed')),
+                HangoutPost.ends_at >= datetime.now(timezone.utc),
+            )
+            .order_by(HangoutPost.scheduled_at.asc())
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return [(post, role) for post, role in result.all()]
+
     async def get_my_posts(self, db: AsyncSession, user: User) -> list[HangoutPost]:
         query = select(HangoutPost).where(HangoutPost.creator_id == user.id).order_by(HangoutPost.created_at.desc())
         result = await db.execute(query)
@@ -141,7 +397,91 @@ class HangoutService:
         if post.creator_id != user.id:
             raise HTTPException(status_code=403, detail="Not authorized")
             
+        before = facets.facet(post)
         post.status = 'cancelled'
+        outbox.post_event(db, post, "post.cancelled")
         await db.commit()
         await db.refresh(post)
-        return post
\ No newline at end of file
+        await post_cache.invalidate(post.id)
+        await facets.move(before, None)
+        return post
+
+    async def leave(self, db: AsyncSession, user: User, post_id: UUID) -> list[HangoutRequest]:
+        """
+        Give up a seat. The oldest waitlisted requester takes it in the same
+        transaction; with nobody waiting, a closed post reopens.
+        """
+        post = await self._lock_post(db, post_id)
+        if not post:
+            raise HTTPException(status_code=404, detail="Post not found")
+        if post.creator_id == user.id:
+            raise HTTPException(status_code=400, detail="The host cannot leave; cancel the post instead")
+        if post.status not in ('open', 'closed'):
+            raise HTTPException(status_code=400, detail="Post is not active")
+
+        before = facets.facet(post)
+        left = (await db.execute(
+            delete(HangoutParticipant)
+            .where(HangoutParticipant.post_id == post_id, HangoutParticipant.user_id == user.id)
+            .returning(HangoutParticipant.id, HangoutParticipant.post_id, HangoutParticipant.user_id)
+        )).first()
+        if left is None:
+            raise HTTPException(status_code=404, detail="You are not in this hangout")
+        outbox.participant_event(db, left, "participant.left")
+        # The request that got them in goes with the seat
+        await db.execute(
+            update(HangoutRequest)
+            .where(HangoutRequest.post_id == post_id, HangoutRequest.requester_id == user.id,
+                   HangoutRequest.status == 'accepted')
+            .values(status='cancelled')
+        )
+        promoted = await self._fill_seats(db, post, await self._count_seats(db, post_id))
+
+        await db.commit()
+        await post_cache.invalidate(post.id)
+        await facets.move(before, facets.facet(post))
+        try:
+            await chat.kick(get_redis(), post_id, user.id)
+        except (RedisError, RuntimeError) as exc:
+            # Their sockets still close at the next membership re-check
+            logger.warning("Chat kick for %s on %s failed: %s", user.id, post_id, exc)
+        return promoted
+
+    async def cancel_request(self, db: AsyncSession, user: User, request_id: UUID) -> None:
+        """Withdraw a request; withdrawing an accepted one means leaving the hangout."""
+        result = await db.execute(select(HangoutRequest).where(HangoutRequest.id == request_id))
+        req = result.scalars().first()
+        if not req or req.requester_id != user.id:
+            raise HTTPException(status_code=403, detail="Not authorized or not found")
+
+        if req.status in ('pending', 'waitlisted'):
+            # Post first, as every seat change does: an update that waited out an accept
+            # or a promotion keeps the request locked, and leaving then waits on the post
+            await self._lock_post(db, req.post_id)
+            # Only if still open: when the host accepted it just before, that wins and this becomes a leave
+            cancelled = (await db.execute(
+                update(HangoutRequest)
+                .where(HangoutRequest.id == request_id, HangoutRequest.status.in_(('pending', 'waitlisted')))
+                .values(status='cancelled')
+                .returning(HangoutRequest.id)
+            )).first()
+            if cancelled:
+                await db.commit()
+                return
+            await db.refresh(req, ["status"])
+        if req.status == 'accepted':
+            await self.leave(db, user, req.post_id)
+
+    async def get_waitlist(self, db: AsyncSession, user: User, post_id: UUID) -> list[HangoutRequest]:
+        """The post's waitlist in promotion order. Host only."""
+        post = await db.get(HangoutPost, post_id)
+        if not post:
+            raise HTTPException(status_code=404, detail="Post not found")
+        if post.creator_id != user.id:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        result = await db.execute(
+            select(HangoutRequest)
+            .where(HangoutRequest.post_id == post_id, HangoutRequest.status == 'waitlisted')
+            .order_by(HangoutRequest.created_at, HangoutRequest.id)
+        )
+        return list(result.scalars().all())
\ No newline at end of file
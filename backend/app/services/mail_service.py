@@ -0,0 +1,40 @@
+"""
+MailService — composes transactional emails and hands them to the Celery mail queue.
+"""
+
+import json
+
+from redis.asyncio import Redis
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.config import settings
+from backend.app.tasks.mail import MAIL_QUEUE_KEY, flush_queue
+
+# Messages queued within this window go out over the same SMTP session.
+BATCH_WINDOW_SECONDS = 2
+
+
+class MailService:
+
+    async def queue(self, redis: Redis, to: str, subject: str, body: str) -> None:
+        """Push one message onto the mail queue; never talks to SMTP."""
+        pending = await redis.rpush(MAIL_QUEUE_KEY, json.dumps({"to": to, "subject": subject, "body": body}))
+        if pending == 1:
+            # Queue was empty, so no flush is scheduled yet. Publishing is blocking kombu I/O.
+            await run_in_threadpool(flush_queue.apply_async, countdown=BATCH_WINDOW_SECONDS)
+
+    async def send_password_reset(self, redis: Redis, email: str, raw_token: str) -> None:
+        link = f"{settings.FRONTEND_URL}/reset-password?token={raw_token}"
+        await self.queue(
+            redis, email, "Reset your ConnectEm password",
+            f"Someone asked to reset your ConnectEm password.\n\n"
+            f"Use this link within {settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES} minutes:\n{link}\n\n"
+            f"If it wasn't you, ignore this email.",
+        )
+
+    async def send_email_verification(self, redis: Redis, email: str, raw_token: str) -> None:
+        link = f"{settings.FRONTEND_URL}/verify-email?token={raw_token}"
+        await self.queue(
+            redis, email, "Verify your ConnectEm email",
+            f"Welcome to ConnectEm! Confirm your email address:\n{link}",
+        )
@@ -0,0 +1,61 @@
+"""
+OutboxService — records domain events as rows in the caller's transaction.
+
+Nothing is published here: the outbox relay (``python -m backend.app.cli.outbox_relay``)
+forwards committed rows to Redis streams, so an event exists if and only if the change
+it describes was committed.
+"""
+
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models.hangout import HangoutParticipant, HangoutPost, HangoutRequest
+from backend.app.models.outbox import OutboxEvent
+
+# Requests belong to a post, so every hangout event shares the post's aggregate and
+# is published in one order per post.
+POST_AGGREGATE = "hangout_post"
+
+
+def stream_for(aggregate_type: str) -> str:
+    return f"events:{aggregate_type}"
+
+
+class OutboxService:
+
+    def record(self, db: AsyncSession, aggregate_type: str, aggregate_id: UUID, event_type: str, payload: dict) -> None:
+        """Stage an event; it is inserted by the caller's next flush or commit."""
+        db.add(OutboxEvent(
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            event_type=event_type,
+            payload=payload,
+        ))
+
+    def post_event(self, db: AsyncSession, post: HangoutPost, event_type: str, **extra) -> None:
+        self.record(db, POST_AGGREGATE, post.id, event_type, {
+            "post_id": str(post.id),
+            "creator_id": str(post.creator_id),
+            "city": post.city,
+            "activity_type": post.activity_type,
+            "status": post.status,
+            "scheduled_at": post.scheduled_at.isoformat(),
+            "max_participants": post.max_participants,
+            **extra,
+        })
+
+    def request_event(self, db: AsyncSession, req: HangoutRequest, event_type: str) -> None:
+        self.record(db, POST_AGGREGATE, req.post_id, event_type, {
+            "request_id": str(req.id),
+            "post_id": str(req.post_id),
+            "requester_id": str(req.requester_id),
+            "status": req.status,
+        })
+
+    def participant_event(self, db: AsyncSession, participant: HangoutParticipant, event_type: str) -> None:
+        self.record(db, POST_AGGREGATE, participant.post_id, event_type, {
+            "participant_id": str(participant.id),
+            "post_id": str(participant.post_id),
+            "user_id": str(participant.user_id),
+        })
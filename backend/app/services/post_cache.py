@@ -0,0 +1,211 @@
+"""
+PostDetailCache — serialized ``PostDetailResponse`` JSON per post, so a shared link
+opened by hundreds of people runs the joinedload query and serialization once.
+
+Two tiers: a per-worker LRU (POST_CACHE_LOCAL_SIZE entries, held for
+POST_CACHE_LOCAL_TTL_SECONDS) in front of ``post_detail:<id>`` in Redis (held for
+POST_CACHE_TTL_SECONDS). Concurrent misses for one post in a worker await a single
+loader instead of each querying Postgres.
+
+Writes invalidate after commit: the local entry and the Redis key go at once and
+``post_detail:ver:<id>`` is bumped. A fill only stores if the version it read
+before loading is unchanged, so a load racing an invalidation on any worker never
+puts the old detail back. Other workers' local copies age out within the local
+TTL, which bounds how stale a detail page can be.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from backend.app.config import settings
+from backend.app.redis_client import get_redis
+from backend.app.utils.metrics import record_cache, record_coalesced
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAME = "post_detail"
+
+# KEYS: detail key, version key, creator key. ARGV: version read before loading,
+# detail, TTL in seconds, post id
+FILL_LUA = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+redis.call('SADD', KEYS[3], ARGV[4])
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+return 1
+"""
+
+
+def detail_key(post_id: UUID | str) -> str:
+    return f"post_detail:{post_id}"
+
+
+def version_key(post_id: UUID | str) -> str:
+    return f"post_detail:ver:{post_id}"
+
+
+def creator_key(creator_id: UUID | str) -> str:
+    """Ids of the creator's posts currently in Redis, for profile-change invalidation."""
+    return f"post_detail:by_creator:{creator_id}"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPost:
+    """The serialized detail plus the few fields a hit still needs (trending bumps, invalidation)."""
+    body: bytes
+    id: UUID
+    creator_id: UUID
+    city: str
+    status: str
+    ends_at: datetime
+
+    @classmethod
+    def from_json(cls, body: bytes) -> "CachedPost":
+        data = json.loads(body)
+        return cls(
+            body=body, id=UUID(data["id"]), creator_id=UUID(data["creator_id"]), city=data["city"],
+            status=data["status"], ends_at=datetime.fromisoformat(data["ends_at"]),
+        )
+
+
+class PostDetailCache:
+
+    def __init__(self, maxsize: int = settings.POST_CACHE_LOCAL_SIZE):
+        self.maxsize = maxsize
+        self._local: OrderedDict[UUID, tuple[float, CachedPost]] = OrderedDict()
+        self._loading: dict[UUID, asyncio.Future] = {}
+        # Invalidations seen while a load is in flight; a load only stores if unchanged
+        self._generation: dict[UUID, int] = {}
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    async def get(self, post_id: UUID, load: Callable[[], Awaitable[bytes | None]]) -> CachedPost | None:
+        """
+        The cached detail for ``post_id``, or ``load()`` (the serialized detail, or
+        None if the post does not exist) run once for all concurrent misses.
+        """
+        entry = self._local.get(post_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._local.move_to_end(post_id)
+            record_cache(f"{CACHE_NAME}_local", True)
+            return entry[1]
+        record_cache(f"{CACHE_NAME}_local", False)
+
+        pending = self._loading.get(post_id)
+        if pending is not None:
+            record_coalesced(CACHE_NAME)
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this request was cancelled, not the load
+            # The request doing the load went away; load for ourselves
+            return await self.get(post_id, load)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[post_id] = future
+        try:
+            cached = await self._fill(post_id, load)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Waiters see the exception; mark it retrieved so an unawaited one isn't logged
+            future.exception()
+            raise
+        else:
+            future.set_result(cached)
+            return cached
+        finally:
+            del self._loading[post_id]
+            self._generation.pop(post_id, None)
+
+    async def _fill(self, post_id: UUID, load: Callable[[], Awaitable[bytes | None]]) -> CachedPost | None:
+        generation = self._generation.get(post_id, 0)
+        body = version = None
+        redis_ok = True
+        try:
+            body, version = await get_redis().mget(detail_key(post_id), version_key(post_id))
+        except (RedisError, RuntimeError) as exc:
+            logger.warning("Post detail cache read for %s failed: %s", post_id, exc)
+            redis_ok = False
+        record_cache(f"{CACHE_NAME}_redis", body is not None)
+
+        from_redis = body is not None
+        if body is None:
+            body = await load()
+            if body is None:
+                return None
+        cached = CachedPost.from_json(body)
+
+        if self._generation.get(post_id, 0) != generation:
+            return cached  # invalidated while loading: serve it, don't keep it
+        if not from_redis and redis_ok:
+            try:
+                stored = await get_redis().eval(
+                    FILL_LUA, 3, detail_key(post_id), version_key(post_id), creator_key(cached.creator_id),
+                    version or b"", body, settings.POST_CACHE_TTL_SECONDS, str(post_id),
+                )
+            except (RedisError, RuntimeError) as exc:
+                logger.warning("Post detail cache write for %s failed: %s", post_id, exc)
+            else:
+                if not stored:
+                    return cached  # invalidated by another worker while loading
+        self._store(post_id, cached)
+        return cached
+
+    def _store(self, post_id: UUID, cached: CachedPost) -> None:
+        self._local[post_id] = (time.monotonic() + settings.POST_CACHE_LOCAL_TTL_SECONDS, cached)
+        self._local.move_to_end(post_id)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    async def invalidate(self, *post_ids: UUID, redis: Redis | None = None) -> None:
+        """
+        Drop posts from both tiers after a committed change. Never raises.
+        ``redis`` defaults to the app's client; Celery tasks pass their own.
+        """
+        if not post_ids:
+            return
+        for post_id in post_ids:
+            self._local.pop(post_id, None)
+            if post_id in self._loading:
+                self._generation[post_id] = self._generation.get(post_id, 0) + 1
+        try:
+            pipe = (redis or get_redis()).pipeline(transaction=True)
+            for post_id in post_ids:
+                pipe.incr(version_key(post_id))
+                pipe.expire(version_key(post_id), settings.POST_CACHE_TTL_SECONDS)
+                pipe.delete(detail_key(post_id))
+            await pipe.execute()
+        except (RedisError, RuntimeError) as exc:
+            logger.warning("Post detail cache invalidation for %s failed: %s", post_ids, exc)
+
+    async def invalidate_creator(self, creator_id: UUID, redis: Redis | None = None) -> None:
+        """Drop the posts of a creator whose profile changed (it is embedded in each detail)."""
+        post_ids = [pid for pid, (_, cached) in self._local.items() if cached.creator_id == creator_id]
+        try:
+            redis = redis or get_redis()
+            keys = await redis.smembers(creator_key(creator_id))
+            post_ids += [UUID(k.decode()) for k in keys]
+            await redis.delete(creator_key(creator_id))
+        except (RedisError, RuntimeError) as exc:
+            logger.warning("Post detail cache lookup for creator %s failed: %s", creator_id, exc)
+        await self.invalidate(*set(post_ids), redis=redis)
+
+
+post_cache = PostDetailCache()
@@ -0,0 +1,171 @@
+"""
+Delta sync — the posts, requests and participations that changed for one user
+since their last sync token, plus tombstones for the ones deleted.
+
+Every synced row carries ``change_xid``: the id of the transaction that last
+inserted or updated it (column default and a BEFORE UPDATE trigger, see
+models/sync.py). Transaction ids are handed out in order but commit in any
+order, so "rows above the highest id I have seen" would skip a transaction
+that was still running. Instead a sync records the snapshot's xmin, the oldest
+transaction still in flight when it started: everything below it had finished,
+so the next sync asks for ``change_xid >= xmin``. Rows from transactions that
+straddled the watermark are sent twice, never missed; clients upsert by id.
+
+A sync is paged in (change_xid, kind, id) order, at most SYNC_MAX_PAGE_SIZE
+entries per page. The token is opaque to clients: the watermark being synced
+from, the one the sync will end on, and the last entry sent.
+
+A user's scope is the posts they host or joined, their own requests, the
+requests on posts they host, and the participations on their posts. Joining
+brings a post's older rows into scope without touching them, so a post and its
+roster are read at ``greatest(change_xid, xid of the user's own seat)``: once
+the seat is newer than the watermark, the whole post is sent again.
+"""
+
+import base64
+import binascii
+import json
+import time
+from dataclasses import dataclass
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import and_, case, func, literal_column, or_, select, true, tuple_, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from backend.app.config import settings
+from backend.app.models.hangout import HangoutParticipant, HangoutPost, HangoutRequest
+from backend.app.models.sync import SyncTombstone
+
+# Position of each kind among entries sharing one change_xid
+KINDS = {"post": 0, "request": 1, "participation": 2, "deleted": 3}
+MODELS = {"post": HangoutPost, "request": HangoutRequest, "participation": HangoutParticipant,
+          "deleted": SyncTombstone}
+
+
+@dataclass
+class SyncToken:
+    since: int
+    # Snapshot xmin when the sync started; the next sync starts from here
+    upto: int
+    started_at: float
+    # (change_xid, kind, id) of the last entry sent; None before the first page
+    after: tuple[int, int, str] | None = None
+
+    def encode(self) -> str:
+        raw = json.dumps({"s": self.since, "u": self.upto, "t": int(self.started_at),
+                          "a": list(self.after) if self.after else None}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "SyncToken":
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            after = raw["a"]
+            return cls(int(raw["s"]), int(raw["u"]), float(raw["t"]),
+                       (int(after[0]), int(after[1]), str(UUID(after[2]))) if after else None)
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, IndexError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+@dataclass
+class SyncPage:
+    posts: list[HangoutPost]
+    requests: list[HangoutRequest]
+    participations: list[HangoutParticipant]
+    deleted: list[SyncTombstone]
+    next_token: str
+    has_more: bool
+
+
+class SyncService:
+
+    async def changes(self, db: AsyncSession, user_id: UUID, token: str | None, limit: int) -> SyncPage:
+        if token:
+            state = SyncToken.decode(token)
+            if time.time() - state.started_at > settings.SYNC_TOMBSTONE_RETENTION_DAYS * 86400:
+                # Deletions that old may already be purged; only a full sync is safe
+                raise HTTPException(status_code=410, detail="Sync token expired; start a full sync")
+        else:
+            state = SyncToken(since=0, upto=0, started_at=0)
+
+        if state.after is None:
+            # Taken before any row is read: every transaction below it is already visible
+            state.upto = (await db.execute(
+                select(literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+            )).scalar_one()
+            state.started_at = time.time()
+
+        scope = union(
+            select(HangoutPost.id).where(HangoutPost.creator_id == user_id),
+            select(HangoutParticipant.post_id).where(HangoutParticipant.user_id == user_id),
+        ).scalar_subquery()
+        hosted = select(HangoutPost.id).where(HangoutPost.creator_id == user_id).scalar_subquery()
+        scopes = {
+            "post": HangoutPost.id.in_(scope),
+            "request": or_(HangoutRequest.requester_id == user_id, HangoutRequest.post_id.in_(hosted)),
+            "participation": HangoutParticipant.post_id.in_(scope),
+            # Leaving a post takes it out of scope, so the user's own deletions match by user
+            "deleted": or_(SyncTombstone.user_id == user_id, SyncTombstone.post_id.in_(scope)),
+        }
+
+        # The user's seat on the post each row belongs to, if it is newer than the watermark
+        seat = aliased(HangoutParticipant)
+        seat_xid = case((seat.change_xid >= state.since, seat.change_xid))
+
+        entries = []
+        for kind, rank in KINDS.items():
+            if kind == "deleted" and not state.since:
+                continue  # A full sync has nothing to delete
+            model = MODELS[kind]
+            key = self._key(model)
+            query = select(model)
+            if kind in ("post", "participation"):
+                post_id = model.id if model is HangoutPost else model.post_id
+                xid = func.greatest(model.change_xid, seat_xid)
+                query = (
+                    query.add_columns(xid)
+                    .outerjoin(seat, and_(seat.post_id == post_id, seat.user_id == user_id))
+                    .where(or_(model.change_xid >= state.since, seat.change_xid >= state.since))
+                )
+            else:
+                xid = model.change_xid
+                query = query.add_columns(xid).where(xid >= state.since)
+            query = (
+                query.where(scopes[kind], self._after(xid, key, rank, state))
+                .order_by(xid, key)
+                .limit(limit + 1)
+            )
+            rows = (await db.execute(query)).all()
+            entries += [((row_xid, rank, str(getattr(row, key.key))), kind, row) for row, row_xid in rows]
+
+        entries.sort(key=lambda entry: entry[0])
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        grouped: dict[str, list] = {kind: [] for kind in KINDS}
+        for _, kind, row in entries:
+            grouped[kind].append(row)
+
+        if has_more:
+            state.after = entries[-1][0]
+        else:
+            state = SyncToken(since=state.upto, upto=state.upto, started_at=state.started_at)
+        return SyncPage(grouped["post"], grouped["request"], grouped["participation"], grouped["deleted"],
+                        state.encode(), has_more)
+
+    @staticmethod
+    def _key(model):
+        # Tombstones order by the deleted row's id, so an entry is the same wherever it is read from
+        return model.entity_id if model is SyncTombstone else model.id
+
+    def _after(self, xid, key, rank: int, state: SyncToken):
+        """Keyset condition: entries of this kind past the last one sent, in (xid, kind, id) order."""
+        if state.after is None:
+            return true()
+        last_xid, last_rank, last_id = state.after
+        if rank < last_rank:
+            return xid > last_xid
+        if rank > last_rank:
+            return xid >= last_xid
+        return tuple_(xid, key) > (last_xid, UUID(last_id))
@@ -0,0 +1,79 @@
+"""
+TrendingService — per-city "trending" ranking kept in Redis sorted sets.
+
+Interest (detail views, join requests, accepts) bumps a post in ``trending:<city>``
+with forward exponential decay: each bump adds ``weight * 2^((now - epoch) / half_life)``,
+so newer interest counts for more and old scores never need rewriting. Ranking by
+the stored score is the same as ranking by the decayed one. The compaction task
+(backend.app.tasks.trending) rebases the epoch before scores overflow, drops posts
+that have ended or decayed away, and caps each city's set.
+
+Reads are one ZREVRANGE, O(log n + N) for a city of n posts.
+"""
+
+import logging
+from datetime import datetime
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from backend.app.config import settings
+
+logger = logging.getLogger(__name__)
+
+EPOCH_KEY = "trending:epoch"
+CITIES_KEY = "trending:cities"
+
+
+def scores_key(city: str) -> str:
+    return f"trending:{city}"
+
+
+def ends_key(city: str) -> str:
+    """Post end times (unix seconds) for the city, so compaction can drop finished posts."""
+    return f"trending:ends:{city}"
+
+
+# KEYS: scores zset, ends zset, epoch key, cities set
+# ARGV: post id, weight, half-life seconds, post end (unix seconds), city
+BUMP_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local epoch = tonumber(redis.call('GET', KEYS[3]))
+if epoch == nil then
+    epoch = now
+    redis.call('SET', KEYS[3], tostring(epoch))
+end
+local increment = tonumber(ARGV[2]) * math.pow(2, (now - epoch) / tonumber(ARGV[3]))
+redis.call('ZINCRBY', KEYS[1], increment, ARGV[1])
+redis.call('ZADD', KEYS[2], ARGV[4], ARGV[1])
+redis.call('SADD', KEYS[4], ARGV[5])
+return tostring(increment)
+"""
+
+
+class TrendingService:
+
+    def __init__(self):
+        self._script = None
+
+    async def bump(self, redis: Redis, city: str, post_id: UUID, ends_at: datetime, kind: str) -> None:
+        """Record interest of ``kind`` (a key of TRENDING_WEIGHTS). Never raises."""
+        try:
+            if self._script is None or self._script.registered_client is not redis:
+                self._script = redis.register_script(BUMP_LUA)
+            await self._script(
+                keys=[scores_key(city), ends_key(city), EPOCH_KEY, CITIES_KEY],
+                args=[
+                    str(post_id), settings.TRENDING_WEIGHTS[kind],
+                    settings.TRENDING_HALF_LIFE_HOURS * 3600, int(ends_at.timestamp()), city,
+                ],
+            )
+        except RedisError as exc:
+            logger.warning("Trending bump for %s failed: %s", post_id, exc)
+
+    async def top(self, redis: Redis, city: str, offset: int, limit: int) -> list[UUID]:
+        """Post ids for one page of the city's trending list, hottest first."""
+        members = await redis.zrevrange(scores_key(city), offset, offset + limit - 1)
+        return [UUID(member.decode()) for member in members]
@@ -0,0 +1,110 @@
+"""
+Avatar tasks — turn a raw upload into fixed-size thumbnails off the API workers.
+
+The original is streamed from the bucket into a spooled temp file (memory only up
+to SPOOL_BYTES, disk beyond), decoded at reduced scale where the format allows it,
+and each thumbnail is streamed back with a multipart-capable upload.
+"""
+
+import asyncio
+import io
+import logging
+import tempfile
+import uuid
+
+from botocore.exceptions import BotoCoreError, ClientError
+from PIL import Image, ImageOps, UnidentifiedImageError
+from redis.asyncio import Redis
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.app.config import settings
+from backend.app.database import asyncpg_connect_args
+from backend.app.models.user import User
+from backend.app.services.post_cache import post_cache
+from backend.app.utils.storage import get_s3_client, public_url
+from backend.app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+SPOOL_BYTES = 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+# Which generated size becomes users.avatar_url
+PRIMARY_SIZE = 256
+
+
+def avatar_key(user_id: str, version: str, size: int) -> str:
+    return f"avatars/{user_id}/{version}_{size}.webp"
+
+
+def _download(key: str) -> tempfile.SpooledTemporaryFile:
+    body = get_s3_client().get_object(Bucket=settings.S3_BUCKET, Key=key)["Body"]
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    for chunk in body.iter_chunks(CHUNK_BYTES):
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def render_thumbnails(source, sizes: list[int]) -> dict[int, io.BytesIO]:
+    """Square-crop and resize ``source`` into WebP thumbnails, largest decode first."""
+    with Image.open(source) as image:
+        # JPEG can decode straight to roughly the largest size needed: far less memory.
+        image.draft("RGB", (max(sizes), max(sizes)))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        outputs = {}
+        for size in sorted(sizes, reverse=True):
+            thumb = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            thumb.save(buffer, "WEBP", quality=85, method=4)
+            buffer.seek(0)
+            outputs[size] = buffer
+        return outputs
+
+
+async def _set_avatar_url(user_id: str, url: str) -> None:
+    # Celery workers are sync and short-lived per task loop, so no pooled connections.
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool, connect_args=asyncpg_connect_args())
+    redis = Redis.from_url(settings.REDIS_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(update(User).where(User.id == uuid.UUID(user_id)).values(avatar_url=url))
+        # The avatar is embedded in the creator's cached post details
+        await post_cache.invalidate_creator(uuid.UUID(user_id), redis)
+    finally:
+        await redis.aclose()
+        await engine.dispose()
+
+
+@celery_app.task(
+    name="avatars.process",
+    autoretry_for=(BotoCoreError, ClientError, OSError),
+    retry_backoff=2,
+    retry_backoff_max=300,
+    max_retries=5,
+)
+def process_avatar(user_id: str, upload_key: str) -> str | None:
+    """Resize an uploaded avatar into AVATAR_SIZES, publish them, then point avatar_url at one."""
+    s3 = get_s3_client()
+    version = uuid.uuid4().hex[:12]
+
+    with _download(upload_key) as source:
+        try:
+            thumbnails = render_thumbnails(source, settings.AVATAR_SIZES)
+        except (UnidentifiedImageError, Image.DecompressionBombError) as exc:
+            logger.warning("Rejecting avatar upload %s: %s", upload_key, exc)
+            s3.delete_object(Bucket=settings.S3_BUCKET, Key=upload_key)
+            return None
+
+    for size, buffer in thumbnails.items():
+        s3.upload_fileobj(
+            buffer, settings.S3_BUCKET, avatar_key(user_id, version, size),
+            ExtraArgs={"ContentType": "image/webp", "CacheControl": "public, max-age=31536000, immutable"},
+        )
+
+    primary = PRIMARY_SIZE if PRIMARY_SIZE in thumbnails else max(thumbnails)
+    url = public_url(avatar_key(user_id, version, primary))
+    asyncio.run(_set_avatar_url(user_id, url))
+    s3.delete_object(Bucket=settings.S3_BUCKET, Key=upload_key)
+    return url
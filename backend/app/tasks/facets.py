@@ -0,0 +1,98 @@
+"""
+Facet reconciliation — corrects the per-city activity counts from Postgres.
+
+Runs from Celery beat every FACET_RECONCILE_SECONDS. Live updates only see commits
+made through the hangout service, so this is what drops posts whose start time has
+passed and repairs any increment lost to a Redis error. One GROUP BY over the open,
+upcoming posts, bracketed by reads of every city's hash. A city whose hash did not
+move while Postgres was counting gets the difference applied with HINCRBY, under
+WATCH so a live update landing meanwhile aborts it rather than being overwritten.
+Cities that moved are left for the next run.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+import redis
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.app.config import settings
+from backend.app.database import asyncpg_connect_args
+from backend.app.models.hangout import HangoutPost
+from backend.app.services.facet_service import CITIES_KEY, facet_key
+from backend.app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+_redis: redis.Redis | None = None
+
+
+def _get_redis() -> redis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis
+
+
+async def _open_post_counts() -> dict[str, dict[str, int]]:
+    # Celery workers are sync and short-lived per task loop, so no pooled connections.
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool, connect_args=asyncpg_connect_args())
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                select(HangoutPost.city, HangoutPost.activity_type, func.count())
+                .where(HangoutPost.status == 'open', HangoutPost.scheduled_at >= datetime.now(timezone.utc))
+                .group_by(HangoutPost.city, HangoutPost.activity_type)
+            )
+            counts: dict[str, dict[str, int]] = {}
+            for city, activity_type, count in result:
+                counts.setdefault(city, {})[activity_type] = count
+            return counts
+    finally:
+        await engine.dispose()
+
+
+def _stored(r: redis.Redis, city: str) -> dict[str, int]:
+    return {k.decode(): int(v) for k, v in r.hgetall(facet_key(city)).items()}
+
+
+@celery_app.task(name="facets.reconcile")
+def reconcile() -> dict:
+    r = _get_redis()
+    # What the hashes held when the count started; anything since is a live update
+    before = {city: _stored(r, city) for city in (raw.decode() for raw in r.smembers(CITIES_KEY))}
+    counts = asyncio.run(_open_post_counts())
+
+    drifted = skipped = 0
+    for city in set(before) | set(counts):
+        fresh = counts.get(city, {})
+        key = facet_key(city)
+        with r.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(key)
+                stored = _stored(pipe, city)
+                if stored != before.get(city, {}):
+                    skipped += 1
+                    continue
+                if {k: v for k, v in stored.items() if v} == fresh:
+                    continue
+                pipe.multi()
+                for activity_type in set(stored) | set(fresh):
+                    delta = fresh.get(activity_type, 0) - stored.get(activity_type, 0)
+                    if delta:
+                        pipe.hincrby(key, activity_type, delta)
+                if fresh:
+                    pipe.sadd(CITIES_KEY, city)
+                else:
+                    pipe.srem(CITIES_KEY, city)
+                pipe.execute()
+                drifted += 1
+            except redis.WatchError:
+                skipped += 1
+
+    logger.info("Facet reconcile: %d cities, %d corrected, %d left for the next run",
+                len(counts), drifted, skipped)
+    return {"cities": len(counts), "rewritten": drifted, "skipped": skipped}
@@ -0,0 +1,93 @@
+"""
+Mail tasks — drain the Redis mail queue in batches over one SMTP connection.
+
+The API only RPUSHes a JSON payload onto MAIL_QUEUE_KEY; everything that touches
+SMTP runs here, with exponential backoff on failure. For local development run a
+stand-in server, e.g. ``python -m aiosmtpd -n -l localhost:1025``.
+"""
+
+import json
+import logging
+import smtplib
+from email.message import EmailMessage
+
+import redis
+
+from backend.app.config import settings
+from backend.app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+MAIL_QUEUE_KEY = "mail:pending"
+
+_redis: redis.Redis | None = None
+
+
+def _get_redis() -> redis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis
+
+
+def _connect() -> smtplib.SMTP:
+    smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10)
+    if settings.SMTP_USE_TLS:
+        smtp.starttls()
+    if settings.SMTP_USERNAME:
+        smtp.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD or "")
+    return smtp
+
+
+def build_message(payload: dict) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = settings.MAIL_FROM
+    message["To"] = payload["to"]
+    message["Subject"] = payload["subject"]
+    message.set_content(payload["body"])
+    return message
+
+
+RETRY_OPTIONS = dict(
+    autoretry_for=(smtplib.SMTPException, OSError),
+    retry_backoff=2,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=8,
+)
+
+
+@celery_app.task(name="mail.send_one", **RETRY_OPTIONS)
+def send_one(payload: dict) -> None:
+    """Send a single message; used for messages that failed inside a batch."""
+    with _connect() as smtp:
+        smtp.send_message(build_message(payload))
+
+
+@celery_app.task(name="mail.flush_queue", **RETRY_OPTIONS)
+def flush_queue() -> int:
+    """Send everything queued, MAIL_BATCH_SIZE messages per SMTP session."""
+    queue = _get_redis()
+    sent = 0
+    while raw := queue.lpop(MAIL_QUEUE_KEY, settings.MAIL_BATCH_SIZE):
+        try:
+            smtp = _connect()
+        except (smtplib.SMTPException, OSError):
+            # Server unreachable: put the batch back in order and let autoretry back off.
+            queue.lpush(MAIL_QUEUE_KEY, *reversed(raw))
+            raise
+        with smtp:
+            for index, item in enumerate(raw):
+                payload = json.loads(item)
+                try:
+                    smtp.send_message(build_message(payload))
+                    sent += 1
+                except smtplib.SMTPRecipientsRefused:
+                    logger.warning("Dropping mail to refused recipient %s", payload["to"])
+                except smtplib.SMTPException:
+                    send_one.delay(payload)
+                except OSError:
+                    # Connection lost mid-batch: put back what wasn't sent, in order, and back off.
+                    queue.lpush(MAIL_QUEUE_KEY, *reversed(raw[index:]))
+                    raise
+    return sent
@@ -0,0 +1,40 @@
+"""
+Tombstone purge — drops deletions older than SYNC_TOMBSTONE_RETENTION_DAYS.
+
+Runs daily from Celery beat. Sync tokens older than the retention get 410 and
+start over with a full sync, so nothing still accepted needs these rows.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.app.config import settings
+from backend.app.database import asyncpg_connect_args
+from backend.app.models.sync import SyncTombstone
+from backend.app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+async def _purge() -> int:
+    # Celery workers are sync and short-lived per task loop, so no pooled connections.
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool, connect_args=asyncpg_connect_args())
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    try:
+        async with engine.begin() as conn:
+            result = await conn.execute(delete(SyncTombstone).where(SyncTombstone.deleted_at < cutoff))
+            return result.rowcount
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="sync.purge_tombstones")
+def purge_tombstones() -> dict:
+    purged = asyncio.run(_purge())
+    logger.info("Purged %d sync tombstones", purged)
+    return {"purged": purged}
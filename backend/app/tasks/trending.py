@@ -0,0 +1,86 @@
+"""
+Trending compaction — keeps the per-city sorted sets small and their scores finite.
+
+Runs from Celery beat every TRENDING_COMPACT_SECONDS. For each city it drops posts
+that have ended, posts whose decayed score fell below TRENDING_MIN_SCORE, and
+everything past the TRENDING_MAX_PER_CITY hottest. Once the decay exponent gets
+large the epoch is moved to now and every score rescaled to match, in one script.
+"""
+
+import logging
+import time
+
+import redis
+
+from backend.app.config import settings
+from backend.app.services.trending_service import CITIES_KEY, EPOCH_KEY, ends_key, scores_key
+from backend.app.worker import celery_app
+
+logger = logging.getLogger(__name__)
+
+# 2^32 keeps scores far from float overflow while rebasing only every 32 half-lives
+REBASE_EXPONENT = 32
+
+# KEYS: epoch key, cities set. ARGV: half-life seconds, exponent that triggers a rebase.
+# Reads the city list itself so a city added concurrently can't miss the rescale.
+REBASE_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local epoch = tonumber(redis.call('GET', KEYS[1]))
+if epoch == nil then
+    return 0
+end
+local exponent = (now - epoch) / tonumber(ARGV[1])
+if exponent < tonumber(ARGV[2]) then
+    return 0
+end
+local factor = tostring(math.pow(2, -exponent))
+for _, city in ipairs(redis.call('SMEMBERS', KEYS[2])) do
+    local key = 'trending:' .. city
+    redis.call('ZUNIONSTORE', key, 1, key, 'WEIGHTS', factor)
+end
+redis.call('SET', KEYS[1], tostring(now))
+return 1
+"""
+
+_redis: redis.Redis | None = None
+
+
+def _get_redis() -> redis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis
+
+
+@celery_app.task(name="trending.compact")
+def compact() -> dict:
+    r = _get_redis()
+    half_life = settings.TRENDING_HALF_LIFE_HOURS * 3600
+    rebased = r.eval(REBASE_LUA, 2, EPOCH_KEY, CITIES_KEY, half_life, REBASE_EXPONENT)
+
+    epoch = float(r.get(EPOCH_KEY) or time.time())
+    now = time.time()
+    min_stored = settings.TRENDING_MIN_SCORE * 2 ** ((now - epoch) / half_life)
+
+    removed = 0
+    for raw_city in r.smembers(CITIES_KEY):
+        city = raw_city.decode()
+        expired = r.zrangebyscore(ends_key(city), "-inf", now)
+        pipe = r.pipeline(transaction=False)
+        if expired:
+            pipe.zrem(ends_key(city), *expired)
+            pipe.zrem(scores_key(city), *expired)
+        pipe.zremrangebyscore(scores_key(city), "-inf", min_stored)
+        pipe.zremrangebyrank(scores_key(city), 0, -(settings.TRENDING_MAX_PER_CITY + 1))
+        pipe.zcard(scores_key(city))
+        results = pipe.execute()
+        if expired:
+            results = results[1:]  # the end-time set isn't part of the ranking
+        *dropped, remaining = results
+        removed += sum(dropped)
+        if remaining == 0:
+            r.srem(CITIES_KEY, city)
+
+    logger.info("Trending compaction removed %d entries (rebased=%s)", removed, bool(rebased))
+    return {"removed": removed, "rebased": bool(rebased)}
@@ -0,0 +1,136 @@
+"""
+Pytest plugin — enforces the per-route SQL query budgets declared with
+``@query_budget(n)`` on every request made through the ``budget_client`` fixture.
+A route with a budget of 0 must not check a connection out of the pool either.
+After each request ``budget_client.last_statements`` and ``last_checkouts`` hold
+what it used, so a test can assert that a cached response never touched the DB.
+
+backend/tests/conftest.py registers it for the test suite; elsewhere enable it
+with ``pytest -p backend.app.testing.query_budget``.
+"""
+
+import warnings
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from starlette.routing import Match
+
+from backend.app.database import engine
+from backend.app.utils.query_budget import get_query_budget
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request runs more SQL statements than its route allows."""
+
+
+class StatementRecorder:
+    """Collects every statement (and counts pool checkouts) between start() and stop()."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+        self.checkouts = 0
+        self._active = False
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+        event.listen(engine.sync_engine, "checkout", self._record_checkout)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self._active:
+            self.statements.append(statement)
+
+    def _record_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        if self._active:
+            self.checkouts += 1
+
+    def start(self) -> None:
+        self.statements = []
+        self.checkouts = 0
+        self._active = True
+
+    def stop(self) -> list[str]:
+        self._active = False
+        return self.statements
+
+    def close(self) -> None:
+        event.remove(engine.sync_engine, "before_cursor_execute", self._record)
+        event.remove(engine.sync_engine, "checkout", self._record_checkout)
+
+
+class BudgetTestClient(TestClient):
+    """TestClient that fails any request exceeding its route's query budget."""
+
+    def __init__(self, *args, recorder: StatementRecorder, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recorder = recorder
+        self.last_statements: list[str] = []
+        self.last_checkouts = 0
+
+    def request(self, method, url, *args, **kwargs):
+        self.recorder.start()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        finally:
+            statements = self.recorder.stop()
+        self.last_statements, self.last_checkouts = statements, self.recorder.checkouts
+
+        route = self._resolve_route(method, url)
+        if route is None:
+            return response
+        budget = get_query_budget(route.endpoint)
+        if budget is not None and len(statements) > budget:
+            listing = "\n".join(f"  {i}. {s}" for i, s in enumerate(statements, 1))
+            raise QueryBudgetExceeded(
+                f"{method.upper()} {route.path} ran {len(statements)} statements, "
+                f"budget is {budget}:\n{listing}"
+            )
+        if budget == 0 and self.recorder.checkouts:
+            raise QueryBudgetExceeded(
+                f"{method.upper()} {route.path} has a budget of 0 but checked out "
+                f"{self.recorder.checkouts} connection(s)"
+            )
+        return response
+
+    def _resolve_route(self, method: str, url):
+        scope = {
+            "type": "http",
+            "method": method.upper(),
+            "path": urlsplit(str(url)).path,
+            "root_path": "",
+        }
+        for route in self.app.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+        return None
+
+
+@pytest.fixture
+def statement_recorder():
+    recorder = StatementRecorder()
+    yield recorder
+    recorder.close()
+
+
+@pytest.fixture
+def budget_client(statement_recorder):
+    from backend.app.main import app
+
+    with BudgetTestClient(app, recorder=statement_recorder) as client:
+        yield client
+
+
+def pytest_collection_modifyitems(config, items):
+    """Report routes that have no declared budget, so new endpoints don't slip through."""
+    from backend.app.main import app
+
+    missing = [
+        f"{sorted(route.methods)[0]} {route.path}"
+        for route in app.router.routes
+        if getattr(route, "include_in_schema", False)
+        and route.path.startswith("/api/v1/")
+        and route.path != "/api/v1/health"
+        and get_query_budget(route.endpoint) is None
+    ]
+    if missing:
+        warnings.warn(pytest.PytestWarning("Routes without a query budget: " + ", ".join(missing)))
@@ -50,4 +50,18 @@ def decode_access_token(token: str) -> dict | None:
 
 def hash_refresh_token(token: str) -> str:
     """SHA256 hash a refresh token for safe DB storage."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def create_email_token(expires_delta: timedelta) -> tuple[str, datetime]:
+    """
+    Create an opaque one-time token for password reset / email verification links.
+    Returns (raw_token, expires_at) — store the hash, mail the raw token.
+    """
+    raw_token = secrets.token_urlsafe(32)
+    return raw_token, datetime.now(timezone.utc) + expires_delta
+
+
+def hash_email_token(token: str) -> str:
+    """SHA256 hash an email token for safe DB storage."""
     return hashlib.sha256(token.encode()).hexdigest()
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""Prometheus metrics and per-request database instrumentation."""
+
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Set by the pre-fork supervisor (backend/app/serve.py) before anything imports
+# prometheus_client: every worker then writes its samples to files in that
+# directory, and whichever worker answers a scrape reports all of them.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+# ─── HTTP ─────────────────────────────────────────────────────────────────────
+
+# Labels always use the route template (e.g. /api/v1/hangout/posts/{post_id}),
+# never the raw path, so series cardinality stays bounded by the route table.
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled, by route template.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+
+# ─── DATABASE ─────────────────────────────────────────────────────────────────
+
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed while handling one request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50),
+)
+DB_CHECKOUTS_PER_REQUEST = Histogram(
+    "db_checkouts_per_request",
+    "Connections checked out of the pool while handling one request (0 = served without the DB).",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Total time spent in SQL statements while handling one request.",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# ─── CPU-BOUND WORK / CACHES ──────────────────────────────────────────────────
+
+BCRYPT_DURATION = Histogram(
+    "bcrypt_duration_seconds",
+    "Time spent hashing or verifying a password with bcrypt.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit / miss).",
+    ["cache", "result"],
+)
+
+
+CACHE_COALESCED = Counter(
+    "cache_coalesced_total",
+    "Cache misses that awaited another request's in-flight load instead of loading.",
+    ["cache"],
+)
+FEED_INDEX_POSTS = Gauge(
+    "feed_index_posts",
+    "Upcoming open posts held by this worker's feed index, per city id.",
+    ["city_id"],
+    multiprocess_mode="liveall",
+)
+FEED_INDEX_BYTES = Gauge(
+    "feed_index_bytes",
+    "Approximate memory held by this worker's feed index, per city id.",
+    ["city_id"],
+    multiprocess_mode="liveall",
+)
+
+
+def render_latest() -> bytes:
+    """The /metrics body: this process's registry, or every live worker's samples when pre-forked."""
+    if not MULTIPROCESS:
+        return generate_latest()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count one lookup against a named cache."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_coalesced(cache: str) -> None:
+    """Count one miss answered by a load already in flight (a suppressed stampede)."""
+    CACHE_COALESCED.labels(cache).inc()
+
+
+# ─── PER-REQUEST SQL ACCOUNTING ───────────────────────────────────────────────
+
+@dataclass(slots=True)
+class QueryStats:
+    """SQL statement count, pool checkouts and cumulative DB time for the current request."""
+    statements: int = 0
+    checkouts: int = 0
+    db_time: float = 0.0
+
+
+# Set by the metrics middleware for the lifetime of one request.
+# SQLAlchemy copies the asyncio context into its greenlets, so engine
+# event handlers see the same value as the route handler.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.checkouts += 1
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach statement timing hooks, checkout counting and pool occupancy to an engine."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "checkout", _on_checkout)
+    if not MULTIPROCESS:
+        REGISTRY.register(PoolCollector(engine))
+        return
+
+    # A scrape only reaches one worker's pool, so each worker writes its own as it changes
+    def record_checkout(dbapi_connection, connection_record, connection_proxy):
+        _record_pool(pool_readings(engine.pool))
+
+    def record_checkin(dbapi_connection, connection_record):
+        _record_pool(pool_readings(engine.pool, returning=True))
+
+    event.listen(sync_engine, "checkout", record_checkout)
+    event.listen(sync_engine, "checkin", record_checkin)
+
+
+# Pre-forked workers only (see instrument_engine): summed across live workers
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "SQLAlchemy connection pool occupancy.",
+    ["state"],
+    registry=None,
+    multiprocess_mode="livesum",
+)
+
+
+def pool_readings(pool, returning: bool = False) -> dict[str, int]:
+    """Pool occupancy; ``returning`` reads it as it will be once the connection being checked in is back."""
+    readings = {
+        "size": getattr(pool, "size", lambda: 0)(),
+        "checked_in": getattr(pool, "checkedin", lambda: 0)(),
+        "checked_out": getattr(pool, "checkedout", lambda: 0)(),
+        "overflow": getattr(pool, "overflow", lambda: 0)(),
+    }
+    if returning:
+        # The checkin event fires before the return; a full pool closes the connection instead
+        readings["checked_out"] -= 1
+        if readings["checked_in"] >= readings["size"]:
+            readings["overflow"] -= 1
+        else:
+            readings["checked_in"] += 1
+    return readings
+
+
+def _record_pool(readings: dict[str, int]) -> None:
+    for state, value in readings.items():
+        DB_POOL_CONNECTIONS.labels(state).set(value)
+
+
+class PoolCollector:
+    """Reads connection pool occupancy at scrape time instead of on every checkout."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+
+    def collect(self):
+        family = GaugeMetricFamily(
+            "db_pool_connections",
+            "SQLAlchemy connection pool occupancy.",
+            labels=["state"],
+        )
+        for state, value in pool_readings(self.engine.pool).items():
+            family.add_metric([state], value)
+        yield family
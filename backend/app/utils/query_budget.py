@@ -0,0 +1,59 @@
+"""Per-route SQL query budgets and lazy-load detection."""
+
+import logging
+import traceback
+from typing import Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from backend.app.utils.metrics import current_query_stats
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+BUDGET_ATTR = "__query_budget__"
+
+
+def query_budget(max_statements: int) -> Callable[[F], F]:
+    """
+    Declare how many SQL statements a route may execute per request.
+    Apply it *below* the router decorator so FastAPI registers the tagged function:
+
+        @router.get("/me")
+        @query_budget(1)
+        async def get_me(...): ...
+    """
+    def decorator(endpoint: F) -> F:
+        setattr(endpoint, BUDGET_ATTR, max_statements)
+        return endpoint
+    return decorator
+
+
+def get_query_budget(endpoint: Callable) -> int | None:
+    """Return the declared budget of a route endpoint, or None if it has none."""
+    return getattr(endpoint, BUDGET_ATTR, None)
+
+
+# ─── LAZY-LOAD WATCHER ────────────────────────────────────────────────────────
+
+def _warn_on_lazy_load(orm_execute_state: ORMExecuteState) -> None:
+    # lazy_loaded_from is only set for LazyLoader, not for selectin/joined eager loads.
+    if orm_execute_state.lazy_loaded_from is None:
+        return
+    # Outside a request (scripts, workers) lazy loads are not our concern here.
+    if current_query_stats.get() is None:
+        return
+    mapper = orm_execute_state.lazy_loaded_from.mapper
+    logger.warning(
+        "Lazy load fired on %s during a request (possible N+1):\n%s",
+        mapper.class_.__name__,
+        "".join(traceback.format_stack(limit=25)),
+    )
+
+
+def enable_lazy_load_warnings() -> None:
+    """Log a warning with a stack trace whenever a lazy load runs inside a request."""
+    if not event.contains(Session, "do_orm_execute", _warn_on_lazy_load):
+        event.listen(Session, "do_orm_execute", _warn_on_lazy_load)
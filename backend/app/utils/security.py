@@ -2,12 +2,15 @@
 
 import bcrypt
 
+from backend.app.utils.metrics import BCRYPT_DURATION
+
 
 def hash_password(plain: str) -> str:
     """Hash a plain-text password using bcrypt."""
     password_bytes = plain.encode('utf-8')
     salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    with BCRYPT_DURATION.labels("hash").time():
+        hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
@@ -15,4 +18,5 @@ def verify_password(plain: str, hashed: str) -> bool:
     """Verify a plain-text password against a bcrypt hash."""
     password_bytes = plain.encode('utf-8')
     hashed_bytes = hashed.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
\ No newline at end of file
+    with BCRYPT_DURATION.labels("verify").time():
+        return bcrypt.checkpw(password_bytes, hashed_bytes)
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""S3-compatible object storage helpers (AWS S3, MinIO, moto)."""
+
+from functools import lru_cache
+
+import boto3
+from botocore.config import Config
+
+from backend.app.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_s3_client():
+    """Build the boto3 client once per process — client creation costs tens of ms."""
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.S3_ENDPOINT_URL,
+        region_name=settings.S3_REGION,
+        aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        # MinIO and moto only support path-style addressing
+        config=Config(s3={"addressing_style": "path" if settings.S3_ENDPOINT_URL else "auto"}),
+    )
+
+
+def presign_upload(key: str, content_type: str, max_bytes: int, expires_in: int) -> dict:
+    """
+    Presigned POST the client uploads to directly. The policy pins the key and
+    content type and caps the size, so the API never sees the bytes.
+    Signing is local — no network round trip.
+    """
+    return get_s3_client().generate_presigned_post(
+        Bucket=settings.S3_BUCKET,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, max_bytes],
+        ],
+        ExpiresIn=expires_in,
+    )
+
+
+def public_url(key: str) -> str:
+    return f"{settings.S3_PUBLIC_URL.rstrip('/')}/{key}"
@@ -0,0 +1,31 @@
+"""
+Celery application for work that must not run inside a request.
+
+    celery -A backend.app.worker worker --beat --loglevel=info
+"""
+
+from celery import Celery
+
+from backend.app.config import settings
+
+celery_app = Celery(
+    "connectem",
+    broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
+    include=["backend.app.tasks.mail", "backend.app.tasks.avatars", "backend.app.tasks.trending",
+             "backend.app.tasks.facets", "backend.app.tasks.sync"],
+)
+
+celery_app.conf.update(
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_ignore_result=True,
+    beat_schedule={
+        # Safety net: the API also schedules a flush when the mail queue goes non-empty.
+        "flush-mail-queue": {"task": "mail.flush_queue", "schedule": 10.0},
+        "compact-trending": {"task": "trending.compact", "schedule": float(settings.TRENDING_COMPACT_SECONDS)},
+        "reconcile-facets": {"task": "facets.reconcile", "schedule": float(settings.FACET_RECONCILE_SECONDS)},
+        "purge-sync-tombstones": {"task": "sync.purge_tombstones", "schedule": 24 * 60 * 60.0},
+    },
+)
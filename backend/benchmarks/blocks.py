@@ -0,0 +1,122 @@
+"""
+Blocks — feed latency for a user with an empty block list against one with
+--blocks entries, on the SQL feed and on the feed index.
+
+    python -m backend.benchmarks.blocks --users 2000 --posts 20000 --blocks 1000 --requests 500
+
+Seeds a scratch database (DATABASE_URL must be disposable) and drives the app
+in-process. The blocking user blocks --city-share of the creators with posts in
+the busiest city, so their feed pages really do lose posts, then other users up
+to --blocks (a quarter of them muted rather than blocked). Each case runs warm
+(block set in the worker's local cache) and cold (local copy and Redis key
+dropped before every request, so every request loads the set from Postgres).
+Requests are sequential: this measures latency, not throughput.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import httpx
+from sqlalchemy import insert
+
+from backend.app.config import settings
+from backend.app.database import engine
+from backend.app.main import app
+from backend.app.models.block import UserBlock
+from backend.app.redis_client import close_redis, get_redis, init_redis
+from backend.app.services.block_service import block_service, blocks_key
+from backend.app.services.city_catalog import city_catalog
+from backend.app.utils.jwt import create_access_token
+from backend.benchmarks.run import percentile
+from backend.benchmarks.seed import SeedConfig, reset_schema, seed
+
+
+def summary(timings: list[float], shown: list[int]) -> dict:
+    timings.sort()
+    return {
+        "p50_ms": round(percentile(timings, 50) * 1000, 2),
+        "p95_ms": round(percentile(timings, 95) * 1000, 2),
+        "mean_ms": round(sum(timings) / len(timings) * 1000, 2),
+        "posts_per_page": round(sum(shown) / len(shown), 1),
+    }
+
+
+async def measure(client: httpx.AsyncClient, user_id, city: str, requests: int, pages: int, cold: bool) -> dict:
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    timings, shown = [], []
+    for i in range(requests):
+        if cold:
+            block_service.clear()
+            await get_redis().delete(blocks_key(user_id))
+        started = time.perf_counter()
+        response = await client.get("/api/v1/hangout/posts", headers=headers,
+                                    params={"city": city, "page": i % pages + 1, "limit": 20})
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+        shown.append(len(response.json()["data"]))
+    return summary(timings, shown)
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine.sync_engine.echo = False
+    settings.RATE_LIMIT_ENABLED = False
+    init_redis()
+    await reset_schema(engine)
+    data = await seed(engine, SeedConfig(users=args.users, posts=args.posts))
+    await city_catalog.load(engine)
+    city = max(data.cities, key=lambda c: len(data.posts_by_city[c]))
+
+    blocker, viewer = data.user_ids[0], data.user_ids[1]
+    creators = list(dict.fromkeys(data.post_creators[p] for p in data.posts_by_city[city]))
+    others = [u for u in data.user_ids if u not in set(creators)]
+    creators = creators[:int(len(creators) * args.city_share)]
+    targets = [u for u in creators + others if u not in (blocker, viewer)][:args.blocks]
+    async with engine.begin() as conn:
+        await conn.execute(insert(UserBlock), [
+            {"user_id": blocker, "target_id": target, "kind": "block" if i % 4 else "mute"}
+            for i, target in enumerate(targets)
+        ])
+    # Seeded ids repeat between runs; don't read a previous run's sets from Redis
+    await block_service.invalidate(blocker, viewer)
+
+    report = {
+        "config": {"users": args.users, "posts": args.posts, "city_posts": len(data.posts_by_city[city]),
+                   "blocks": len(targets), "blocked_city_creators": min(len(creators), len(targets)),
+                   "requests": args.requests},
+        "results": {},
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path, indexed in (("sql", False), ("index", True)):
+            settings.FEED_INDEX_ENABLED = indexed
+            for name, user_id in (("no_blocks", viewer), (f"{len(targets)}_blocks", blocker)):
+                for cache in ("warm", "cold"):
+                    # One untimed pass loads the city index and the block set
+                    await measure(client, user_id, city, args.pages, args.pages, False)
+                    result = await measure(client, user_id, city, args.requests, args.pages, cache == "cold")
+                    report["results"][f"{path}/{name}/{cache}"] = result
+    settings.FEED_INDEX_ENABLED = False
+
+    await close_redis()
+    await engine.dispose()
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Feed latency with and without a block list")
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--posts", type=int, default=20_000)
+    parser.add_argument("--blocks", type=int, default=1_000)
+    parser.add_argument("--city-share", type=float, default=0.1,
+                        help="share of the city's creators among the blocked")
+    parser.add_argument("--requests", type=int, default=500, help="timed requests per case")
+    parser.add_argument("--pages", type=int, default=5, help="feed pages cycled through")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
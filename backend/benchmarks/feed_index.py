@@ -0,0 +1,121 @@
+"""
+Feed index — memory per 10k posts, filtered-query latency against SQL, and a
+consistency check against Postgres.
+
+    python -m backend.benchmarks.feed_index --users 2000 --posts 20000 --queries 2000
+
+Seeds a scratch database (DATABASE_URL must be disposable), loads the busiest
+city into a FeedIndex, then answers the same random filter combinations (one to
+three activity types, an optional start window, optionally free seats only) from
+the index and from ``HangoutService.get_feed``. Exits 1 if the check finds drift
+or a page differs between the two.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from backend.app.database import AsyncSessionLocal, engine
+from backend.app.services.city_catalog import city_catalog
+from backend.app.services.feed_index import FeedIndex
+from backend.app.services.hangout_service import HangoutService
+from backend.benchmarks.run import percentile
+from backend.benchmarks.seed import ACTIVITY_TYPES, SeedConfig, reset_schema, seed
+
+
+def random_filters(rng: random.Random, now: datetime) -> dict:
+    filters = {"activity_types": rng.sample(ACTIVITY_TYPES, rng.randint(1, 3))}
+    if rng.random() < 0.5:
+        filters["starts_after"] = now + timedelta(hours=rng.randint(0, 72))
+        filters["starts_before"] = filters["starts_after"] + timedelta(hours=rng.choice([24, 72, 168]))
+    filters["has_free_seats"] = rng.random() < 0.5
+    return filters
+
+
+def summary(timings: list[float]) -> dict:
+    timings.sort()
+    return {
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "mean_ms": round(sum(timings) / len(timings) * 1000, 3),
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine.sync_engine.echo = False
+    await reset_schema(engine)
+    data = await seed(engine, SeedConfig(users=args.users, posts=args.posts))
+    await city_catalog.load(engine)
+    city = max(data.cities, key=lambda c: len(data.posts_by_city[c]))
+    city_id = city_catalog.resolve(city).id
+    index = FeedIndex()
+    service = HangoutService()
+
+    async with AsyncSessionLocal() as db:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        city_index = await index._load(db, city_id)
+        city_index.query(None, 0.0, None, False, 0, 1)  # compile
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        index.cities[city_id] = city_index
+        traced = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        posts = len(city_index.posts)
+        per_10k = 10_000 / posts if posts else 0.0
+
+        rng = random.Random(args.seed)
+        now = datetime.now(timezone.utc)
+        index_times, sql_times, mismatched_pages = [], [], 0
+        for _ in range(args.queries):
+            filters, page = random_filters(rng, now), rng.randint(1, 3)
+            started = time.perf_counter()
+            bodies = await index.query(db, None, city_id, filters, page, args.limit)
+            index_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            rows = await service.get_feed(db, city, filters, page, args.limit)
+            sql_times.append(time.perf_counter() - started)
+            # Posts sharing a start time may tie-break differently; compare as sets
+            if {json.loads(body)["id"] for body in bodies} != {str(post.id) for post in rows}:
+                mismatched_pages += 1
+
+        check = await index.check(db, city_id)
+    await engine.dispose()
+
+    report = {
+        "city": city,
+        "indexed_posts": posts,
+        "memory": {
+            "reported_bytes": city_index.nbytes(),
+            "traced_bytes": traced,
+            "reported_bytes_per_10k_posts": round(city_index.nbytes() * per_10k),
+            "traced_bytes_per_10k_posts": round(traced * per_10k),
+        },
+        "queries": args.queries,
+        "index": summary(index_times),
+        "sql": summary(sql_times),
+        "mismatched_pages": mismatched_pages,
+        "check": {key: value if not isinstance(value, list) else len(value) for key, value in check.items()},
+    }
+    print(json.dumps(report, indent=2))
+    drift = check["missing"] or check["extra"] or check["mismatched"]
+    return 1 if drift or mismatched_pages else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Feed index memory and latency benchmark")
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--posts", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,114 @@
+"""
+Outbox relay throughput — how fast committed events reach Redis streams.
+
+    python -m backend.benchmarks.outbox_relay --events 100000 --aggregates 5000 \\
+        --workers 1 2 4 --batch-size 500
+
+For each worker count the outbox is refilled server-side, the stream is cleared, and
+relays drain the table. The stream is then read back to check that every event
+arrived and that each aggregate's events are in id order.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from redis.asyncio import Redis
+from sqlalchemy import text
+
+from backend.app.config import settings
+from backend.app.database import engine
+from backend.app.cli.outbox_relay import OutboxRelay
+from backend.app.models.outbox import OutboxEvent
+from backend.app.services.outbox_service import POST_AGGREGATE, stream_for
+
+STREAM = stream_for(POST_AGGREGATE)
+
+FILL_OUTBOX = text("""
+    INSERT INTO outbox_events (aggregate_type, aggregate_id, event_type, payload)
+    SELECT :aggregate_type,
+           md5('bench-aggregate-' || (i % :aggregates))::uuid,
+           'post.updated',
+           jsonb_build_object('seq', i, 'changed', jsonb_build_array('title'))
+    FROM generate_series(1, :events) AS i
+""")
+
+
+async def fill(events: int, aggregates: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(OutboxEvent.__table__.create, checkfirst=True)
+        await conn.execute(text("TRUNCATE outbox_events"))
+        await conn.execute(FILL_OUTBOX, {"aggregate_type": POST_AGGREGATE, "aggregates": aggregates, "events": events})
+
+
+async def verify(redis: Redis, events: int) -> dict:
+    """Read the stream back; each aggregate's event ids must be strictly increasing."""
+    last_seen: dict[bytes, int] = {}
+    received = out_of_order = 0
+    start = "-"
+    while True:
+        entries = await redis.xrange(STREAM, min=start, count=10_000)
+        if not entries:
+            break
+        for entry_id, fields in entries:
+            event_id, aggregate = int(fields[b"id"]), fields[b"aggregate_id"]
+            if event_id <= last_seen.get(aggregate, 0):
+                out_of_order += 1
+            last_seen[aggregate] = event_id
+            received += 1
+        start = b"(" + entries[-1][0]
+    return {"received": received, "missing": events - received, "out_of_order": out_of_order}
+
+
+async def run(workers: int, args: argparse.Namespace, redis: Redis) -> dict:
+    await fill(args.events, args.aggregates)
+    await redis.delete(STREAM)
+    relays = [OutboxRelay(engine, redis, args.batch_size, stream_maxlen=args.events * 2) for _ in range(workers)]
+
+    async def drain(relay: OutboxRelay) -> None:
+        while await relay.relay_batch():
+            pass
+
+    started = time.perf_counter()
+    await asyncio.gather(*(drain(relay) for relay in relays))
+    elapsed = time.perf_counter() - started
+    published = sum(relay.published for relay in relays)
+    return {
+        "workers": workers,
+        "published": published,
+        "elapsed_s": round(elapsed, 3),
+        "events_per_s": round(published / elapsed, 1) if elapsed else 0.0,
+        **await verify(redis, args.events),
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine.sync_engine.echo = False
+    redis = Redis.from_url(settings.REDIS_URL)
+    results = []
+    try:
+        for workers in args.workers:
+            results.append(await run(workers, args, redis))
+    finally:
+        await redis.delete(STREAM)
+        await redis.aclose()
+        await engine.dispose()
+
+    print(json.dumps({"events": args.events, "aggregates": args.aggregates,
+                      "batch_size": args.batch_size, "runs": results}, indent=2))
+    return 1 if any(r["missing"] or r["out_of_order"] for r in results) else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Outbox relay throughput benchmark")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--aggregates", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,120 @@
+"""
+Hot-query overhead — Python-side cost per statement, ad-hoc ``select()`` versus
+the lambda statements in backend.app.queries, with and without asyncpg's
+prepared-statement cache.
+
+    python -m backend.benchmarks.query_overhead --iterations 5000
+
+"build" times only constructing a statement and computing its cache key: the
+work SQLAlchemy repeats before every execution, and what the registry removes.
+"execute" times the whole ``session.execute`` on one warm connection. It is run
+with the prepared-statement cache on and off, so the difference is the parse and
+plan cost asyncpg saves. Seeds a scratch database (DATABASE_URL must be
+disposable).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload
+
+from backend.app import queries
+from backend.app.config import settings
+from backend.app.database import engine
+from backend.app.models.hangout import HangoutPost
+from backend.app.models.user import RefreshToken, User
+from backend.app.services.city_catalog import city_catalog
+from backend.benchmarks.seed import SeedConfig, reset_schema, seed
+
+
+def legacy_statements(user_id, post_id, city_id, token_hash, now):
+    """The statements as they were built before the registry."""
+    return {
+        "get_current_user": lambda: select(User).where(User.id == user_id),
+        "refresh_token": lambda: select(RefreshToken).where(RefreshToken.token_hash == token_hash),
+        "get_post_by_id": lambda: select(HangoutPost).options(
+            joinedload(HangoutPost.creator), joinedload(HangoutPost.participants)
+        ).where(HangoutPost.id == post_id),
+        "get_feed": lambda: select(HangoutPost).where(
+            HangoutPost.city_id == city_id, HangoutPost.status == 'open', HangoutPost.scheduled_at >= now,
+            HangoutPost.activity_type.in_(["Sports", "Event"]),
+        ).order_by(HangoutPost.scheduled_at.asc()).offset(0).limit(20),
+    }
+
+
+def registry_statements(user_id, post_id, city_id, token_hash, now):
+    return {
+        "get_current_user": lambda: queries.user_by_id(user_id),
+        "refresh_token": lambda: queries.refresh_token_by_hash(token_hash),
+        "get_post_by_id": lambda: queries.post_detail(post_id),
+        "get_feed": lambda: queries.feed(city_id, "", {"activity_types": ["Sports", "Event"]}, now, 0, 20),
+    }
+
+
+def time_build(build, iterations: int) -> float:
+    """Microseconds to construct one statement and derive its cache key."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build()._generate_cache_key()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def time_execute(session: AsyncSession, build, iterations: int) -> float:
+    """Microseconds per execute + fetch, including the database round trip."""
+    (await session.execute(build())).unique().all()  # warm: compile and prepare once
+    started = time.perf_counter()
+    for _ in range(iterations):
+        (await session.execute(build())).unique().all()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine.sync_engine.echo = False
+    await reset_schema(engine)
+    data = await seed(engine, SeedConfig(users=200, posts=2000))
+    await city_catalog.load(engine)
+    await engine.dispose()
+
+    city = max(data.cities, key=lambda c: len(data.posts_by_city[c]))
+    params = (
+        data.user_ids[0], data.posts_by_city[city][0], city_catalog.resolve(city).id,
+        "0" * 64, datetime.now(timezone.utc),
+    )
+    variants = {"legacy": legacy_statements(*params), "registry": registry_statements(*params)}
+    report: dict = {"iterations": args.iterations, "build_us": {}, "execute_us": {}}
+
+    for variant, statements in variants.items():
+        report["build_us"][variant] = {
+            name: round(time_build(build, args.iterations), 2) for name, build in statements.items()
+        }
+
+    for cache_size in (0, settings.DB_PREPARED_STATEMENT_CACHE_SIZE):
+        bench_engine = create_async_engine(
+            settings.DATABASE_URL, pool_size=1, connect_args={"prepared_statement_cache_size": cache_size},
+        )
+        async with AsyncSession(bench_engine) as session:
+            for variant, statements in variants.items():
+                report["execute_us"][f"{variant}_prepared_cache_{cache_size}"] = {
+                    name: round(await time_execute(session, build, args.iterations), 1)
+                    for name, build in statements.items()
+                }
+        await bench_engine.dispose()
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Per-query Python overhead benchmark")
+    parser.add_argument("--iterations", type=int, default=5_000)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
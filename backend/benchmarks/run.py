@@ -0,0 +1,173 @@
+"""
+Benchmark runner — seeds a scratch Postgres and drives the ASGI app in-process.
+
+Usage (DATABASE_URL must point at a disposable database):
+
+    python -m backend.benchmarks.run --users 2000 --posts 5000 --concurrency 32 \\
+        --iterations 500 --output bench.json
+
+    # Fail (exit code 1) if p95 / throughput / queries-per-request regress vs a baseline
+    python -m backend.benchmarks.run --baseline bench.json --max-regression 0.10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import event
+
+from backend.app.config import settings
+from backend.app.database import engine
+from backend.app.main import app
+from backend.app.redis_client import close_redis, init_redis
+from backend.app.services.city_catalog import city_catalog
+from backend.benchmarks.scenarios import SCENARIOS, BenchContext
+from backend.benchmarks.seed import SeedConfig, reset_schema, seed
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+class StatementCounter:
+    """Counts statements engine-wide; scenarios run one at a time so the total is exact."""
+
+    def __init__(self):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+async def run_scenario(name: str, data, iterations: int, concurrency: int, seed_value: int, counter: StatementCounter) -> dict:
+    scenario = SCENARIOS[name]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        ctx = BenchContext(client=client, data=data)
+        remaining = iter(range(iterations))
+
+        async def worker(worker_id: int) -> None:
+            rng = random.Random(seed_value * 1_000 + worker_id)
+            for _ in remaining:
+                await scenario(ctx, rng)
+
+        statements_before = counter.count
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    calls = len(ctx.latencies)
+    latencies = sorted(ctx.latencies)
+    server_errors = sum(n for status, n in ctx.statuses.items() if status >= 500)
+    return {
+        "iterations": iterations,
+        "requests": calls,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(calls / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "queries_per_request": round((counter.count - statements_before) / calls, 2) if calls else 0.0,
+        "status_counts": {str(k): v for k, v in sorted(ctx.statuses.items())},
+        "errors": server_errors + ctx.transport_errors,
+    }
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Return a human-readable line for every metric that regressed beyond the threshold."""
+    failures = []
+    for name, current in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if before["p95_ms"] and current["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+            failures.append(f"{name}: p95 {before['p95_ms']}ms -> {current['p95_ms']}ms")
+        if before["throughput_rps"] and current["throughput_rps"] < before["throughput_rps"] * (1 - max_regression):
+            failures.append(f"{name}: throughput {before['throughput_rps']} -> {current['throughput_rps']} req/s")
+        if current["queries_per_request"] > before["queries_per_request"] + 0.01:
+            failures.append(
+                f"{name}: queries/request {before['queries_per_request']} -> {current['queries_per_request']}"
+            )
+    return failures
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> int:
+    # SQL echo would dominate the numbers, and every scenario is one client hammering the API.
+    engine.sync_engine.echo = False
+    settings.RATE_LIMIT_ENABLED = args.rate_limit
+    # The app's lifespan doesn't run under ASGITransport; routes still need Redis.
+    init_redis()
+
+    config = SeedConfig(
+        users=args.users, posts=args.posts,
+        requests_per_post=args.requests_per_post, seed=args.seed,
+    )
+    await reset_schema(engine)
+    data = await seed(engine, config)
+    await city_catalog.load(engine)
+
+    counter = StatementCounter()
+    names = args.scenarios or list(SCENARIOS)
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {**vars(config), "concurrency": args.concurrency, "iterations": args.iterations},
+        "scenarios": {},
+    }
+    for name in names:
+        report["scenarios"][name] = await run_scenario(
+            name, data, args.iterations, args.concurrency, args.seed, counter
+        )
+    await close_redis()
+    await engine.dispose()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(report, json.load(f), args.max_regression)
+        for line in failures:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ConnectEm API benchmark suite")
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--posts", type=int, default=5_000)
+    parser.add_argument("--requests-per-post", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=500, help="iterations per scenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="*", choices=list(SCENARIOS))
+    parser.add_argument("--rate-limit", action="store_true", help="keep per-client rate limiting on")
+    parser.add_argument("--output", help="write the JSON report here as well as stdout")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10, help="allowed fractional regression")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
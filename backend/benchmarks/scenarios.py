@@ -0,0 +1,115 @@
+"""
+Benchmark scenarios — each one drives the real ASGI app through a hot path.
+
+A scenario is an async function taking (BenchContext, random.Random) that issues
+one or more HTTP calls through ``ctx.call``, which times every call separately.
+"""
+
+import asyncio
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+from backend.app.utils.jwt import create_access_token
+from backend.benchmarks.seed import BENCH_PASSWORD, SeedResult
+
+API = "/api/v1"
+
+
+@dataclass
+class BenchContext:
+    client: httpx.AsyncClient
+    data: SeedResult
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    transport_errors: int = 0
+    _tokens: dict[uuid.UUID, str] = field(default_factory=dict)
+
+    def auth(self, user_id: uuid.UUID) -> dict[str, str]:
+        # Mint tokens directly: logging in through bcrypt is measured by login_storm only.
+        token = self._tokens.get(user_id)
+        if token is None:
+            token = self._tokens[user_id] = create_access_token({"sub": str(user_id)})
+        return {"Authorization": f"Bearer {token}"}
+
+    async def call(self, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.transport_errors += 1
+            return None
+        self.latencies.append(time.perf_counter() - started)
+        self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+        return response
+
+
+async def login_storm(ctx: BenchContext, rng: random.Random) -> None:
+    email = rng.choice(ctx.data.user_emails)
+    await ctx.call("POST", f"{API}/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+
+
+async def feed_scroll(ctx: BenchContext, rng: random.Random) -> None:
+    """One user scrolls the first few pages of their city's feed."""
+    user_id = rng.choice(ctx.data.user_ids)
+    city = rng.choice(ctx.data.cities)
+    for page in range(1, 4):
+        await ctx.call(
+            "GET", f"{API}/hangout/posts",
+            params={"city": city, "page": page, "limit": 20},
+            headers=ctx.auth(user_id),
+        )
+
+
+async def post_detail(ctx: BenchContext, rng: random.Random) -> None:
+    city = rng.choice(ctx.data.cities)
+    post_id = rng.choice(ctx.data.posts_by_city[city])
+    await ctx.call("GET", f"{API}/hangout/posts/{post_id}", headers=ctx.auth(rng.choice(ctx.data.user_ids)))
+
+
+async def shared_link(ctx: BenchContext, rng: random.Random) -> None:
+    """Everyone opens the same post at once, as when its link is shared in a group chat."""
+    city = ctx.data.cities[0]
+    post_id = ctx.data.posts_by_city[city][0]
+    await ctx.call("GET", f"{API}/hangout/posts/{post_id}", headers=ctx.auth(rng.choice(ctx.data.user_ids)))
+
+
+async def request_accept_race(ctx: BenchContext, rng: random.Random) -> None:
+    """Several users request the same post at once, then the host accepts them all at once."""
+    city = rng.choice(ctx.data.cities)
+    post_id = rng.choice(ctx.data.posts_by_city[city])
+    host_id = ctx.data.post_creators[post_id]
+    requesters = rng.sample(ctx.data.user_ids, 5)
+
+    responses = await asyncio.gather(*[
+        ctx.call("POST", f"{API}/hangout/posts/{post_id}/request", json={}, headers=ctx.auth(user_id))
+        for user_id in requesters if user_id != host_id
+    ])
+    request_ids = [r.json()["data"]["id"] for r in responses if r is not None and r.status_code == 201]
+    await asyncio.gather(*[
+        ctx.call("PATCH", f"{API}/hangout/requests/{request_id}", json={"action": "accept"}, headers=ctx.auth(host_id))
+        for request_id in request_ids
+    ])
+
+
+async def profile_update(ctx: BenchContext, rng: random.Random) -> None:
+    user_id = rng.choice(ctx.data.user_ids)
+    await ctx.call(
+        "PATCH", f"{API}/auth/me",
+        json={"bio": f"bench bio {rng.getrandbits(32)}"},
+        headers=ctx.auth(user_id),
+    )
+
+
+SCENARIOS: dict[str, Callable[[BenchContext, random.Random], Awaitable[None]]] = {
+    "login_storm": login_storm,
+    "feed_scroll": feed_scroll,
+    "post_detail": post_detail,
+    "shared_link": shared_link,
+    "request_accept_race": request_accept_race,
+    "profile_update": profile_update,
+}
@@ -0,0 +1,162 @@
+"""
+Deterministic seeding of a scratch Postgres database for the benchmark suite.
+
+Rows are written with Core executemany batches (not one ORM object at a time),
+and every user shares a single pre-computed bcrypt hash so seeding is not CPU-bound.
+"""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.app.database import Base
+from backend.app.models.city import City
+from backend.app.models.hangout import HangoutParticipant, HangoutPost, HangoutRequest
+from backend.app.models.user import User
+from backend.app.services.city_catalog import BACKFILL_CITY_IDS_SQL, normalize_city
+from backend.app.utils.security import hash_password
+
+BENCH_PASSWORD = "bench-password-123"
+BATCH_SIZE = 1000
+
+# Rough population weights so a few cities dominate, like real traffic.
+CITIES = {
+    "Mumbai": 0.22, "Delhi": 0.20, "Bengaluru": 0.16, "Hyderabad": 0.10,
+    "Chennai": 0.09, "Pune": 0.08, "Kolkata": 0.07, "Ahmedabad": 0.04,
+    "Jaipur": 0.02, "Goa": 0.02,
+}
+ACTIVITY_TYPES = [
+    "Dining_NightLife", "Entertainment", "Sports", "Arcade_Adventure",
+    "Casual_WentOut", "Event", "Dating",
+]
+
+
+@dataclass
+class SeedConfig:
+    users: int = 2_000
+    posts: int = 5_000
+    requests_per_post: int = 3
+    accept_ratio: float = 0.4
+    seed: int = 42
+
+
+@dataclass
+class SeedResult:
+    """What the scenarios need to know about the seeded data."""
+    user_ids: list[uuid.UUID] = field(default_factory=list)
+    user_emails: list[str] = field(default_factory=list)
+    posts_by_city: dict[str, list[uuid.UUID]] = field(default_factory=dict)
+    post_creators: dict[uuid.UUID, uuid.UUID] = field(default_factory=dict)
+
+    @property
+    def cities(self) -> list[str]:
+        return list(self.posts_by_city)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+async def _insert_batches(conn, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        await conn.execute(insert(table), rows[start:start + BATCH_SIZE])
+
+
+async def reset_schema(engine: AsyncEngine) -> None:
+    """Drop and recreate every table. Only ever point this at a scratch database."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def seed(engine: AsyncEngine, config: SeedConfig) -> SeedResult:
+    rng = random.Random(config.seed)
+    now = datetime.now(timezone.utc)
+    password_hash = hash_password(BENCH_PASSWORD)
+    city_names, city_weights = list(CITIES), list(CITIES.values())
+    result = SeedResult()
+
+    users, user_city = [], {}
+    for i in range(config.users):
+        user_id = _uuid(rng)
+        city = rng.choices(city_names, city_weights)[0]
+        email = f"bench_user_{i}@example.com"
+        users.append({
+            "id": user_id,
+            "username": f"bench_user_{i}",
+            "email": email,
+            "password_hash": password_hash,
+            "full_name": f"Bench User {i}",
+            "city": city,
+            "interests": rng.sample(ACTIVITY_TYPES, 2),
+            "is_active": True,
+            "is_verified": True,
+            "created_at": now - timedelta(days=rng.randint(0, 365)),
+            "updated_at": now,
+        })
+        user_city[user_id] = city
+        result.user_ids.append(user_id)
+        result.user_emails.append(email)
+
+    posts, participants, requests = [], [], []
+    for _ in range(config.posts):
+        post_id = _uuid(rng)
+        creator_id = rng.choice(result.user_ids)
+        city = user_city[creator_id]
+        max_participants = rng.randint(2, 10)
+        activity_type = rng.choice(ACTIVITY_TYPES)
+        # Most posts are in the next two weeks, with a long tail.
+        scheduled_at = now + timedelta(hours=rng.expovariate(1 / 96) + 1)
+        posts.append({
+            "id": post_id,
+            "creator_id": creator_id,
+            "title": f"Bench hangout {post_id.hex[:8]}",
+            "activity_type": activity_type,
+            "city": city,
+            "scheduled_at": scheduled_at,
+            "ends_at": scheduled_at + timedelta(hours=2),
+            "max_participants": max_participants,
+            "status": "open",
+            "is_public": True,
+        })
+        participants.append({"id": _uuid(rng), "post_id": post_id, "user_id": creator_id, "role": "host"})
+        result.posts_by_city.setdefault(city, []).append(post_id)
+        result.post_creators[post_id] = creator_id
+
+        seats_left = max_participants - 1
+        requesters = {rng.choice(result.user_ids) for _ in range(config.requests_per_post)}
+        requesters.discard(creator_id)
+        for requester_id in requesters:
+            accepted = seats_left > 0 and rng.random() < config.accept_ratio
+            requests.append({
+                "id": _uuid(rng),
+                "post_id": post_id,
+                "requester_id": requester_id,
+                "status": "accepted" if accepted else "pending",
+                "responded_at": now if accepted else None,
+            })
+            if accepted:
+                seats_left -= 1
+                participants.append({
+                    "id": _uuid(rng), "post_id": post_id,
+                    "user_id": requester_id, "role": "participant",
+                })
+
+    cities = [
+        {"name": name, "key": normalize_city(name), "population": round(weight * 100_000_000)}
+        for name, weight in CITIES.items()
+    ]
+    async with engine.begin() as conn:
+        await _insert_batches(conn, City.__table__, cities)
+        await _insert_batches(conn, User.__table__, users)
+        await _insert_batches(conn, HangoutPost.__table__, posts)
+        await _insert_batches(conn, HangoutParticipant.__table__, participants)
+        await _insert_batches(conn, HangoutRequest.__table__, requests)
+        for statement in BACKFILL_CITY_IDS_SQL:
+            await conn.execute(text(statement))
+
+    return result
@@ -0,0 +1,143 @@
+"""
+Launcher throughput — requests per second through ``python -m backend.app.serve``
+with 1, 2 and N workers (N = one per usable CPU).
+
+    python -m backend.benchmarks.serve --workers 1 2 0 --duration 10 --concurrency 64
+
+Each run starts the launcher on a free port, drives it from ``--clients`` load
+processes (so the client is not the bottleneck), then stops it with SIGTERM.
+Scenarios:
+
+- health: no I/O, the per-request floor
+- autocomplete: in-memory city lookup plus JSON
+- login: one bcrypt verify per request, which is CPU-bound and on the event loop
+
+Seeds nothing beyond one login user; point DATABASE_URL at a scratch database.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from backend.app.serve import usable_cpus
+from backend.benchmarks.run import percentile
+
+EMAIL, PASSWORD = "bench_serve@example.com", "bench-password-1"
+
+SCENARIOS = {
+    "health": ("GET", "/api/v1/health", None),
+    "autocomplete": ("GET", "/api/v1/cities/autocomplete?q=ma", None),
+    "login": ("POST", "/api/v1/auth/login", {"email": EMAIL, "password": PASSWORD}),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, DB_ECHO="false", RATE_LIMIT_ENABLED="false", SERVE_MAX_REQUESTS="0")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "backend.app.serve", "--workers", str(workers), "--port", str(port),
+         "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/v1/health").status_code == 200:
+                # Every worker must be up, not just the first to answer
+                time.sleep(2)
+                return proc
+        except httpx.TransportError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("launcher did not start")
+
+
+async def drive(base_url: str, scenario: str, duration: float, concurrency: int) -> tuple[list[float], int]:
+    method, path, body = SCENARIOS[scenario]
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.TransportError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def client_process(args: tuple) -> tuple[list[float], int]:
+    return asyncio.run(drive(*args))
+
+
+def run(workers: int, args: argparse.Namespace) -> dict:
+    port = free_port()
+    proc = start_server(workers, port)
+    base_url = f"http://127.0.0.1:{port}"
+    results = {}
+    try:
+        httpx.post(f"{base_url}/api/v1/auth/register",
+                   json={"email": EMAIL, "username": "bench_serve", "password": PASSWORD}, timeout=30)
+        per_client = max(1, args.concurrency // args.clients)
+        with multiprocessing.get_context("spawn").Pool(args.clients) as pool:
+            for scenario in args.scenarios:
+                jobs = [(base_url, scenario, args.duration, per_client)] * args.clients
+                outcomes = pool.map(client_process, jobs)
+                latencies = sorted(lat for lats, _ in outcomes for lat in lats)
+                results[scenario] = {
+                    "requests": len(latencies),
+                    "errors": sum(errors for _, errors in outcomes),
+                    "rps": round(len(latencies) / args.duration, 1),
+                    "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                    "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                }
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=120)
+    return {"workers": workers, **results}
+
+
+def main(args: argparse.Namespace) -> int:
+    cpus = usable_cpus()
+    runs = [run(workers or cpus, args) for workers in dict.fromkeys(args.workers)]
+    print(json.dumps({"cpus": cpus, "duration_s": args.duration, "concurrency": args.concurrency,
+                      "clients": args.clients, "runs": runs}, indent=2))
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Launcher throughput by worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 0], help="0 = one per CPU")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=2, help="load-generating processes")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -0,0 +1,76 @@
+"""
+Suggestion batch — runtime and peak memory of ``backend.app.cli.suggestions``
+by data size and worker count.
+
+    python -m backend.benchmarks.suggestions --users 5000 20000 --workers 1 4
+
+For each size the schema is reset and seeded (DATABASE_URL must be disposable).
+The seed's two activity types per user make poor interests, so every user gets
+3-8 interests drawn with Zipf-like weights from a vocabulary of --vocabulary
+words: a few are very common and most are rare, as with real interests. Every
+pair of co-participants reviews each other with probability --review-ratio,
+rated 2 to 5.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+
+from sqlalchemy import text
+
+from backend.app.cli import suggestions
+from backend.app.config import settings
+from backend.app.database import engine
+from backend.benchmarks.seed import SeedConfig, reset_schema, seed
+
+REVIEWS_SQL = """
+    INSERT INTO reviews (id, hangout_id, reviewer_id, reviewee_id, rating)
+    SELECT gen_random_uuid(), a.post_id, a.user_id, b.user_id, 2 + floor(random() * 4)::int
+    FROM hangout_participants a
+    JOIN hangout_participants b ON b.post_id = a.post_id AND b.user_id <> a.user_id
+    WHERE random() < :ratio
+"""
+
+
+async def prepare(users: int, vocabulary: int, review_ratio: float) -> None:
+    engine.sync_engine.echo = False
+    await reset_schema(engine)
+    data = await seed(engine, SeedConfig(users=users, posts=users * 2))
+    rng = random.Random(7)
+    words = [f"interest_{i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("UPDATE users SET interests = :interests WHERE id = :id"),
+            [{"id": user_id, "interests": list(set(rng.choices(words, weights, k=rng.randint(3, 8))))}
+             for user_id in data.user_ids],
+        )
+        await conn.execute(text(REVIEWS_SQL), {"ratio": review_ratio})
+    await engine.dispose()
+
+
+async def main(args: argparse.Namespace) -> int:
+    runs = []
+    for users in args.users:
+        await prepare(users, args.vocabulary, args.review_ratio)
+        for workers in args.workers:
+            job_args = suggestions.parse_args(["--workers", str(workers)])
+            runs.append(await suggestions.main(job_args))
+    print(json.dumps({"top_k": settings.SUGGESTIONS_TOP_K, "chunk_size": settings.SUGGESTIONS_CHUNK_SIZE,
+                      "runs": runs}, indent=2))
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Suggestion batch runtime and memory")
+    parser.add_argument("--users", type=int, nargs="+", default=[5_000, 20_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--vocabulary", type=int, default=300)
+    parser.add_argument("--review-ratio", type=float, default=0.3)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
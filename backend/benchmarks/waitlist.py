@@ -0,0 +1,200 @@
+"""
+Waitlist stress — concurrent leaves, joins, accepts and cancellations on a few
+full posts, timed per operation.
+
+    python -m backend.benchmarks.waitlist --posts 4 --seats 5 --users 400 --concurrency 32 --operations 3000
+
+Seeds users only (DATABASE_URL must be disposable), inserts --posts posts days
+apart so nobody's hangouts overlap, and fills their seats through the API. Then
+--concurrency clients drive the app in-process at random: request to join
+(pending, or waitlisted when full), leave (the oldest waitlisted requester
+should take the seat in the same transaction), the host accepting a pending
+request, and withdrawing a request. 4xx answers are expected (already
+requested, not a participant any more, post full), and so is 503 when clients
+wait too long for a pooled connection and admission control sheds them; any other 5xx,
+a deadlock say, is a failure and the run exits 1.
+
+The waitlist invariants themselves (capacity, closed exactly when full, FIFO
+promotion and the rest) are asserted by backend/tests/test_waitlist.py.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import insert, text
+
+from backend.app.config import settings
+from backend.app.database import engine
+from backend.app.main import app
+from backend.app.models.hangout import HangoutParticipant, HangoutPost
+from backend.app.redis_client import close_redis, init_redis
+from backend.app.services.city_catalog import BACKFILL_CITY_IDS_SQL, city_catalog
+from backend.app.utils.jwt import create_access_token
+from backend.benchmarks.run import percentile
+from backend.benchmarks.seed import SeedConfig, reset_schema, seed
+
+API = "/api/v1/hangout"
+
+class Stress:
+
+    def __init__(self, client: httpx.AsyncClient, users: list, hosts: dict):
+        self.client = client
+        self.users = users
+        self.hosts = hosts  # post id -> host id
+        self.requests: list[tuple[str, object]] = []  # (request id, requester)
+        self.latencies: dict[str, list[float]] = {}
+        self.statuses: dict[str, dict[int, int]] = {}
+
+    def auth(self, user_id) -> dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+    async def call(self, op: str, method: str, url: str, user_id, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.client.request(method, url, headers=self.auth(user_id), **kwargs)
+        self.latencies.setdefault(op, []).append(time.perf_counter() - started)
+        counts = self.statuses.setdefault(op, {})
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+        return response
+
+    async def join(self, rng: random.Random, post_id: str) -> None:
+        user_id = rng.choice(self.users)
+        response = await self.call("join", "POST", f"{API}/posts/{post_id}/request", user_id, json={})
+        if response.status_code == 201:
+            self.requests.append((response.json()["data"]["id"], user_id))
+
+    async def leave(self, rng: random.Random, post_id: str) -> None:
+        detail = await self.call("detail", "GET", f"{API}/posts/{post_id}", self.hosts[post_id])
+        if detail.status_code != 200:
+            return
+        members = [p["user_id"] for p in detail.json()["data"]["participants"] if p["role"] == "participant"]
+        if members:
+            await self.call("leave", "POST", f"{API}/posts/{post_id}/leave", rng.choice(members))
+
+    async def accept(self, rng: random.Random, post_id: str) -> None:
+        host = self.hosts[post_id]
+        listing = await self.call("list", "GET", f"{API}/posts/{post_id}/requests", host)
+        if listing.status_code != 200:
+            return
+        pending = [r["id"] for r in listing.json()["data"] if r["status"] == "pending"]
+        if pending:
+            await self.call("accept", "PATCH", f"{API}/requests/{rng.choice(pending)}", host,
+                            json={"action": "accept"})
+
+    async def cancel(self, rng: random.Random, post_id: str) -> None:
+        if self.requests:
+            request_id, user_id = self.requests.pop(rng.randrange(len(self.requests)))
+            await self.call("cancel", "DELETE", f"{API}/requests/{request_id}", user_id)
+
+
+async def setup(client: httpx.AsyncClient, args: argparse.Namespace, user_ids: list) -> dict:
+    """Insert the posts and fill every seat through the API; returns post id -> host id."""
+    start = datetime.now(timezone.utc) + timedelta(days=30)
+    hosts = {uuid.uuid4(): host for host in user_ids[:args.posts]}
+    async with engine.begin() as conn:
+        await conn.execute(insert(HangoutPost), [
+            {"id": post_id, "creator_id": host, "title": f"Stress {i}", "activity_type": "Sports",
+             "city": "Mumbai", "scheduled_at": start + timedelta(days=2 * i),
+             "ends_at": start + timedelta(days=2 * i, hours=2), "max_participants": args.seats,
+             "status": "open", "is_public": True}
+            for i, (post_id, host) in enumerate(hosts.items())
+        ])
+        await conn.execute(insert(HangoutParticipant), [
+            {"post_id": post_id, "user_id": host, "role": "host"} for post_id, host in hosts.items()
+        ])
+        for statement in BACKFILL_CITY_IDS_SQL:
+            await conn.execute(text(statement))
+
+    members = iter(user_ids[args.posts:])
+    for post_id, host in hosts.items():
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(host)})}"}
+        for _ in range(args.seats - 1):
+            member = next(members)
+            member_headers = {"Authorization": f"Bearer {create_access_token({'sub': str(member)})}"}
+            request = await client.post(f"{API}/posts/{post_id}/request", json={}, headers=member_headers)
+            request.raise_for_status()
+            accepted = await client.patch(f"{API}/requests/{request.json()['data']['id']}",
+                                          json={"action": "accept"}, headers=headers)
+            accepted.raise_for_status()
+    return {str(post_id): host for post_id, host in hosts.items()}
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine.sync_engine.echo = False
+    settings.RATE_LIMIT_ENABLED = False
+    init_redis()
+    await reset_schema(engine)
+    data = await seed(engine, SeedConfig(users=args.users, posts=0, seed=args.seed))
+    await city_catalog.load(engine)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        hosts = await setup(client, args, data.user_ids)
+        candidates = [u for u in data.user_ids if u not in set(hosts.values())]
+        stress = Stress(client, candidates, hosts)
+        ops = [(stress.join, 0.35), (stress.leave, 0.3), (stress.accept, 0.2), (stress.cancel, 0.15)]
+        remaining = iter(range(args.operations))
+
+        async def worker(worker_id: int) -> None:
+            rng = random.Random(args.seed * 1_000 + worker_id)
+            for _ in remaining:
+                op = rng.choices([op for op, _ in ops], [weight for _, weight in ops])[0]
+                await op(rng, rng.choice(list(hosts)))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    async with engine.connect() as conn:
+        promoted = (await conn.execute(
+            text("SELECT count(*) FROM outbox_events WHERE event_type = 'request.promoted'")
+        )).scalar()
+        waiting = (await conn.execute(
+            text("SELECT count(*) FROM hangout_requests WHERE status = 'waitlisted'")
+        )).scalar()
+    await close_redis()
+    await engine.dispose()
+
+    # 503 is admission control shedding load, not a failed transaction
+    server_errors = sum(n for counts in stress.statuses.values()
+                        for status, n in counts.items() if status >= 500 and status != 503)
+    report = {
+        "config": {"posts": args.posts, "seats": args.seats, "users": args.users,
+                   "concurrency": args.concurrency, "operations": args.operations},
+        "elapsed_s": round(elapsed, 2),
+        "promoted": promoted,
+        "still_waitlisted": waiting,
+        "ops": {
+            op: {
+                "calls": len(timings),
+                "p50_ms": round(percentile(sorted(timings), 50) * 1000, 2),
+                "p95_ms": round(percentile(sorted(timings), 95) * 1000, 2),
+                "statuses": {str(k): v for k, v in sorted(stress.statuses[op].items())},
+            }
+            for op, timings in stress.latencies.items()
+        },
+        "server_errors": server_errors,
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if server_errors else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Concurrent leave/join stress test for waitlists")
+    parser.add_argument("--posts", type=int, default=4)
+    parser.add_argument("--seats", type=int, default=5)
+    parser.add_argument("--users", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--operations", type=int, default=3_000)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,35 @@
+"""
+Admission control holds a slot only while a connection is checked out: with the
+pool exhausted, routes that never touch the DB still answer, and routes that do
+are shed with 503 after ADMISSION_MAX_WAIT_MS.
+"""
+
+import uuid
+
+import pytest
+
+from backend.app.config import settings
+from backend.app.database import engine
+from conftest import auth_headers
+
+
+@pytest.mark.asyncio
+async def test_exhausted_pool_sheds_only_db_routes(api, monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_MAX_WAIT_MS", 50)
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    held = [await engine.connect() for _ in range(capacity)]
+    try:
+        autocomplete = await api.get("/api/v1/cities/autocomplete", params={"q": "Mum"})
+        assert autocomplete.status_code == 200, autocomplete.text
+
+        me = await api.get("/api/v1/auth/me", headers=auth_headers(uuid.uuid4()))
+        assert me.status_code == 503
+        assert me.headers["retry-after"] == "1"
+    finally:
+        for conn in held:
+            await conn.close()
+
+    # Closing the connections freed their slots: the lookup reaches the DB again
+    me = await api.get("/api/v1/auth/me", headers=auth_headers(uuid.uuid4()))
+    assert me.status_code == 401
+    assert not engine.sync_engine.pool.slots.locked()
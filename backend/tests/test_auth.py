@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.database import engine
+from backend.app.services import auth_service
+
+
+@pytest.mark.parametrize("registered", [True, False], ids=["registered", "unknown"])
+def test_forgot_password_pads_without_holding_a_connection(registered, budget_client, make_user, monkeypatch):
+    if registered:
+        _, headers = make_user()
+        email = budget_client.get("/api/v1/auth/me", headers=headers).json()["data"]["email"]
+    else:
+        email = "nobody@example.com"
+    held = []
+
+    async def sleep(seconds):
+        held.append(engine.sync_engine.pool.checkedout())
+
+    monkeypatch.setattr(auth_service, "asyncio", SimpleNamespace(sleep=sleep))
+    response = budget_client.post("/api/v1/auth/forgot-password", json={"email": email})
+    assert response.status_code == 202
+    assert held == [0]
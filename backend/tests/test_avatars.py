@@ -0,0 +1,72 @@
+"""
+process_avatar end to end against moto's S3: the upload becomes one WebP per
+AVATAR_SIZES, avatar_url points at the primary one, the upload is deleted, and
+the creator's cached post details are dropped so they show the new avatar.
+"""
+
+import io
+
+import fakeredis.aioredis
+import pytest
+from moto import mock_aws
+from PIL import Image
+
+from backend.app.config import settings
+from backend.app.services.post_cache import detail_key
+from backend.app.tasks import avatars
+from backend.app.utils.storage import get_s3_client
+from conftest import FAKE_REDIS, post_body
+
+BUCKET = "connectem-test-media"
+
+
+class FakeRedisFactory:
+    """Stands in for redis.asyncio.Redis in the task: clients on the test's FAKE_REDIS."""
+
+    @staticmethod
+    def from_url(url: str, **kwargs):
+        return fakeredis.aioredis.FakeRedis(server=FAKE_REDIS)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setattr(settings, "S3_ENDPOINT_URL", None)
+    monkeypatch.setattr(settings, "S3_BUCKET", BUCKET)
+    with mock_aws():
+        get_s3_client.cache_clear()
+        client = get_s3_client()
+        client.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": settings.S3_REGION})
+        yield client
+    get_s3_client.cache_clear()
+
+
+def test_process_avatar_publishes_thumbnails_and_refreshes_post_details(
+        budget_client, make_user, fake_redis, s3, monkeypatch):
+    monkeypatch.setattr(avatars, "Redis", FakeRedisFactory)
+    user_id, headers = make_user()
+    created = budget_client.post("/api/v1/hangout/posts", json=post_body(), headers=headers)
+    post_id = created.json()["data"]["id"]
+    detail = budget_client.get(f"/api/v1/hangout/posts/{post_id}", headers=headers)
+    assert detail.json()["data"]["creator"]["avatar_url"] is None
+    assert fake_redis.exists(detail_key(post_id))
+
+    upload = io.BytesIO()
+    Image.new("RGB", (800, 600), "teal").save(upload, "JPEG")
+    upload_key = f"uploads/avatars/{user_id}/original"
+    s3.put_object(Bucket=BUCKET, Key=upload_key, Body=upload.getvalue())
+
+    url = avatars.process_avatar(str(user_id), upload_key)
+
+    version = url.rsplit("/", 1)[1].split("_")[0]
+    assert url == f"{settings.S3_PUBLIC_URL}/{avatars.avatar_key(str(user_id), version, avatars.PRIMARY_SIZE)}"
+    stored = {item["Key"] for item in s3.list_objects_v2(Bucket=BUCKET)["Contents"]}
+    assert stored == {avatars.avatar_key(str(user_id), version, size) for size in settings.AVATAR_SIZES}
+    for size in settings.AVATAR_SIZES:
+        body = s3.get_object(Bucket=BUCKET, Key=avatars.avatar_key(str(user_id), version, size))["Body"].read()
+        with Image.open(io.BytesIO(body)) as thumbnail:
+            assert (thumbnail.format, thumbnail.size) == ("WEBP", (size, size))
+
+    assert not fake_redis.exists(detail_key(post_id))
+    assert budget_client.get("/api/v1/auth/me", headers=headers).json()["data"]["avatar_url"] == url
+    detail = budget_client.get(f"/api/v1/hangout/posts/{post_id}", headers=headers)
+    assert detail.json()["data"]["creator"]["avatar_url"] == url
@@ -0,0 +1,45 @@
+"""
+Chat sockets close with 1008 once the user is no longer allowed in the room:
+straight away when they leave the hangout, and when their access token expires.
+"""
+
+import uuid
+from datetime import timedelta
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from backend.app.utils.jwt import create_access_token
+from conftest import post_body
+
+HANGOUT = "/api/v1/hangout"
+
+
+def joined_post(client, make_user) -> tuple[str, uuid.UUID, dict]:
+    """A post the returned member has a seat in; (post id, member id, member headers)."""
+    _, host = make_user()
+    member_id, member = make_user()
+    post_id = client.post(f"{HANGOUT}/posts", json=post_body(), headers=host).json()["data"]["id"]
+    request = client.post(f"{HANGOUT}/posts/{post_id}/request", json={}, headers=member).json()["data"]
+    accepted = client.patch(f"{HANGOUT}/requests/{request['id']}", json={"action": "accept"}, headers=host)
+    assert accepted.status_code == 200, accepted.text
+    return post_id, member_id, member
+
+
+def test_leaving_closes_the_socket(budget_client, make_user):
+    post_id, member_id, member = joined_post(budget_client, make_user)
+    token = create_access_token({"sub": str(member_id)})
+    with budget_client.websocket_connect(f"{HANGOUT}/posts/{post_id}/chat/ws?token={token}") as ws:
+        assert budget_client.post(f"{HANGOUT}/posts/{post_id}/leave", headers=member).status_code == 200
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_text()
+    assert closed.value.code == 1008
+
+
+def test_expired_token_closes_the_socket(budget_client, make_user):
+    post_id, member_id, _ = joined_post(budget_client, make_user)
+    token = create_access_token({"sub": str(member_id)}, expires_delta=timedelta(seconds=1))
+    with budget_client.websocket_connect(f"{HANGOUT}/posts/{post_id}/chat/ws?token={token}") as ws:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_text()
+    assert closed.value.code == 1008
@@ -0,0 +1,104 @@
+"""
+CityCatalog resolves free text by its normalized name or an alias (case,
+accents, punctuation and spacing aside), completes prefixes across names and
+aliases most populous first, and the backfill attaches ids to rows written
+before their city was known.
+"""
+
+import uuid
+from collections import namedtuple
+
+import pytest
+from sqlalchemy import select, text, update
+
+from backend.app.database import engine
+from backend.app.models.hangout import HangoutPost
+from backend.app.models.user import User
+from backend.app.services.city_catalog import BACKFILL_CITY_IDS_SQL, CityCatalog
+from conftest import auth_headers, post_body
+
+Row = namedtuple("Row", "id name aliases population")
+
+CITIES = [
+    Row(1, "Mumbai", ["bombay", "navi mumbai"], 20_400_000),
+    Row(2, "São Paulo", ["sampa"], 12_300_000),
+    Row(3, "Bengaluru", ["bangalore", "blr"], 12_300_000),
+    Row(4, "Varanasi", ["benares", "banaras"], 1_200_000),
+    Row(5, "Puducherry", ["pondicherry", "pondy"], 700_000),
+]
+
+
+@pytest.fixture
+def catalog() -> CityCatalog:
+    catalog = CityCatalog()
+    catalog.replace(CITIES)
+    return catalog
+
+
+@pytest.mark.parametrize("raw, name", [
+    ("Mumbai", "Mumbai"),
+    ("  mumbai ", "Mumbai"),
+    ("BOMBAY", "Mumbai"),
+    ("Navi-Mumbai.", "Mumbai"),
+    ("são paulo", "São Paulo"),
+    ("SAO  PAULO", "São Paulo"),
+    ("Sampa", "São Paulo"),
+])
+def test_resolve_by_name_or_alias(catalog, raw, name):
+    assert catalog.resolve(raw).name == name
+    assert catalog.canonical(raw) == (name, catalog.resolve(raw).id)
+
+
+def test_unknown_city_keeps_its_text(catalog):
+    assert catalog.resolve("Atlantis") is None
+    assert catalog.canonical("  Lost   City ") == ("Lost City", None)
+    assert catalog.complete("atl") == []
+
+
+@pytest.mark.parametrize("prefix, names", [
+    ("b", ["Mumbai", "Bengaluru", "Varanasi"]),  # bombay, bangalore / blr, banaras / benares
+    ("BAN", ["Bengaluru", "Varanasi"]),
+    ("pon", ["Puducherry"]),  # two aliases, one suggestion
+    ("Sã", ["São Paulo"]),
+    ("mumbai", ["Mumbai"]),
+    ("  ", []),
+])
+def test_complete_prefixes_most_populous_first(catalog, prefix, names):
+    assert [entry.name for entry in catalog.complete(prefix)] == names
+
+
+def test_complete_respects_the_limit(catalog):
+    assert [entry.name for entry in catalog.complete("b", limit=2)] == ["Mumbai", "Bengaluru"]
+
+
+@pytest.mark.asyncio
+async def test_backfill_attaches_ids_to_known_cities(api, make_users):
+    catalog = CityCatalog()
+    await catalog.load(engine)
+    spellings = {" bombay ": "Mumbai", "NEW-DELHI": "Delhi", "Calcutta.": "Kolkata", "Atlantis": None}
+    user_ids = await make_users(len(spellings))
+    async with engine.begin() as conn:
+        for user_id, spelling in zip(user_ids, spellings):
+            await conn.execute(update(User).where(User.id == user_id).values(city=spelling, city_id=None))
+
+    # A post stored before its city was catalogued
+    response = await api.post("/api/v1/hangout/posts", json=post_body(city="Madras"),
+                              headers=auth_headers(user_ids[0]))
+    post_id = uuid.UUID(response.json()["data"]["id"])
+    async with engine.begin() as conn:
+        await conn.execute(update(HangoutPost).where(HangoutPost.id == post_id).values(city="madras", city_id=None))
+
+        for statement in BACKFILL_CITY_IDS_SQL:
+            await conn.execute(text(statement))
+
+        users = {user_id: (city, city_id) for user_id, city, city_id in await conn.execute(
+            select(User.id, User.city, User.city_id).where(User.id.in_(user_ids))
+        )}
+        post = (await conn.execute(select(HangoutPost.city, HangoutPost.city_id)
+                                   .where(HangoutPost.id == post_id))).one()
+    # Matched rows take the catalog's name; unknown text stays as it was, with no id
+    assert users == {
+        user_id: (name, catalog.resolve(name).id) if name else (spelling, None)
+        for user_id, (spelling, name) in zip(user_ids, spellings.items())
+    }
+    assert tuple(post) == ("Chennai", catalog.resolve("Chennai").id)
@@ -0,0 +1,46 @@
+"""
+Export slots are claimed in start(): concurrent starts cannot overshoot
+EXPORT_MAX_CONCURRENT, a refused lock gives its slot back, and so does a
+finished download.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.app.config import settings
+from backend.app.database import engine
+from backend.app.redis_client import get_redis
+from backend.app.services.export_service import ExportService
+
+
+@pytest.mark.asyncio
+async def test_concurrent_starts_never_exceed_the_limit(api, make_users, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_MAX_CONCURRENT", 2)
+    exports, redis = ExportService(), get_redis()
+    users = await make_users(4)
+
+    started = await asyncio.gather(*(exports.start(redis, user_id) for user_id in users), return_exceptions=True)
+    refused = [result for result in started if isinstance(result, HTTPException)]
+    assert len(started) - len(refused) == 2
+    assert [error.status_code for error in refused] == [429, 429]
+    assert len(exports.running) == 2
+
+
+@pytest.mark.asyncio
+async def test_slot_is_freed_by_a_refused_lock_and_a_finished_download(api, make_users):
+    exports, redis = ExportService(), get_redis()
+    user_id, = await make_users(1)
+
+    token = await exports.start(redis, user_id)
+    with pytest.raises(HTTPException) as already:
+        await exports.start(redis, user_id)
+    assert already.value.status_code == 429
+    assert list(exports.running) == [token]
+
+    lines = [line async for line in exports.stream(engine, redis, user_id, token)]
+    assert lines[-1].startswith(b'{"type":"end"')
+    assert exports.running == {}
+    # The lock went with it: the same user can export again
+    await exports.start(redis, user_id)
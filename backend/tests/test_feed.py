@@ -0,0 +1,59 @@
+"""
+Posts by muted or blocked creators are skipped before paging on the SQL and
+trending feeds, as in the feed index: every page comes back full and pages
+never overlap.
+"""
+
+import uuid
+
+import pytest
+
+from backend.app.services.trending_service import scores_key
+from conftest import post_body
+
+HANGOUT = "/api/v1/hangout"
+
+
+@pytest.fixture
+def town() -> str:
+    return f"Town {uuid.uuid4().hex[:8]}"
+
+
+def feed_with_a_muted_host(client, make_user, town: str) -> tuple[list[str], list[str], dict]:
+    """Posts by a host the viewer muted, soonest, then posts by another; (muted ids, visible ids, viewer)."""
+    _, muted_host = make_user()
+    _, other_host = make_user()
+    viewer_id, viewer = make_user()
+    muted_host_id = client.get("/api/v1/auth/me", headers=muted_host).json()["data"]["id"]
+
+    def create(headers: dict, days_ahead: float) -> str:
+        response = client.post(f"{HANGOUT}/posts", json=post_body(days_ahead, city=town), headers=headers)
+        assert response.status_code == 201, response.text
+        return response.json()["data"]["id"]
+
+    muted = [create(muted_host, 30 + day) for day in range(3)]
+    visible = [create(other_host, 40 + day) for day in range(4)]
+    response = client.put(f"/api/v1/blocks/{muted_host_id}", json={"kind": "mute"}, headers=viewer)
+    assert response.status_code == 200, response.text
+    return muted, visible, viewer
+
+
+def pages(client, viewer: dict, **params) -> list[list[str]]:
+    return [
+        [post["id"] for post in client.get(f"{HANGOUT}/posts", params={**params, "page": page, "limit": 2},
+                                           headers=viewer).json()["data"]]
+        for page in (1, 2, 3)
+    ]
+
+
+def test_soonest_feed_pages_skip_muted_creators(budget_client, make_user, town):
+    _, visible, viewer = feed_with_a_muted_host(budget_client, make_user, town)
+    assert pages(budget_client, viewer, city=town) == [visible[:2], visible[2:], []]
+
+
+def test_trending_feed_pages_skip_muted_creators(budget_client, make_user, fake_redis, town):
+    muted, visible, viewer = feed_with_a_muted_host(budget_client, make_user, town)
+    # The muted host's posts are the hottest
+    ranked = muted + visible
+    fake_redis.zadd(scores_key(town), {post_id: len(ranked) - rank for rank, post_id in enumerate(ranked)})
+    assert pages(budget_client, viewer, city=town, sort="trending") == [visible[:2], visible[2:], []]
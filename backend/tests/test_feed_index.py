@@ -0,0 +1,97 @@
+"""
+The feed index follows post events: after an accept fills a post's last seat and
+the relay publishes it, check() finds the city consistent with Postgres, and
+filtered feeds served from the index match the SQL feed exactly.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+
+from backend.app.cli.outbox_relay import OutboxRelay
+from backend.app.config import settings
+from backend.app.database import AsyncSessionLocal, engine
+from backend.app.models.city import City
+from backend.app.redis_client import get_redis
+from backend.app.services.city_catalog import city_catalog, normalize_city
+from backend.app.services.feed_index import feed_index
+from conftest import auth_headers, post_body
+
+HANGOUT = "/api/v1/hangout"
+
+
+@pytest_asyncio.fixture
+async def indexing(api, monkeypatch):
+    monkeypatch.setattr(settings, "FEED_INDEX_ENABLED", True)
+    yield
+    # Let the follower's blocking XREAD run out rather than cancel it at shutdown:
+    # fakeredis keeps a cancelled read's wake-up callback, bound to this test's loop
+    feed_index.cities.clear()
+    if feed_index._task is not None:
+        await asyncio.wait_for(feed_index._task, 5)
+
+
+async def catalogued_town() -> tuple[str, int]:
+    """A new city in the catalog, so its posts get a city_id the index is keyed by."""
+    name = f"Town {uuid.uuid4().hex[:8]}"
+    async with engine.begin() as conn:
+        await conn.execute(insert(City).values(name=name, key=normalize_city(name), population=1))
+    await city_catalog.load(engine)
+    return name, city_catalog.resolve(name).id
+
+
+async def wait_until(condition, timeout: float = 5) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_index_follows_a_filled_post_and_matches_the_sql_feed(api, indexing, make_users, monkeypatch):
+    town, city_id = await catalogued_town()
+    host, guest, viewer = await make_users(3)
+
+    post_ids = {}
+    for day, (activity_type, seats) in enumerate(
+        [("sports", 4), ("movies", 3), ("sports", 2), ("dining_nightlife", 4), ("movies", 4)]
+    ):
+        response = await api.post(f"{HANGOUT}/posts", headers=auth_headers(host), json=post_body(
+            30 + day, city=town, activity_type=activity_type, max_participants=seats,
+        ))
+        assert response.status_code == 201, response.text
+        post_ids[(activity_type, seats)] = response.json()["data"]["id"]
+    last_seat = post_ids[("sports", 2)]
+
+    async def feed(**params) -> list[dict]:
+        response = await api.get(f"{HANGOUT}/posts", params={"city": town, "limit": 50, **params},
+                                 headers=auth_headers(viewer))
+        assert response.status_code == 200, response.text
+        return response.json()["data"]
+
+    # The first read loads the city and starts following events
+    assert len(await feed()) == 5
+    index = feed_index.cities[city_id]
+
+    request = await api.post(f"{HANGOUT}/posts/{last_seat}/request", json={}, headers=auth_headers(guest))
+    accepted = await api.patch(f"{HANGOUT}/requests/{request.json()['data']['id']}",
+                               json={"action": "accept"}, headers=auth_headers(host))
+    assert accepted.status_code == 200, accepted.text
+    while await OutboxRelay(engine, get_redis()).relay_batch():
+        pass
+    await wait_until(lambda: uuid.UUID(last_seat) not in index.posts)
+
+    async with AsyncSessionLocal() as db:
+        report = await feed_index.check(db, city_id)
+    assert report == {"loaded": True, "posts": 4, "missing": [], "extra": [], "mismatched": []}
+
+    for params in [{}, {"has_free_seats": True}, {"activity_type": ["sports", "movies"]},
+                   {"activity_type": ["sports", "dining_nightlife"], "has_free_seats": True}]:
+        indexed = await feed(**params)
+        monkeypatch.setattr(settings, "FEED_INDEX_ENABLED", False)
+        assert indexed == await feed(**params), params
+        monkeypatch.setattr(settings, "FEED_INDEX_ENABLED", True)
+    assert last_seat not in {post["id"] for post in indexed}
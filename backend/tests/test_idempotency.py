@@ -0,0 +1,112 @@
+"""
+A repeated Idempotency-Key replays the first response for the same caller, a
+concurrent duplicate waits for it instead of running again, a different body is
+refused with 422, and a 5xx is never stored, so the retry really runs.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from backend.app.database import engine
+from backend.app.middleware.idempotency import IdempotencyMiddleware
+from backend.app.models.hangout import HangoutPost
+from backend.app.routers.hangout import hangout_service
+from backend.app.utils.jwt import create_access_token
+from conftest import auth_headers, post_body
+
+POSTS = "/api/v1/hangout/posts"
+
+
+def keyed(headers: dict, key: str) -> dict:
+    return {**headers, "Idempotency-Key": key}
+
+
+async def posts_titled(title: str) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).where(HangoutPost.title == title))).scalar()
+
+
+@pytest.fixture
+def body() -> dict:
+    return post_body(title=f"Idempotent {uuid.uuid4().hex[:8]}")
+
+
+@pytest.mark.asyncio
+async def test_repeat_replays_for_the_same_subject_only(api, make_users, body):
+    user_id, other_id = await make_users(2)
+    key = uuid.uuid4().hex
+
+    first = await api.post(POSTS, json=body, headers=keyed(auth_headers(user_id), key))
+    assert first.status_code == 201, first.text
+    # A fresh token for the same user still finds the stored response
+    token = create_access_token({"sub": str(user_id), "nonce": uuid.uuid4().hex})
+    replay = await api.post(POSTS, json=body, headers=keyed({"Authorization": f"Bearer {token}"}, key))
+    assert replay.status_code == 201
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.json() == first.json()
+    assert await posts_titled(body["title"]) == 1
+
+    # The same key from someone else is theirs alone
+    theirs = await api.post(POSTS, json=body, headers=keyed(auth_headers(other_id), key))
+    assert theirs.status_code == 201
+    assert "idempotent-replayed" not in theirs.headers
+    assert await posts_titled(body["title"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_waits_for_the_first_response(api, make_users, body, monkeypatch):
+    user_id, = await make_users(1)
+    headers = keyed(auth_headers(user_id), uuid.uuid4().hex)
+    waiting = asyncio.Event()
+
+    # The first request runs only once the duplicate is waiting on its lock
+    wait_for_result, create_post = IdempotencyMiddleware._wait_for_result, hangout_service.create_post
+
+    async def waiter(self, *args):
+        waiting.set()
+        return await wait_for_result(self, *args)
+
+    async def held_create_post(*args):
+        await asyncio.wait_for(waiting.wait(), 10)
+        return await create_post(*args)
+    monkeypatch.setattr(IdempotencyMiddleware, "_wait_for_result", waiter)
+    monkeypatch.setattr(hangout_service, "create_post", held_create_post)
+
+    responses = await asyncio.gather(*(api.post(POSTS, json=body, headers=headers) for _ in range(2)))
+    assert [response.status_code for response in responses] == [201, 201]
+    assert responses[0].json() == responses[1].json()
+    assert sorted(response.headers.get("idempotent-replayed", "") for response in responses) == ["", "true"]
+    assert await posts_titled(body["title"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_reused_key_with_another_body_is_refused(api, make_users, body):
+    user_id, = await make_users(1)
+    headers = keyed(auth_headers(user_id), uuid.uuid4().hex)
+
+    assert (await api.post(POSTS, json=body, headers=headers)).status_code == 201
+    response = await api.post(POSTS, json={**body, "max_participants": 6}, headers=headers)
+    assert response.status_code == 422
+    assert "different request body" in response.json()["detail"]
+    assert await posts_titled(body["title"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_not_stored(api, make_users, body, monkeypatch):
+    user_id, = await make_users(1)
+    headers = keyed(auth_headers(user_id), uuid.uuid4().hex)
+
+    async def unavailable(*args):
+        raise HTTPException(status_code=503, detail="Try again")
+    with monkeypatch.context() as patch:
+        patch.setattr(hangout_service, "create_post", unavailable)
+        assert (await api.post(POSTS, json=body, headers=headers)).status_code == 503
+
+    retry = await api.post(POSTS, json=body, headers=headers)
+    assert retry.status_code == 201, retry.text
+    assert "idempotent-replayed" not in retry.headers
+    assert await posts_titled(body["title"]) == 1
@@ -0,0 +1,55 @@
+"""
+A connection lost halfway through a mail batch puts every unsent message back
+on the queue, in order, for the retry to send.
+"""
+
+import json
+
+import pytest
+
+from backend.app.tasks import mail
+
+
+class FakeSMTP:
+    """Records the recipients it sends to; raises ``error`` on message ``fail_at``."""
+
+    def __init__(self, fail_at: int | None = None, error: Exception | None = None):
+        self.fail_at, self.error = fail_at, error
+        self.sent: list[str] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def send_message(self, message) -> None:
+        if len(self.sent) == self.fail_at:
+            raise self.error
+        self.sent.append(message["To"])
+
+
+def queued(fake_redis) -> list[str]:
+    return [json.loads(item)["to"] for item in fake_redis.lrange(mail.MAIL_QUEUE_KEY, 0, -1)]
+
+
+@pytest.mark.parametrize("error", [ConnectionResetError(104, "Connection reset by peer"), TimeoutError("timed out")])
+def test_lost_connection_requeues_the_unsent_rest(fake_redis, monkeypatch, error):
+    recipients = [f"user{i}@example.com" for i in range(5)]
+    fake_redis.rpush(mail.MAIL_QUEUE_KEY, *(
+        json.dumps({"to": to, "subject": "Hello", "body": "Hi"}) for to in recipients
+    ))
+    monkeypatch.setattr(mail, "_redis", fake_redis)
+
+    failing = FakeSMTP(fail_at=2, error=error)
+    monkeypatch.setattr(mail, "_connect", lambda: failing)
+    with pytest.raises(OSError):
+        mail.flush_queue()
+    assert failing.sent == recipients[:2]
+    assert queued(fake_redis) == recipients[2:]
+
+    working = FakeSMTP()
+    monkeypatch.setattr(mail, "_connect", lambda: working)
+    assert mail.flush_queue() == 3
+    assert working.sent == recipients[2:]
+    assert queued(fake_redis) == []
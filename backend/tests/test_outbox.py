@@ -0,0 +1,94 @@
+"""
+The outbox relay publishes only committed events, and keeps each aggregate's
+events in id order when two relays claim batches at the same time.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from backend.app.cli.outbox_relay import OutboxRelay
+from backend.app.database import AsyncSessionLocal, engine
+from backend.app.models.hangout import HangoutPost
+from backend.app.models.outbox import OutboxEvent
+from backend.app.redis_client import get_redis
+from backend.app.services.outbox_service import POST_AGGREGATE, OutboxService, stream_for
+
+STREAM = stream_for(POST_AGGREGATE)
+
+
+@pytest_asyncio.fixture
+async def empty_outbox(api):
+    """Drop rows left by other tests, which the relay would otherwise publish first."""
+    async with engine.begin() as conn:
+        await conn.execute(delete(OutboxEvent))
+
+
+class HeldRedis:
+    """A Redis whose MULTI/EXEC waits for ``release``, holding the relay's batch open."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.claimed = asyncio.Event()
+        self.release = asyncio.Event()
+
+    def pipeline(self, transaction: bool = True):
+        pipe = self.redis.pipeline(transaction=transaction)
+        execute = pipe.execute
+
+        async def held():
+            self.claimed.set()
+            await self.release.wait()
+            return await execute()
+        pipe.execute = held
+        return pipe
+
+
+def a_post() -> HangoutPost:
+    return HangoutPost(
+        id=uuid.uuid4(), creator_id=uuid.uuid4(), city="Mumbai", activity_type="sports", status="open",
+        scheduled_at=datetime.now(timezone.utc) + timedelta(days=30), max_participants=4,
+    )
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_events_are_never_published(empty_outbox, fake_redis):
+    async with AsyncSessionLocal() as db:
+        OutboxService().post_event(db, a_post(), "post.created")
+        await db.flush()
+        await db.rollback()
+
+    assert await OutboxRelay(engine, get_redis()).relay_batch() == 0
+    assert fake_redis.xlen(STREAM) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batches_keep_each_aggregate_in_order(empty_outbox, fake_redis):
+    outbox, posts = OutboxService(), [a_post() for _ in range(3)]
+    async with AsyncSessionLocal() as db:
+        # Interleaved: A1 B1 C1 A2 B2 C2 ...
+        for seq in range(4):
+            for post in posts:
+                outbox.post_event(db, post, "post.updated", seq=seq)
+            await db.flush()
+        await db.commit()
+
+    # The first relay claims a batch and holds it; the second runs to completion meanwhile
+    held = HeldRedis(get_redis())
+    first = asyncio.create_task(OutboxRelay(engine, held, batch_size=2).relay_batch())
+    await asyncio.wait_for(held.claimed.wait(), 10)
+    await OutboxRelay(engine, get_redis(), batch_size=12).relay_batch()
+    held.release.set()
+    await first
+    while await OutboxRelay(engine, get_redis()).relay_batch():
+        pass
+
+    seqs: dict[str, list[int]] = {}
+    for _, fields in fake_redis.xrange(STREAM):
+        seqs.setdefault(fields[b"aggregate_id"].decode(), []).append(int(fields[b"id"]))
+    assert set(seqs) == {str(post.id) for post in posts}
+    assert all(ids == sorted(ids) and len(ids) == 4 for ids in seqs.values()), seqs
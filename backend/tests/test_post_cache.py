@@ -0,0 +1,47 @@
+"""
+A post detail loaded from Postgres is stored only if no worker invalidated the
+post while the load was running.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.app.services.post_cache import PostDetailCache, detail_key
+
+
+def detail(post_id: uuid.UUID, title: str) -> bytes:
+    return json.dumps({
+        "id": str(post_id), "creator_id": str(uuid.uuid4()), "city": "Mumbai", "status": "open",
+        "ends_at": datetime.now(timezone.utc).isoformat(), "title": title,
+    }).encode()
+
+
+@pytest.mark.asyncio
+async def test_load_racing_another_workers_invalidation_is_not_stored(api, fake_redis):
+    worker, other_worker = PostDetailCache(), PostDetailCache()
+    post_id = uuid.uuid4()
+
+    async def load_then_edited_elsewhere():
+        body = detail(post_id, "Before the edit")
+        # The post is edited and committed on another worker while this one loads
+        await other_worker.invalidate(post_id)
+        return body
+
+    served = await worker.get(post_id, load_then_edited_elsewhere)
+    assert json.loads(served.body)["title"] == "Before the edit"
+    assert fake_redis.get(detail_key(post_id)) is None
+
+    # The next load has nothing racing it, so it is kept in both tiers
+    async def load():
+        return detail(post_id, "After the edit")
+
+    assert json.loads((await worker.get(post_id, load)).body)["title"] == "After the edit"
+    assert json.loads(fake_redis.get(detail_key(post_id)))["title"] == "After the edit"
+
+    async def must_not_load():
+        raise AssertionError("served from the local tier")
+
+    assert json.loads((await worker.get(post_id, must_not_load)).body)["title"] == "After the edit"
@@ -0,0 +1,346 @@
+"""
+Every route in routers/auth.py, routers/hangout.py and routers/block.py, on its happy path, under
+``budget_client``: a request over its route's ``@query_budget`` fails with the
+statements it ran listed. Where a route has an expensive happy path (a leave that
+promotes from the waitlist, an accept that closes the post) that is the one run.
+"""
+
+import json
+import re
+import uuid
+
+import pytest
+
+from backend.app.main import app
+from backend.app.tasks.mail import MAIL_QUEUE_KEY
+from conftest import PASSWORD, post_body
+
+HANGOUT = "/api/v1/hangout"
+AUTH = "/api/v1/auth"
+BLOCKS = "/api/v1/blocks"
+
+
+class Scenario:
+    """Setup shared by the cases: users, a host's post and requests on it."""
+
+    def __init__(self, client, make_user, fake_redis):
+        self.client = client
+        self.make_user = make_user
+        self.redis = fake_redis
+
+    def post(self, headers, **fields) -> str:
+        response = self.client.post(f"{HANGOUT}/posts", json=post_body(**fields), headers=headers)
+        assert response.status_code == 201, response.text
+        return response.json()["data"]["id"]
+
+    def request(self, post_id, headers) -> dict:
+        response = self.client.post(f"{HANGOUT}/posts/{post_id}/request", json={}, headers=headers)
+        assert response.status_code == 201, response.text
+        return response.json()["data"]
+
+    def accept(self, request_id, host) -> None:
+        response = self.client.patch(f"{HANGOUT}/requests/{request_id}", json={"action": "accept"}, headers=host)
+        assert response.status_code == 200, response.text
+
+    def full_post_with_waitlist(self, seats: int = 2, waiting: int = 1):
+        """A post with every seat taken and ``waiting`` requesters queued."""
+        _, host = self.make_user()
+        post_id = self.post(host, max_participants=seats)
+        members = []
+        for _ in range(seats - 1):
+            _, member = self.make_user()
+            request = self.request(post_id, member)
+            self.accept(request["id"], host)
+            members.append((request, member))
+        queued = []
+        for _ in range(waiting):
+            _, headers = self.make_user()
+            request = self.request(post_id, headers)
+            assert request["status"] == "waitlisted"
+            queued.append((request, headers))
+        return host, post_id, members, queued
+
+    def register(self) -> str:
+        """A new user's email; their password is PASSWORD."""
+        name = f"user_{uuid.uuid4().hex[:12]}"
+        response = self.client.post(f"{AUTH}/register", json={
+            "email": f"{name}@example.com", "username": name, "password": PASSWORD,
+        })
+        assert response.status_code == 201, response.text
+        return f"{name}@example.com"
+
+    def login(self, email: str) -> dict:
+        response = self.client.post(f"{AUTH}/login", json={"email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        return response.json()["data"]
+
+    def mailed_token(self, subject_word: str) -> str:
+        for raw in self.redis.lrange(MAIL_QUEUE_KEY, 0, -1):
+            message = json.loads(raw)
+            if subject_word in message["subject"]:
+                return re.search(r"token=([\w-]+)", message["body"]).group(1)
+        raise AssertionError(f"No {subject_word!r} email queued")
+
+
+# ─── HANGOUT ──────────────────────────────────────────────────────────────────
+
+def feed(s):
+    _, host = s.make_user()
+    s.post(host)
+    return s.client.get(f"{HANGOUT}/posts", params={"city": "Mumbai"}, headers=host)
+
+
+def facets(s):
+    _, user = s.make_user()
+    return s.client.get(f"{HANGOUT}/facets", params={"city": "Mumbai"}, headers=user)
+
+
+def create_post(s):
+    _, host = s.make_user()
+    return s.client.post(f"{HANGOUT}/posts", json=post_body(), headers=host)
+
+
+def post_detail(s):
+    _, host = s.make_user()
+    _, viewer = s.make_user()
+    post_id = s.post(host)
+    return s.client.get(f"{HANGOUT}/posts/{post_id}", headers=viewer)
+
+
+def update_post(s):
+    # Raising capacity promotes the waitlist
+    host, post_id, _, _ = s.full_post_with_waitlist(seats=2, waiting=2)
+    return s.client.patch(f"{HANGOUT}/posts/{post_id}", json={"max_participants": 4}, headers=host)
+
+
+def cancel_post(s):
+    host, post_id, _, _ = s.full_post_with_waitlist()
+    return s.client.delete(f"{HANGOUT}/posts/{post_id}", headers=host)
+
+
+def send_request(s):
+    # Onto the waitlist of a full post
+    _, post_id, _, _ = s.full_post_with_waitlist(waiting=0)
+    _, user = s.make_user()
+    return s.client.post(f"{HANGOUT}/posts/{post_id}/request", json={"message": "Count me in"}, headers=user)
+
+
+def leave(s):
+    _, post_id, members, _ = s.full_post_with_waitlist()
+    return s.client.post(f"{HANGOUT}/posts/{post_id}/leave", headers=members[0][1])
+
+
+def waitlist(s):
+    host, post_id, _, _ = s.full_post_with_waitlist(waiting=2)
+    return s.client.get(f"{HANGOUT}/posts/{post_id}/waitlist", headers=host)
+
+
+def post_requests(s):
+    host, post_id, _, _ = s.full_post_with_waitlist(waiting=2)
+    return s.client.get(f"{HANGOUT}/posts/{post_id}/requests", headers=host)
+
+
+def respond(s):
+    # Taking the last seat closes the post
+    _, host = s.make_user()
+    post_id = s.post(host, max_participants=2)
+    _, user = s.make_user()
+    request = s.request(post_id, user)
+    return s.client.patch(f"{HANGOUT}/requests/{request['id']}", json={"action": "accept"}, headers=host)
+
+
+def cancel_request(s):
+    # An accepted request: cancelling it leaves, and the waitlist moves up
+    _, _, members, _ = s.full_post_with_waitlist()
+    request, member = members[0]
+    return s.client.delete(f"{HANGOUT}/requests/{request['id']}", headers=member)
+
+
+def my_posts(s):
+    _, host = s.make_user()
+    s.post(host)
+    s.post(host, days_ahead=40)
+    return s.client.get(f"{HANGOUT}/my-posts", headers=host)
+
+
+def my_schedule(s):
+    _, _, members, _ = s.full_post_with_waitlist()
+    return s.client.get(f"{HANGOUT}/my-schedule", headers=members[0][1])
+
+
+def sync(s):
+    host, _, _, _ = s.full_post_with_waitlist()
+    first = s.client.get(f"{HANGOUT}/sync", headers=host)
+    assert first.status_code == 200, first.text
+    return s.client.get(f"{HANGOUT}/sync", params={"since": first.json()["data"]["next_token"]}, headers=host)
+
+
+def my_requests(s):
+    _, _, _, queued = s.full_post_with_waitlist()
+    return s.client.get(f"{HANGOUT}/my-requests", headers=queued[0][1])
+
+
+# ─── AUTH ─────────────────────────────────────────────────────────────────────
+
+def register(s):
+    name = f"user_{uuid.uuid4().hex[:12]}"
+    return s.client.post(f"{AUTH}/register", json={
+        "email": f"{name}@example.com", "username": name, "password": PASSWORD,
+    })
+
+
+def login(s):
+    return s.client.post(f"{AUTH}/login", json={"email": s.register(), "password": PASSWORD})
+
+
+def refresh(s):
+    tokens = s.login(s.register())
+    return s.client.post(f"{AUTH}/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+
+def logout(s):
+    tokens = s.login(s.register())
+    return s.client.post(f"{AUTH}/logout", json={"refresh_token": tokens["refresh_token"]},
+                         headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+
+def me(s):
+    _, user = s.make_user()
+    return s.client.get(f"{AUTH}/me", headers=user)
+
+
+def update_me(s):
+    _, user = s.make_user()
+    return s.client.patch(f"{AUTH}/me", json={"city": "bombay", "bio": "Here for the football"}, headers=user)
+
+
+def export(s):
+    _, _, members, _ = s.full_post_with_waitlist()
+    response = s.client.get(f"{AUTH}/me/export", headers=members[0][1])
+    assert len(response.text.splitlines()) > 1
+    return response
+
+
+def suggestions(s):
+    _, user = s.make_user()
+    return s.client.get(f"{AUTH}/me/suggestions", headers=user)
+
+
+def forgot_password(s):
+    return s.client.post(f"{AUTH}/forgot-password", json={"email": s.register()})
+
+
+def reset_password(s):
+    assert s.client.post(f"{AUTH}/forgot-password", json={"email": s.register()}).status_code == 202
+    token = s.mailed_token("password")
+    return s.client.post(f"{AUTH}/reset-password", json={"token": token, "new_password": "another-password-1"})
+
+
+def send_verification(s):
+    _, user = s.make_user()
+    return s.client.post(f"{AUTH}/verify-email/send", headers=user)
+
+
+def verify_email(s):
+    _, user = s.make_user()
+    assert s.client.post(f"{AUTH}/verify-email/send", headers=user).status_code == 202
+    return s.client.post(f"{AUTH}/verify-email", json={"token": s.mailed_token("Verify")})
+
+
+def avatar_upload_url(s):
+    _, user = s.make_user()
+    return s.client.post(f"{AUTH}/me/avatar/upload-url", json={"content_type": "image/png"}, headers=user)
+
+
+def avatar_complete(s):
+    user_id, user = s.make_user()
+    return s.client.post(f"{AUTH}/me/avatar/complete", json={"key": f"uploads/avatars/{user_id}/abc"},
+                         headers=user)
+
+
+def block(s):
+    target_id, _ = s.make_user()
+    _, user = s.make_user()
+    return s.client.put(f"{BLOCKS}/{target_id}", json={"kind": "mute"}, headers=user)
+
+
+def blocks(s):
+    target_id, _ = s.make_user()
+    _, user = s.make_user()
+    s.client.put(f"{BLOCKS}/{target_id}", json={"kind": "block"}, headers=user)
+    return s.client.get(BLOCKS, headers=user)
+
+
+def unblock(s):
+    target_id, _ = s.make_user()
+    _, user = s.make_user()
+    s.client.put(f"{BLOCKS}/{target_id}", json={"kind": "block"}, headers=user)
+    return s.client.delete(f"{BLOCKS}/{target_id}", headers=user)
+
+
+CASES = {
+    ("GET", f"{HANGOUT}/posts"): feed,
+    ("GET", f"{HANGOUT}/facets"): facets,
+    ("POST", f"{HANGOUT}/posts"): create_post,
+    ("GET", f"{HANGOUT}/posts/{{post_id}}"): post_detail,
+    ("PATCH", f"{HANGOUT}/posts/{{post_id}}"): update_post,
+    ("DELETE", f"{HANGOUT}/posts/{{post_id}}"): cancel_post,
+    ("POST", f"{HANGOUT}/posts/{{post_id}}/request"): send_request,
+    ("POST", f"{HANGOUT}/posts/{{post_id}}/leave"): leave,
+    ("GET", f"{HANGOUT}/posts/{{post_id}}/waitlist"): waitlist,
+    ("GET", f"{HANGOUT}/posts/{{post_id}}/requests"): post_requests,
+    ("PATCH", f"{HANGOUT}/requests/{{request_id}}"): respond,
+    ("DELETE", f"{HANGOUT}/requests/{{request_id}}"): cancel_request,
+    ("GET", f"{HANGOUT}/my-posts"): my_posts,
+    ("GET", f"{HANGOUT}/my-schedule"): my_schedule,
+    ("GET", f"{HANGOUT}/sync"): sync,
+    ("GET", f"{HANGOUT}/my-requests"): my_requests,
+    ("POST", f"{AUTH}/register"): register,
+    ("POST", f"{AUTH}/login"): login,
+    ("POST", f"{AUTH}/refresh"): refresh,
+    ("POST", f"{AUTH}/logout"): logout,
+    ("GET", f"{AUTH}/me"): me,
+    ("PATCH", f"{AUTH}/me"): update_me,
+    ("GET", f"{AUTH}/me/export"): export,
+    ("GET", f"{AUTH}/me/suggestions"): suggestions,
+    ("POST", f"{AUTH}/forgot-password"): forgot_password,
+    ("POST", f"{AUTH}/reset-password"): reset_password,
+    ("POST", f"{AUTH}/verify-email/send"): send_verification,
+    ("POST", f"{AUTH}/verify-email"): verify_email,
+    ("POST", f"{AUTH}/me/avatar/upload-url"): avatar_upload_url,
+    ("POST", f"{AUTH}/me/avatar/complete"): avatar_complete,
+    ("PUT", f"{BLOCKS}/{{user_id}}"): block,
+    ("GET", BLOCKS): blocks,
+    ("DELETE", f"{BLOCKS}/{{user_id}}"): unblock,
+}
+
+
+def test_every_route_has_a_case():
+    routes = {
+        (method, route.path)
+        for route in app.router.routes
+        if getattr(route, "endpoint", None) is not None
+        and route.endpoint.__module__ in (
+            "backend.app.routers.auth", "backend.app.routers.hangout", "backend.app.routers.block",
+        )
+        for method in route.methods
+    }
+    assert routes == set(CASES)
+
+
+@pytest.mark.parametrize("case", CASES.values(), ids=[f"{method} {path}" for method, path in CASES])
+def test_happy_path_within_budget(case, budget_client, make_user, fake_redis):
+    response = case(Scenario(budget_client, make_user, fake_redis))
+    assert 200 <= response.status_code < 300, response.text
+
+
+@pytest.mark.parametrize("path", ["/posts/{post_id}", "/facets"])
+def test_warm_cached_route_checks_out_nothing(path, budget_client, make_user):
+    _, host = make_user()
+    _, viewer = make_user()
+    response = budget_client.post(f"{HANGOUT}/posts", json=post_body(), headers=host)
+    url = HANGOUT + path.format(post_id=response.json()["data"]["id"])
+
+    assert budget_client.get(url, params={"city": "Mumbai"}, headers=viewer).status_code == 200
+    assert budget_client.get(url, params={"city": "Mumbai"}, headers=viewer).status_code == 200
+    assert budget_client.last_checkouts == 0, budget_client.last_statements
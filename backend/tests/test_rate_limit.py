@@ -0,0 +1,66 @@
+"""
+The rate limiter answers 429 with Retry-After once a client's bucket is empty,
+whether the buckets live in Redis (the Lua script) or, while Redis errors, in
+the worker's own LocalTokenBuckets.
+"""
+
+import pytest
+from redis.exceptions import RedisError
+
+from backend.app.config import settings
+from backend.app.main import app
+from backend.app.middleware import rate_limit
+from backend.app.middleware.rate_limit import LocalTokenBuckets, RateLimitMiddleware
+
+AUTOCOMPLETE = "/api/v1/cities/autocomplete"
+CAPACITY, RATE = 3, 0.5
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMITS", {name: (CAPACITY, RATE) for name in ("auth", "feed", "writes")})
+
+
+def limiter(monkeypatch) -> RateLimitMiddleware:
+    """The app's limiter, with fresh local buckets and Redis considered up."""
+    if app.middleware_stack is None:
+        app.middleware_stack = app.build_middleware_stack()
+    layer = app.middleware_stack
+    while not isinstance(layer, RateLimitMiddleware):
+        layer = layer.app
+    monkeypatch.setattr(layer, "local", LocalTokenBuckets())
+    monkeypatch.setattr(layer, "_redis_down_until", 0.0)
+    return layer
+
+
+async def drain(api) -> list:
+    return [await api.get(AUTOCOMPLETE, params={"q": "Mum"}) for _ in range(CAPACITY + 1)]
+
+
+def assert_limited(responses: list) -> None:
+    assert [response.status_code for response in responses] == [200] * CAPACITY + [429]
+    # One token comes back every 1 / RATE seconds
+    assert responses[-1].headers["retry-after"] == "2"
+    assert responses[-1].headers["ratelimit-remaining"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_empty_bucket_in_redis_answers_429(api, limited, fake_redis, monkeypatch):
+    middleware = limiter(monkeypatch)
+    assert_limited(await drain(api))
+    assert fake_redis.keys("rl:feed:*") == [b"rl:feed:ip:127.0.0.1"]
+    assert middleware.local.buckets == {}
+
+
+@pytest.mark.asyncio
+async def test_local_buckets_take_over_while_redis_errors(api, limited, fake_redis, monkeypatch):
+    middleware = limiter(monkeypatch)
+
+    def unavailable():
+        raise RedisError("Connection refused")
+    monkeypatch.setattr(rate_limit, "get_redis", unavailable)
+
+    assert_limited(await drain(api))
+    assert list(middleware.local.buckets) == ["rl:feed:ip:127.0.0.1"]
+    assert fake_redis.keys("rl:*") == []
@@ -0,0 +1,42 @@
+"""
+Schedule conflicts are found through each seat's copy of its post's time range,
+so moving a post has to move its roster's ranges and respect its guests' other
+hangouts.
+"""
+
+from conftest import post_body
+
+HANGOUT = "/api/v1/hangout"
+
+
+def hosted_with_guest(client, make_user, guest, days_ahead) -> tuple[str, dict]:
+    """A new post ``days_ahead`` out with ``guest`` accepted; (post id, host headers)."""
+    _, host = make_user()
+    post_id = client.post(f"{HANGOUT}/posts", json=post_body(days_ahead), headers=host).json()["data"]["id"]
+    request = client.post(f"{HANGOUT}/posts/{post_id}/request", json={}, headers=guest).json()["data"]
+    accepted = client.patch(f"{HANGOUT}/requests/{request['id']}", json={"action": "accept"}, headers=host)
+    assert accepted.status_code == 200, accepted.text
+    return post_id, host
+
+
+def test_moving_a_post_checks_and_moves_its_roster(budget_client, make_user):
+    _, guest = make_user()
+    post_id, host = hosted_with_guest(budget_client, make_user, guest, days_ahead=30)
+    other_id, _ = hosted_with_guest(budget_client, make_user, guest, days_ahead=31)
+    other_start = budget_client.get(f"{HANGOUT}/posts/{other_id}", headers=guest).json()["data"]["scheduled_at"]
+
+    clash = budget_client.patch(f"{HANGOUT}/posts/{post_id}", json={"scheduled_at": other_start}, headers=host)
+    assert clash.status_code == 409, clash.text
+
+    moved = post_body(days_ahead=40)["scheduled_at"]
+    response = budget_client.patch(f"{HANGOUT}/posts/{post_id}", json={"scheduled_at": moved}, headers=host)
+    assert response.status_code == 200, response.text
+
+    # The guest's seat moved with the post: the old slot is free, the new one is taken
+    _, free_host = make_user()
+    free_id = budget_client.post(f"{HANGOUT}/posts", json=post_body(30), headers=free_host).json()["data"]["id"]
+    assert budget_client.post(f"{HANGOUT}/posts/{free_id}/request", json={}, headers=guest).status_code == 201
+    _, busy_host = make_user()
+    busy_id = budget_client.post(f"{HANGOUT}/posts", json={**post_body(), "scheduled_at": moved},
+                                 headers=busy_host).json()["data"]["id"]
+    assert budget_client.post(f"{HANGOUT}/posts/{busy_id}/request", json={}, headers=guest).status_code == 409
@@ -0,0 +1,116 @@
+"""
+Delta sync converges: a client that keeps applying pages while others join and
+leave ends up with exactly the rosters the database holds, including those of
+posts it joined after its first sync, whose older seats never change again.
+"""
+
+import asyncio
+import random
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from backend.app.database import engine
+from backend.app.models.hangout import HangoutParticipant
+from conftest import auth_headers, post_body
+
+HANGOUT = "/api/v1/hangout"
+
+
+class Replica:
+    """What a client keeps from delta sync: posts and seats by id, plus its token."""
+
+    def __init__(self, api, user_id: uuid.UUID):
+        self.api = api
+        self.headers = auth_headers(user_id)
+        self.token = None
+        self.posts: dict[str, dict] = {}
+        self.seats: dict[str, dict] = {}
+
+    async def sync(self) -> None:
+        while True:
+            params = {"limit": 7, **({"since": self.token} if self.token else {})}
+            response = await self.api.get(f"{HANGOUT}/sync", params=params, headers=self.headers)
+            assert response.status_code == 200, response.text
+            page = response.json()["data"]
+            self.posts.update((post["id"], post) for post in page["posts"])
+            self.seats.update((seat["id"], seat) for seat in page["participations"])
+            for tombstone in page["deleted"]:
+                {"post": self.posts, "participation": self.seats}.get(tombstone["entity"], {}).pop(
+                    tombstone["id"], None)
+            self.token = page["next_token"]
+            if not page["has_more"]:
+                return
+
+    def roster(self, post_id: str) -> set[str]:
+        return {seat["user_id"] for seat in self.seats.values() if seat["post_id"] == post_id}
+
+
+async def join(api, post_id: str, user_id: uuid.UUID, host: uuid.UUID) -> None:
+    request = await api.post(f"{HANGOUT}/posts/{post_id}/request", json={}, headers=auth_headers(user_id))
+    assert request.status_code == 201, request.text
+    accepted = await api.patch(f"{HANGOUT}/requests/{request.json()['data']['id']}",
+                               json={"action": "accept"}, headers=auth_headers(host))
+    assert accepted.status_code == 200, accepted.text
+
+
+async def leave(api, post_id: str, user_id: uuid.UUID) -> None:
+    response = await api.post(f"{HANGOUT}/posts/{post_id}/leave", headers=auth_headers(user_id))
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.asyncio
+async def test_sync_converges_while_rosters_change(api, make_users):
+    host, me, *others = await make_users(8)
+    post_ids = []
+    for i in range(3):
+        response = await api.post(f"{HANGOUT}/posts", json=post_body(days_ahead=30 + 3 * i, max_participants=10),
+                                  headers=auth_headers(host))
+        assert response.status_code == 201, response.text
+        post_ids.append(response.json()["data"]["id"])
+    # Seats taken before the first sync, in posts the client is not in yet
+    for post_id in post_ids:
+        for user_id in others[:3]:
+            await join(api, post_id, user_id, host)
+
+    replica = Replica(api, me)
+    await replica.sync()
+    assert replica.posts == {}
+
+    done = asyncio.Event()
+
+    async def churn(user_id: uuid.UUID, rng: random.Random) -> None:
+        # A user may request a post only once: the early joiners leave, the rest join
+        for post_id in rng.sample(post_ids, len(post_ids)):
+            if user_id in others[:3]:
+                await leave(api, post_id, user_id)
+            else:
+                await join(api, post_id, user_id, host)
+
+    async def join_all() -> None:
+        for post_id in post_ids:
+            await join(api, post_id, me, host)
+
+    async def keep_syncing() -> None:
+        while not done.is_set():
+            await replica.sync()
+            await asyncio.sleep(0)
+
+    syncing = asyncio.create_task(keep_syncing())
+    try:
+        await asyncio.gather(join_all(), *(churn(user_id, random.Random(i)) for i, user_id in enumerate(others)))
+    finally:
+        done.set()
+        await syncing
+    await replica.sync()
+
+    async with engine.connect() as conn:
+        rows = (await conn.execute(
+            select(HangoutParticipant.post_id, HangoutParticipant.user_id)
+            .where(HangoutParticipant.post_id.in_([uuid.UUID(post_id) for post_id in post_ids]))
+        )).all()
+    assert set(replica.posts) == set(post_ids)
+    for post_id in post_ids:
+        expected = {str(user_id) for row_post_id, user_id in rows if str(row_post_id) == post_id}
+        assert replica.roster(post_id) == expected
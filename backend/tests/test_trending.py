@@ -0,0 +1,67 @@
+"""
+Trending compaction: scores are judged after decay from the epoch, ended and
+decayed-away posts are dropped, each city is capped, and a rebase rescales the
+stored scores so the ranking and the decayed values are unchanged.
+"""
+
+import time
+
+import pytest
+
+from backend.app.config import settings
+from backend.app.services.trending_service import CITIES_KEY, EPOCH_KEY, ends_key, scores_key
+from backend.app.tasks import trending
+
+HALF_LIFE = 3600
+CITY, GONE = "Mumbai", "Pune"
+
+
+@pytest.fixture
+def redis(fake_redis, monkeypatch):
+    monkeypatch.setattr(trending, "_redis", fake_redis)
+    monkeypatch.setattr(settings, "TRENDING_HALF_LIFE_HOURS", HALF_LIFE / 3600)
+    monkeypatch.setattr(settings, "TRENDING_MIN_SCORE", 0.05)
+    return fake_redis
+
+
+def seed(redis, half_lives: float, posts: dict[str, tuple[float, float]]) -> None:
+    """Epoch ``half_lives`` ago; posts as id -> (decayed score now, seconds until it ends)."""
+    now = time.time()
+    redis.set(EPOCH_KEY, repr(now - half_lives * HALF_LIFE))
+    for post_id, (score, ends_in) in posts.items():
+        city = GONE if post_id.startswith("gone") else CITY
+        redis.zadd(scores_key(city), {post_id: score * 2 ** half_lives})
+        redis.zadd(ends_key(city), {post_id: int(now + ends_in)})
+        redis.sadd(CITIES_KEY, city)
+
+
+def decayed(redis) -> dict[str, float]:
+    exponent = (time.time() - float(redis.get(EPOCH_KEY))) / HALF_LIFE
+    stored = redis.zrange(scores_key(CITY), 0, -1, withscores=True)
+    return {member.decode(): score * 2 ** -exponent for member, score in stored}
+
+
+def test_compaction_drops_ended_and_decayed_posts(redis):
+    seed(redis, 2, {
+        "hot": (4.0, 3600), "warm": (1.0, 3600), "faded": (0.02, 3600),
+        "ended": (3.0, -60), "gone-ended": (5.0, -60),
+    })
+
+    assert trending.compact() == {"removed": 3, "rebased": False}
+    assert decayed(redis) == {"warm": pytest.approx(1.0, rel=1e-3), "hot": pytest.approx(4.0, rel=1e-3)}
+    assert b"ended" not in redis.zrange(ends_key(CITY), 0, -1)
+    # A city with nothing left leaves the city set
+    assert redis.smembers(CITIES_KEY) == {CITY.encode()}
+
+
+def test_rebase_rescales_scores_and_caps_the_city(redis, monkeypatch):
+    monkeypatch.setattr(settings, "TRENDING_MAX_PER_CITY", 2)
+    seed(redis, trending.REBASE_EXPONENT + 1, {
+        "hot": (4.0, 3600), "warm": (2.0, 3600), "cool": (1.0, 3600), "faded": (0.01, 3600),
+    })
+
+    assert trending.compact() == {"removed": 2, "rebased": True}
+    assert float(redis.get(EPOCH_KEY)) == pytest.approx(time.time(), abs=5)
+    # Stored scores are now the decayed ones
+    scores = dict(redis.zrange(scores_key(CITY), 0, -1, withscores=True))
+    assert scores == {b"warm": pytest.approx(2.0, rel=1e-3), b"hot": pytest.approx(4.0, rel=1e-3)}
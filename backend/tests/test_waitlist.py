@@ -0,0 +1,165 @@
+"""
+Waitlist invariants under concurrent joins, leaves, accepts and withdrawals on
+a few full posts. Afterwards, per post: never more participants than seats;
+closed if and only if full; nobody waiting while a seat is free; roster and
+accepted requests match one to one; and promotion went strictly by arrival,
+so every request still waiting arrived after every promoted one.
+"""
+
+import asyncio
+import random
+import uuid
+
+import pytest
+from sqlalchemy import ARRAY, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from backend.app.database import engine
+from conftest import auth_headers, post_body
+
+HANGOUT = "/api/v1/hangout"
+
+# Each query returns the rows breaking one invariant, among the posts in :post_ids
+CHECKS = {
+    "over capacity": """
+        SELECT p.id FROM hangout_posts p
+        WHERE p.id = ANY(:post_ids)
+          AND (SELECT count(*) FROM hangout_participants hp WHERE hp.post_id = p.id) > p.max_participants
+    """,
+    "status does not match seats": """
+        SELECT p.id FROM hangout_posts p
+        WHERE p.id = ANY(:post_ids)
+          AND ((SELECT count(*) FROM hangout_participants hp WHERE hp.post_id = p.id) >= p.max_participants)
+              <> (p.status = 'closed')
+    """,
+    "waitlist with a free seat": """
+        SELECT p.id FROM hangout_posts p
+        WHERE p.id = ANY(:post_ids)
+          AND (SELECT count(*) FROM hangout_participants hp WHERE hp.post_id = p.id) < p.max_participants
+          AND EXISTS (SELECT 1 FROM hangout_requests r WHERE r.post_id = p.id AND r.status = 'waitlisted')
+    """,
+    "participant without an accepted request": """
+        SELECT hp.id FROM hangout_participants hp
+        WHERE hp.post_id = ANY(:post_ids) AND hp.role = 'participant' AND NOT EXISTS (
+            SELECT 1 FROM hangout_requests r
+            WHERE r.post_id = hp.post_id AND r.requester_id = hp.user_id AND r.status = 'accepted')
+    """,
+    "accepted request without a seat": """
+        SELECT r.id FROM hangout_requests r
+        WHERE r.post_id = ANY(:post_ids) AND r.status = 'accepted' AND NOT EXISTS (
+            SELECT 1 FROM hangout_participants hp WHERE hp.post_id = r.post_id AND hp.user_id = r.requester_id)
+    """,
+    "host missing": """
+        SELECT p.id FROM hangout_posts p
+        WHERE p.id = ANY(:post_ids)
+          AND NOT EXISTS (SELECT 1 FROM hangout_participants hp
+                          WHERE hp.post_id = p.id AND hp.user_id = p.creator_id AND hp.role = 'host')
+    """,
+    "promoted out of order": """
+        SELECT r.post_id FROM hangout_requests r
+        JOIN outbox_events e ON e.event_type = 'request.promoted' AND (e.payload ->> 'request_id')::uuid = r.id
+        WHERE r.post_id = ANY(:post_ids)
+        GROUP BY r.post_id
+        HAVING max(r.created_at) > (SELECT min(w.created_at) FROM hangout_requests w
+                                    WHERE w.post_id = r.post_id AND w.status = 'waitlisted')
+    """,
+}
+
+
+PROMOTED = """
+    SELECT count(*) FROM hangout_requests r
+    JOIN outbox_events e ON e.event_type = 'request.promoted' AND (e.payload ->> 'request_id')::uuid = r.id
+    WHERE r.post_id = ANY(:post_ids)
+"""
+
+
+async def violations(post_ids: list[uuid.UUID]) -> tuple[dict[str, list[str]], int]:
+    """Rows breaking each invariant (only those broken), and how many requests were promoted."""
+    post_ids_param = bindparam("post_ids", post_ids, type_=ARRAY(UUID(as_uuid=True)))
+    found = {}
+    async with engine.connect() as conn:
+        for name, sql in CHECKS.items():
+            rows = [str(row[0]) for row in await conn.execute(text(sql).bindparams(post_ids_param))]
+            if rows:
+                found[name] = rows
+        promoted = (await conn.execute(text(PROMOTED).bindparams(post_ids_param))).scalar()
+    return found, promoted
+
+
+class Churn:
+    """Random joins, leaves, accepts and withdrawals on a set of posts; tallies statuses."""
+
+    def __init__(self, api, users: list[uuid.UUID], hosts: dict[str, uuid.UUID]):
+        self.api = api
+        self.users = users
+        self.hosts = hosts  # post id -> host id
+        self.requests: list[tuple[str, uuid.UUID]] = []  # (request id, requester)
+        self.statuses: dict[int, int] = {}
+
+    async def call(self, method: str, url: str, user_id: uuid.UUID, **kwargs):
+        response = await self.api.request(method, url, headers=auth_headers(user_id), **kwargs)
+        self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+        return response
+
+    async def join(self, rng: random.Random, post_id: str) -> None:
+        user_id = rng.choice(self.users)
+        response = await self.call("POST", f"{HANGOUT}/posts/{post_id}/request", user_id, json={})
+        if response.status_code == 201:
+            self.requests.append((response.json()["data"]["id"], user_id))
+
+    async def leave(self, rng: random.Random, post_id: str) -> None:
+        detail = await self.call("GET", f"{HANGOUT}/posts/{post_id}", self.hosts[post_id])
+        members = [p["user_id"] for p in detail.json()["data"]["participants"] if p["role"] == "participant"]
+        if members:
+            await self.call("POST", f"{HANGOUT}/posts/{post_id}/leave", uuid.UUID(rng.choice(members)))
+
+    async def accept(self, rng: random.Random, post_id: str) -> None:
+        host = self.hosts[post_id]
+        listing = await self.call("GET", f"{HANGOUT}/posts/{post_id}/requests", host)
+        pending = [r["id"] for r in listing.json()["data"] if r["status"] == "pending"]
+        if pending:
+            await self.call("PATCH", f"{HANGOUT}/requests/{rng.choice(pending)}", host, json={"action": "accept"})
+
+    async def withdraw(self, rng: random.Random, post_id: str) -> None:
+        if self.requests:
+            request_id, user_id = self.requests.pop(rng.randrange(len(self.requests)))
+            await self.call("DELETE", f"{HANGOUT}/requests/{request_id}", user_id)
+
+
+@pytest.mark.asyncio
+async def test_waitlist_invariants_hold_under_concurrent_changes(api, make_users):
+    seats, posts = 3, 2
+    users = await make_users(40)
+    hosts = {}
+    for i, host in enumerate(users[:posts]):
+        response = await api.post(f"{HANGOUT}/posts", json=post_body(30 + 3 * i, max_participants=seats),
+                                  headers=auth_headers(host))
+        assert response.status_code == 201, response.text
+        hosts[response.json()["data"]["id"]] = host
+
+    churn = Churn(api, users[posts:], hosts)
+    # Start from full posts so leaves promote from the waitlist straight away
+    members = iter(users[posts:])
+    for post_id, host in hosts.items():
+        for _ in range(seats - 1):
+            request = await api.post(f"{HANGOUT}/posts/{post_id}/request", json={},
+                                     headers=auth_headers(next(members)))
+            await churn.call("PATCH", f"{HANGOUT}/requests/{request.json()['data']['id']}", host,
+                             json={"action": "accept"})
+
+    ops = [(churn.join, 0.35), (churn.leave, 0.3), (churn.accept, 0.2), (churn.withdraw, 0.15)]
+    remaining = iter(range(240))
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(worker_id)
+        for _ in remaining:
+            op = rng.choices([op for op, _ in ops], [weight for _, weight in ops])[0]
+            await op(rng, rng.choice(list(hosts)))
+
+    await asyncio.gather(*(worker(i) for i in range(8)))
+
+    # 4xx is expected (already requested, no longer a participant); 5xx is a failed transaction
+    assert not [status for status in churn.statuses if status >= 500], churn.statuses
+    found, promoted = await violations([uuid.UUID(post_id) for post_id in hosts])
+    assert found == {}
+    assert promoted, "no leave promoted anyone; the waitlist was never exercised"